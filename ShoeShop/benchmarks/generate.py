@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Генератор синтетического каталога для бенчмарков
+
+При одинаковых параметрах и seed создается одна и та же БД.
+Пример: python benchmarks/generate.py bench.db --products 100000
+"""
+
+import sys
+import os
+import argparse
+import random
+import sqlite3
+import time
+from datetime import date, timedelta
+
+# Добавляем папку приложения в путь поиска модулей
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.create_db import (
+    SCHEMA, SEARCH_INDEX, INVENTORY_SUMMARY, PRODUCT_REVISIONS, REFERENCE_VERSIONS, SEED_DATA,
+    rebuild_search_index
+)
+
+# Словари для названий и описаний
+KINDS = ['Ботинки', 'Туфли', 'Полуботинки', 'Кроссовки', 'Сапоги', 'Кеды',
+         'Мокасины', 'Лоферы', 'Сандалии', 'Босоножки', 'Слипоны', 'Ботильоны']
+ADJECTIVES = ['женские', 'мужские', 'детские', 'зимние', 'летние', 'демисезонные',
+              'утепленные', 'кожаные', 'замшевые', 'спортивные', 'классические']
+COLORS = ['черный', 'белый', 'коричневый', 'бежевый', 'синий', 'красный', 'серый']
+BRANDS = ['Kari', 'Marco Tozzi', 'Рос', 'Rieker', 'Alessio Nesca', 'CROSBY',
+          'Ecco', 'Tamaris', 'Salamander', 'Geox', 'Camel', 'Ralf Ringer']
+STATUSES = ['Новый', 'Завершен']
+
+# Размер пачки при вставке
+CHUNK_SIZE = 10000
+
+
+def chunked(items, size=CHUNK_SIZE):
+    """Разбиение генератора на списки по size элементов"""
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def generate_catalog(db_path, products=10000, suppliers=None, orders=None, seed=42):
+    """Создание БД со схемой приложения и синтетическими данными
+
+    По умолчанию поставщиков 1 на 2000 товаров (не меньше 5),
+    заказов - 1 на 10 товаров. Возвращает словарь с количеством записей.
+    """
+    rng = random.Random(seed)
+    suppliers = suppliers if suppliers is not None else max(5, products // 2000)
+    orders = orders if orders is not None else products // 10
+    clients = max(10, orders // 20)
+
+    if os.path.exists(db_path):
+        os.remove(db_path)
+    os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+
+    conn = sqlite3.connect(db_path)
+    try:
+        conn.executescript(
+            SCHEMA + SEARCH_INDEX + INVENTORY_SUMMARY + PRODUCT_REVISIONS + REFERENCE_VERSIONS
+        )
+        # Пользователи admin/manager/client и небольшой исходный каталог
+        conn.executescript(SEED_DATA)
+
+        # Индекс строим одним запросом в конце, а не триггерами на каждую строку
+        conn.execute("UPDATE search_index_state SET deferred = 1")
+
+        conn.executemany("INSERT OR IGNORE INTO manufacturers (name) VALUES (?)",
+                         [(brand,) for brand in BRANDS])
+        conn.executemany("INSERT OR IGNORE INTO suppliers (name) VALUES (?)",
+                         [(f"Поставщик {i}",) for i in range(1, suppliers + 1)])
+        conn.executemany("INSERT INTO pickup_points (address) VALUES (?)",
+                         [(f"{420000 + i}, г. Лесной, ул. Складская, {i}",) for i in range(1, 21)])
+        conn.executemany(
+            "INSERT INTO users (login, password, full_name, role) VALUES (?, ?, ?, 'client')",
+            [(f"client{i}", '123', f"Клиент {i}") for i in range(1, clients + 1)]
+        )
+
+        counts = {
+            table: conn.execute(f"SELECT MAX(id) FROM {table}").fetchone()[0]
+            for table in ('categories', 'manufacturers', 'suppliers', 'units',
+                          'pickup_points', 'users', 'products')
+        }
+
+        def make_products():
+            for i in range(products):
+                kind = rng.choice(KINDS)
+                adjective = rng.choice(ADJECTIVES)
+                brand_id = rng.randint(1, counts['manufacturers'])
+                yield (
+                    f"{kind} {adjective} {i}",
+                    f"{kind} {adjective}, размер {rng.randint(35, 46)}, цвет {rng.choice(COLORS)}",
+                    float(rng.randrange(990, 20000, 10)),
+                    float(rng.choice([0, 0, 0, 3, 5, 10, 15, 20, 30])),
+                    rng.choice([0, rng.randint(1, 50)]),
+                    brand_id,
+                    rng.randint(1, counts['suppliers']),
+                    rng.randint(1, counts['categories']),
+                    rng.randint(1, counts['units'])
+                )
+
+        for chunk in chunked(make_products()):
+            conn.executemany(
+                """INSERT INTO products (name, description, price, discount, quantity,
+                                         manufacturer_id, supplier_id, category_id, unit_id)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                chunk
+            )
+
+        total_products = conn.execute("SELECT MAX(id) FROM products").fetchone()[0]
+        first_order = conn.execute("SELECT COALESCE(MAX(id), 0) FROM orders").fetchone()[0] + 1
+        start = date(2024, 1, 1)
+
+        def make_orders():
+            for i in range(orders):
+                ordered = start + timedelta(days=rng.randint(0, 730))
+                yield (
+                    ordered.isoformat(),
+                    (ordered + timedelta(days=rng.randint(2, 14))).isoformat(),
+                    rng.randint(1, counts['pickup_points']),
+                    rng.randint(1, counts['users']),
+                    f"{100 + i}",
+                    rng.choice(STATUSES)
+                )
+
+        for chunk in chunked(make_orders()):
+            conn.executemany(
+                """INSERT INTO orders (order_date, delivery_date, pickup_point_id,
+                                       user_id, code, status)
+                   VALUES (?, ?, ?, ?, ?, ?)""",
+                chunk
+            )
+
+        def make_items():
+            for order_id in range(first_order, first_order + orders):
+                for product_id in rng.sample(range(1, total_products + 1),
+                                             min(rng.randint(1, 4), total_products)):
+                    yield order_id, product_id, rng.randint(1, 3)
+
+        for chunk in chunked(make_items()):
+            conn.executemany(
+                "INSERT INTO order_items (order_id, product_id, quantity) VALUES (?, ?, ?)",
+                chunk
+            )
+
+        rebuild_search_index(conn)
+        conn.execute("UPDATE search_index_state SET deferred = 0")
+        conn.commit()
+
+        return {
+            table: conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+            for table in ('products', 'suppliers', 'users', 'orders', 'order_items')
+        }
+    finally:
+        conn.close()
+
+
+def main():
+    """Главная функция"""
+    parser = argparse.ArgumentParser(description="Генерация синтетического каталога")
+    parser.add_argument("db", help="путь к создаваемой базе данных")
+    parser.add_argument("--products", type=int, default=10000, help="количество товаров")
+    parser.add_argument("--suppliers", type=int, help="количество поставщиков")
+    parser.add_argument("--orders", type=int, help="количество заказов")
+    parser.add_argument("--seed", type=int, default=42, help="зерно генератора")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    counts = generate_catalog(args.db, args.products, args.suppliers, args.orders, args.seed)
+    summary = ", ".join(f"{table}: {count}" for table, count in counts.items())
+    print(f"✅ {args.db} ({summary}, {time.perf_counter() - started:.1f} с)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Замер производительности основных операций с каталогом
+
+Для каждого размера каталога генерируется БД (generate.py), затем
+замеряются горячие пути приложения. Результаты пишутся в JSON,
+который можно сравнить с результатами прошлой версии (--compare).
+
+Пример: python benchmarks/run_benchmarks.py --sizes 1000 100000 -o after.json --compare before.json
+"""
+
+import sys
+import os
+import argparse
+import json
+import platform
+import random
+import sqlite3
+import statistics
+import time
+from datetime import datetime
+
+# Добавляем папку приложения в путь поиска модулей
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.db_models import Database, ConnectionManager, SORT_ORDERS
+from models.catalog import ProductCatalog
+from benchmarks.generate import generate_catalog, KINDS, ADJECTIVES
+
+# Размер страницы таблицы товаров (PAGE_SIZE в gui/product_list.py)
+PAGE_SIZE = 200
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+
+
+def measure(func, repeat):
+    """Время выполнения func() repeat раз, статистика в секундах"""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    timings.sort()
+    return {
+        'repeat': repeat,
+        'min': timings[0],
+        'median': statistics.median(timings),
+        'mean': statistics.fmean(timings),
+        'p95': timings[min(len(timings) - 1, int(len(timings) * 0.95))],
+        'max': timings[-1]
+    }
+
+
+def throughput(func, count):
+    """Количество операций func(i) в секунду"""
+    started = time.perf_counter()
+    for i in range(count):
+        func(i)
+    elapsed = time.perf_counter() - started
+    return {'count': count, 'seconds': elapsed, 'ops_per_sec': count / elapsed}
+
+
+def filter_cases(rng, suppliers):
+    """Набор параметров фильтрации, как в окне списка товаров"""
+    cases = []
+    for _ in range(20):
+        cases.append({
+            'search': rng.choice(['', rng.choice(KINDS)[:4], rng.choice(ADJECTIVES),
+                                  f"{rng.choice(KINDS)} {rng.choice(ADJECTIVES)[:3]}"]),
+            'supplier': rng.choice(['all'] + suppliers),
+            'sort': rng.choice(list(SORT_ORDERS))
+        })
+    return cases
+
+
+def run_size(size, seed, repeat, data_dir):
+    """Все замеры для каталога из size товаров"""
+    db_path = os.path.join(data_dir, f"bench_{size}_{seed}.db")
+    print(f"🔄 Генерация каталога: {size} товаров...")
+    started = time.perf_counter()
+    counts = generate_catalog(db_path, products=size, seed=seed)
+    results = {'counts': counts, 'generate_seconds': time.perf_counter() - started}
+
+    rng = random.Random(seed)
+    db = Database(db_path)
+    max_id = db.get_connection().execute("SELECT MAX(id) FROM products").fetchone()[0]
+    suppliers = [s['name'] for s in db.get_suppliers()]
+    cases = filter_cases(rng, suppliers)
+
+    def bench(name, func, times=repeat):
+        print(f"   {name}...")
+        results[name] = measure(func, times)
+
+    # Чтение
+    bench('get_all_products', db.get_all_products, max(1, repeat // 5))
+    bench('check_user', lambda: db.check_user(rng.choice(['admin', 'client1', 'nobody']), '123'),
+          repeat * 20)
+    bench('get_product_by_id', lambda: db.get_product_by_id(rng.randint(1, max_id)), repeat * 20)
+
+    # Логика apply_filters: первая страница и страница из середины результата
+    def first_page():
+        db.query_products(**rng.choice(cases), offset=0, limit=PAGE_SIZE)
+
+    def deep_page():
+        params = rng.choice(cases)
+        _, total = db.query_products(**params, offset=0, limit=1)
+        db.query_products(**params, offset=total // 2, limit=PAGE_SIZE)
+
+    bench('apply_filters', first_page, repeat * 5)
+    bench('apply_filters_deep_page', deep_page, repeat * 2)
+
+    # То же с каталогом в памяти (MEMORY_CATALOG)
+    catalog = ProductCatalog()
+    bench('catalog_load', lambda: catalog.load(db.get_all_products()), max(1, repeat // 5))
+    bench('catalog_apply_filters',
+          lambda: catalog.query_products(**rng.choice(cases), offset=0, limit=PAGE_SIZE),
+          repeat * 5)
+
+    # Запись: по одной транзакции на товар, как при сохранении из окна
+    template = db.get_product_by_id(1)
+    data = {key: template[key] for key in (
+        'name', 'description', 'price', 'discount', 'quantity', 'photo_path',
+        'manufacturer_id', 'supplier_id', 'category_id', 'unit_id'
+    )}
+    writes = min(1000, max(100, size // 100))
+
+    print("   insert/update...")
+    results['insert_product'] = throughput(
+        lambda i: db.add_product(dict(data, name=f"Бенчмарк {i}")), writes
+    )
+    results['update_product'] = throughput(
+        lambda i: db.update_product(rng.randint(1, max_id), dict(data, price=1000.0 + i)), writes
+    )
+
+    ConnectionManager.for_path(db_path).close_all()
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Сравнение с прошлыми результатами, возвращает список регрессий"""
+    regressions = []
+    for size, cases in results['results'].items():
+        old_cases = baseline.get('results', {}).get(size, {})
+        for name, stats in cases.items():
+            old = old_cases.get(name)
+            if not isinstance(stats, dict) or not isinstance(old, dict):
+                continue
+            if 'median' in stats and 'median' in old:
+                # Время: больше - хуже
+                change = stats['median'] / old['median'] - 1
+            elif 'ops_per_sec' in stats and 'ops_per_sec' in old:
+                # Пропускная способность: меньше - хуже
+                change = old['ops_per_sec'] / stats['ops_per_sec'] - 1
+            else:
+                continue
+            mark = "⚠️" if change > threshold else "  "
+            print(f"{mark} {size:>8} {name:<26} {change:+.1%}")
+            if change > threshold:
+                regressions.append((size, name, change))
+    return regressions
+
+
+def main():
+    """Главная функция"""
+    parser = argparse.ArgumentParser(description="Бенчмарки каталога товаров")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000],
+                        help="размеры каталога (до 1000000)")
+    parser.add_argument("--seed", type=int, default=42, help="зерно генератора")
+    parser.add_argument("--repeat", type=int, default=10, help="базовое число повторов")
+    parser.add_argument("--data-dir", default=DATA_DIR, help="папка для сгенерированных БД")
+    parser.add_argument("-o", "--output", default="benchmark_results.json", help="файл результатов")
+    parser.add_argument("--compare", help="результаты прошлой версии для сравнения")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="допустимое замедление при сравнении (0.2 = 20%%)")
+    args = parser.parse_args()
+
+    results = {
+        'meta': {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'sqlite': sqlite3.sqlite_version,
+            'platform': platform.platform(),
+            'seed': args.seed,
+            'repeat': args.repeat
+        },
+        'results': {}
+    }
+
+    for size in args.sizes:
+        results['results'][str(size)] = run_size(size, args.seed, args.repeat, args.data_dir)
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, ensure_ascii=False, indent=2)
+    print(f"✅ Результаты записаны в {args.output}")
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"❌ Замедлений больше {args.threshold:.0%}: {len(regressions)}")
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,442 @@
+import sqlite3
+import os
+import threading
+
+# Путь к файлу базы данных
+DB_PATH = os.path.join('database', 'shoe_shop.db')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    login TEXT NOT NULL UNIQUE,
+    password TEXT NOT NULL,
+    full_name TEXT NOT NULL,
+    role TEXT NOT NULL CHECK (role IN ('client', 'manager', 'admin'))
+);
+
+CREATE TABLE IF NOT EXISTS categories (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL UNIQUE
+);
+
+CREATE TABLE IF NOT EXISTS manufacturers (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL UNIQUE
+);
+
+CREATE TABLE IF NOT EXISTS suppliers (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL UNIQUE
+);
+
+CREATE TABLE IF NOT EXISTS units (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL UNIQUE,
+    short_name TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS products (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL,
+    description TEXT,
+    price REAL NOT NULL CHECK (price >= 0),
+    discount REAL NOT NULL DEFAULT 0 CHECK (discount BETWEEN 0 AND 100),
+    quantity INTEGER NOT NULL DEFAULT 0 CHECK (quantity >= 0),
+    photo_path TEXT,
+    manufacturer_id INTEGER REFERENCES manufacturers(id),
+    supplier_id INTEGER REFERENCES suppliers(id),
+    category_id INTEGER REFERENCES categories(id),
+    unit_id INTEGER REFERENCES units(id),
+    revision INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS pickup_points (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    address TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS orders (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    order_date TEXT NOT NULL,
+    delivery_date TEXT,
+    pickup_point_id INTEGER REFERENCES pickup_points(id),
+    user_id INTEGER REFERENCES users(id),
+    code TEXT,
+    status TEXT NOT NULL DEFAULT 'Новый'
+);
+
+CREATE TABLE IF NOT EXISTS order_items (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    order_id INTEGER NOT NULL REFERENCES orders(id) ON DELETE CASCADE,
+    product_id INTEGER NOT NULL REFERENCES products(id),
+    quantity INTEGER NOT NULL CHECK (quantity > 0)
+);
+
+CREATE INDEX IF NOT EXISTS idx_order_items_product ON order_items(product_id);
+CREATE INDEX IF NOT EXISTS idx_products_photo ON products(photo_path);
+
+-- Готовые порядки для сортировки списка товаров (цена - итоговая, со скидкой)
+CREATE INDEX IF NOT EXISTS idx_products_name ON products(name, id);
+CREATE INDEX IF NOT EXISTS idx_products_final_price
+    ON products(price * (1 - COALESCE(discount, 0) / 100.0), id);
+CREATE INDEX IF NOT EXISTS idx_products_quantity ON products(quantity, id);
+
+-- Заказы выводятся страницами по (дата, id) с фильтрами по статусу и клиенту
+CREATE INDEX IF NOT EXISTS idx_orders_date ON orders(order_date, id);
+CREATE INDEX IF NOT EXISTS idx_orders_status ON orders(status, order_date, id);
+CREATE INDEX IF NOT EXISTS idx_orders_user ON orders(user_id, order_date, id);
+CREATE INDEX IF NOT EXISTS idx_order_items_order ON order_items(order_id, product_id, quantity);
+"""
+
+# Полнотекстовый индекс для поиска товаров.
+# Строки индекса имеют rowid, равный id товара, и поддерживаются триггерами.
+SEARCH_INDEX = """
+CREATE VIRTUAL TABLE IF NOT EXISTS product_search USING fts5(
+    name, description, category, manufacturer, supplier,
+    tokenize = 'unicode61 remove_diacritics 2',
+    prefix = '2 3'
+);
+
+-- Массовый импорт отключает построчные триггеры внутри своей транзакции
+-- и переиндексирует каждую пачку одним запросом
+CREATE TABLE IF NOT EXISTS search_index_state (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    deferred INTEGER NOT NULL DEFAULT 0
+);
+INSERT OR IGNORE INTO search_index_state (id, deferred) VALUES (1, 0);
+
+DROP TRIGGER IF EXISTS products_search_insert;
+CREATE TRIGGER products_search_insert AFTER INSERT ON products
+WHEN (SELECT deferred FROM search_index_state) = 0 BEGIN
+    INSERT INTO product_search (rowid, name, description, category, manufacturer, supplier)
+    VALUES (
+        NEW.id, NEW.name, COALESCE(NEW.description, ''),
+        COALESCE((SELECT name FROM categories WHERE id = NEW.category_id), ''),
+        COALESCE((SELECT name FROM manufacturers WHERE id = NEW.manufacturer_id), ''),
+        COALESCE((SELECT name FROM suppliers WHERE id = NEW.supplier_id), '')
+    );
+END;
+
+DROP TRIGGER IF EXISTS products_search_update;
+CREATE TRIGGER products_search_update
+AFTER UPDATE OF name, description, category_id, manufacturer_id, supplier_id ON products
+WHEN (SELECT deferred FROM search_index_state) = 0 BEGIN
+    UPDATE product_search SET
+        name = NEW.name,
+        description = COALESCE(NEW.description, ''),
+        category = COALESCE((SELECT name FROM categories WHERE id = NEW.category_id), ''),
+        manufacturer = COALESCE((SELECT name FROM manufacturers WHERE id = NEW.manufacturer_id), ''),
+        supplier = COALESCE((SELECT name FROM suppliers WHERE id = NEW.supplier_id), '')
+    WHERE rowid = NEW.id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS products_search_delete AFTER DELETE ON products BEGIN
+    DELETE FROM product_search WHERE rowid = OLD.id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS categories_search_update AFTER UPDATE OF name ON categories BEGIN
+    UPDATE product_search SET category = NEW.name
+    WHERE rowid IN (SELECT id FROM products WHERE category_id = NEW.id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS manufacturers_search_update AFTER UPDATE OF name ON manufacturers BEGIN
+    UPDATE product_search SET manufacturer = NEW.name
+    WHERE rowid IN (SELECT id FROM products WHERE manufacturer_id = NEW.id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS suppliers_search_update AFTER UPDATE OF name ON suppliers BEGIN
+    UPDATE product_search SET supplier = NEW.name
+    WHERE rowid IN (SELECT id FROM products WHERE supplier_id = NEW.id);
+END;
+"""
+
+# Ревизии товаров: каждое изменение получает следующий номер общего
+# счетчика, удаленные товары остаются в таблице надгробий с номером удаления.
+# Изменения после известной ревизии читаются по индексам, поэтому открытые
+# списки и кэши синхронизируются за время, пропорциональное числу изменений.
+PRODUCT_REVISIONS = """
+CREATE TABLE IF NOT EXISTS product_revision (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    value INTEGER NOT NULL DEFAULT 0,
+    pruned INTEGER NOT NULL DEFAULT 0
+);
+INSERT OR IGNORE INTO product_revision (id, value, pruned) VALUES (1, 0, 0);
+
+CREATE TABLE IF NOT EXISTS product_tombstones (
+    product_id INTEGER PRIMARY KEY,
+    revision INTEGER NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_products_revision ON products(revision);
+CREATE INDEX IF NOT EXISTS idx_product_tombstones_revision ON product_tombstones(revision);
+
+CREATE TRIGGER IF NOT EXISTS products_revision_insert AFTER INSERT ON products BEGIN
+    UPDATE product_revision SET value = value + 1;
+    UPDATE products SET revision = (SELECT value FROM product_revision) WHERE id = NEW.id;
+    DELETE FROM product_tombstones WHERE product_id = NEW.id;
+END;
+
+-- Условие WHEN пропускает запись самого номера ревизии
+CREATE TRIGGER IF NOT EXISTS products_revision_update AFTER UPDATE ON products
+WHEN NEW.revision IS OLD.revision BEGIN
+    UPDATE product_revision SET value = value + 1;
+    UPDATE products SET revision = (SELECT value FROM product_revision) WHERE id = NEW.id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS products_revision_delete AFTER DELETE ON products BEGIN
+    UPDATE product_revision SET value = value + 1;
+    INSERT OR REPLACE INTO product_tombstones (product_id, revision)
+    VALUES (OLD.id, (SELECT value FROM product_revision));
+END;
+"""
+
+# На сколько ревизий назад хранить надгробия удаленных товаров
+TOMBSTONES_KEEP = 100000
+
+# Справочники, которые кэшируются приложением
+REFERENCE_TABLE_NAMES = ('categories', 'manufacturers', 'suppliers', 'units')
+
+# Версии справочников: триггеры увеличивают версию при любом изменении,
+# кэш справочников сверяет ее перед выдачей и видит правки других
+# терминалов и импорта
+REFERENCE_VERSIONS = """
+CREATE TABLE IF NOT EXISTS reference_versions (
+    name TEXT PRIMARY KEY,
+    version INTEGER NOT NULL DEFAULT 0
+);
+""" + "".join(
+    f"""
+INSERT OR IGNORE INTO reference_versions (name, version) VALUES ('{table}', 0);
+""" + "".join(
+        f"""
+CREATE TRIGGER IF NOT EXISTS {table}_version_{event} AFTER {event.upper()} ON {table} BEGIN
+    UPDATE reference_versions SET version = version + 1 WHERE name = '{table}';
+END;
+"""
+        for event in ('insert', 'update', 'delete')
+    )
+    for table in REFERENCE_TABLE_NAMES
+)
+
+# Сводка по складу для панели показателей: одна строка на поставщика
+# (0 - товары без поставщика). Триггеры вычитают вклад старой версии
+# товара и добавляют вклад новой, поэтому сводка читается за O(1).
+INVENTORY_SUMMARY = """
+CREATE TABLE IF NOT EXISTS inventory_summary (
+    supplier_id INTEGER PRIMARY KEY,
+    products INTEGER NOT NULL DEFAULT 0,
+    units INTEGER NOT NULL DEFAULT 0,
+    stock_value REAL NOT NULL DEFAULT 0,
+    discounted_value REAL NOT NULL DEFAULT 0,
+    out_of_stock INTEGER NOT NULL DEFAULT 0,
+    high_discount INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TRIGGER IF NOT EXISTS products_summary_insert AFTER INSERT ON products BEGIN
+    INSERT INTO inventory_summary
+        (supplier_id, products, units, stock_value, discounted_value, out_of_stock, high_discount)
+    VALUES (
+        COALESCE(NEW.supplier_id, 0), 1, NEW.quantity,
+        NEW.price * NEW.quantity,
+        NEW.price * (1 - COALESCE(NEW.discount, 0) / 100.0) * NEW.quantity,
+        NEW.quantity = 0, COALESCE(NEW.discount, 0) > 15
+    )
+    ON CONFLICT(supplier_id) DO UPDATE SET
+        products = products + excluded.products,
+        units = units + excluded.units,
+        stock_value = stock_value + excluded.stock_value,
+        discounted_value = discounted_value + excluded.discounted_value,
+        out_of_stock = out_of_stock + excluded.out_of_stock,
+        high_discount = high_discount + excluded.high_discount;
+END;
+
+CREATE TRIGGER IF NOT EXISTS products_summary_update
+AFTER UPDATE OF price, discount, quantity, supplier_id ON products BEGIN
+    UPDATE inventory_summary SET
+        products = products - 1,
+        units = units - OLD.quantity,
+        stock_value = stock_value - OLD.price * OLD.quantity,
+        discounted_value = discounted_value
+            - OLD.price * (1 - COALESCE(OLD.discount, 0) / 100.0) * OLD.quantity,
+        out_of_stock = out_of_stock - (OLD.quantity = 0),
+        high_discount = high_discount - (COALESCE(OLD.discount, 0) > 15)
+    WHERE supplier_id = COALESCE(OLD.supplier_id, 0);
+
+    INSERT INTO inventory_summary
+        (supplier_id, products, units, stock_value, discounted_value, out_of_stock, high_discount)
+    VALUES (
+        COALESCE(NEW.supplier_id, 0), 1, NEW.quantity,
+        NEW.price * NEW.quantity,
+        NEW.price * (1 - COALESCE(NEW.discount, 0) / 100.0) * NEW.quantity,
+        NEW.quantity = 0, COALESCE(NEW.discount, 0) > 15
+    )
+    ON CONFLICT(supplier_id) DO UPDATE SET
+        products = products + excluded.products,
+        units = units + excluded.units,
+        stock_value = stock_value + excluded.stock_value,
+        discounted_value = discounted_value + excluded.discounted_value,
+        out_of_stock = out_of_stock + excluded.out_of_stock,
+        high_discount = high_discount + excluded.high_discount;
+END;
+
+CREATE TRIGGER IF NOT EXISTS products_summary_delete AFTER DELETE ON products BEGIN
+    UPDATE inventory_summary SET
+        products = products - 1,
+        units = units - OLD.quantity,
+        stock_value = stock_value - OLD.price * OLD.quantity,
+        discounted_value = discounted_value
+            - OLD.price * (1 - COALESCE(OLD.discount, 0) / 100.0) * OLD.quantity,
+        out_of_stock = out_of_stock - (OLD.quantity = 0),
+        high_discount = high_discount - (COALESCE(OLD.discount, 0) > 15)
+    WHERE supplier_id = COALESCE(OLD.supplier_id, 0);
+END;
+"""
+
+SEED_DATA = """
+INSERT INTO users (login, password, full_name, role) VALUES
+    ('admin', '123', 'Администратор Системы', 'admin'),
+    ('manager', '123', 'Менеджер Магазина', 'manager'),
+    ('client', '123', 'Клиент Магазина', 'client');
+
+INSERT INTO categories (name) VALUES ('Женская обувь'), ('Мужская обувь');
+
+INSERT INTO manufacturers (name) VALUES
+    ('Kari'), ('Marco Tozzi'), ('Рос'), ('Rieker'), ('Alessio Nesca'), ('CROSBY');
+
+INSERT INTO suppliers (name) VALUES ('Kari'), ('Обувь для вас');
+
+INSERT INTO units (name, short_name) VALUES ('Пара', 'пар.'), ('Штука', 'шт.');
+
+INSERT INTO products (name, description, price, discount, quantity,
+                      manufacturer_id, supplier_id, category_id, unit_id) VALUES
+    ('Ботинки', 'Женские ботинки демисезонные kari', 4990, 3, 6, 1, 1, 1, 1),
+    ('Туфли', 'Туфли Marco Tozzi женские летние, размер 39, цвет черный', 3244, 2, 13, 2, 2, 1, 1),
+    ('Полуботинки', 'Полуботинки мужские утепленные Рос', 4499, 0, 0, 3, 2, 2, 1),
+    ('Ботинки', 'Ботинки Rieker мужские зимние', 5900, 17, 4, 4, 2, 2, 1),
+    ('Кроссовки', 'Кроссовки CROSBY женские', 2700, 20, 0, 6, 1, 1, 1),
+    ('Сапоги', 'Сапоги Alessio Nesca женские зимние', 7800, 5, 3, 5, 1, 1, 1);
+
+INSERT INTO pickup_points (address) VALUES
+    ('420151, г. Лесной, ул. Вишневая, 32'),
+    ('125061, г. Лесной, ул. Подгорная, 8');
+
+INSERT INTO orders (order_date, delivery_date, pickup_point_id, user_id, code, status) VALUES
+    ('2025-02-27', '2025-04-20', 1, 3, '901', 'Завершен');
+
+INSERT INTO order_items (order_id, product_id, quantity) VALUES (1, 1, 2), (1, 2, 1);
+"""
+
+
+# Заполнение поискового индекса строками товаров (условие WHERE добавляется)
+SEARCH_INDEX_FILL = """
+    INSERT INTO product_search (rowid, name, description, category, manufacturer, supplier)
+    SELECT p.id, p.name, COALESCE(p.description, ''),
+           COALESCE(c.name, ''), COALESCE(m.name, ''), COALESCE(s.name, '')
+    FROM products p
+    LEFT JOIN categories c ON c.id = p.category_id
+    LEFT JOIN manufacturers m ON m.id = p.manufacturer_id
+    LEFT JOIN suppliers s ON s.id = p.supplier_id
+"""
+
+
+def rebuild_search_index(conn):
+    """Полное перестроение поискового индекса по таблице товаров"""
+    conn.execute("DELETE FROM product_search")
+    conn.execute(SEARCH_INDEX_FILL)
+
+
+def rebuild_inventory_summary(conn):
+    """Полный пересчет сводки по складу по таблице товаров"""
+    conn.execute("DELETE FROM inventory_summary")
+    conn.execute("""
+        INSERT INTO inventory_summary
+            (supplier_id, products, units, stock_value, discounted_value, out_of_stock, high_discount)
+        SELECT COALESCE(supplier_id, 0), COUNT(*), SUM(quantity),
+               SUM(price * quantity),
+               SUM(price * (1 - COALESCE(discount, 0) / 100.0) * quantity),
+               SUM(quantity = 0), SUM(COALESCE(discount, 0) > 15)
+        FROM products
+        GROUP BY COALESCE(supplier_id, 0)
+    """)
+
+
+def upgrade_database(db_path=DB_PATH):
+    """Добавление недостающих объектов схемы в существующую БД"""
+    conn = sqlite3.connect(db_path)
+    try:
+        has_index = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'product_search'"
+        ).fetchone()
+        has_summary = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'inventory_summary'"
+        ).fetchone()
+        conn.executescript(SCHEMA)
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(products)")}
+        if 'revision' not in columns:
+            conn.execute("ALTER TABLE products ADD COLUMN revision INTEGER NOT NULL DEFAULT 0")
+        conn.executescript(SEARCH_INDEX + INVENTORY_SUMMARY + PRODUCT_REVISIONS + REFERENCE_VERSIONS + """
+            DROP TRIGGER IF EXISTS products_log_insert;
+            DROP TRIGGER IF EXISTS products_log_update;
+            DROP TRIGGER IF EXISTS products_log_delete;
+            DROP TABLE IF EXISTS product_changes;
+        """)
+        # Старые надгробия уже прочитаны всеми окнами; кто отстал
+        # сильнее (ревизия меньше pruned), перезагружает список целиком
+        conn.execute(
+            "UPDATE product_revision SET pruned = MAX(pruned, value - ?)", (TOMBSTONES_KEEP,)
+        )
+        conn.execute(
+            "DELETE FROM product_tombstones WHERE revision <= (SELECT pruned FROM product_revision)"
+        )
+        if not has_index:
+            rebuild_search_index(conn)
+        if not has_summary:
+            rebuild_inventory_summary(conn)
+        # Статистика для планировщика (выбор индекса по периоду заказов);
+        # analysis_limit ограничивает ANALYZE выборкой строк
+        conn.execute("PRAGMA analysis_limit = 1000")
+        conn.execute("ANALYZE")
+        conn.commit()
+    finally:
+        conn.close()
+
+
+# Поток фонового обновления схемы, запущенный при старте приложения
+upgrade_thread = None
+
+
+def start_upgrade(db_path=DB_PATH):
+    """Обновление схемы в фоновом потоке, чтобы не задерживать запуск"""
+    global upgrade_thread
+
+    def run():
+        try:
+            upgrade_database(db_path)
+        except Exception as e:
+            print(f"⚠️ Не удалось обновить схему БД: {e}")
+
+    upgrade_thread = threading.Thread(target=run, name="schema-upgrade")
+    upgrade_thread.start()
+
+
+def wait_for_upgrade():
+    """Ожидание фонового обновления схемы, если оно еще идет"""
+    if upgrade_thread is not None:
+        upgrade_thread.join()
+
+
+def create_database(db_path=DB_PATH):
+    """Создание базы данных с тестовыми данными"""
+    os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+    conn = sqlite3.connect(db_path)
+    try:
+        conn.executescript(SCHEMA + SEARCH_INDEX + INVENTORY_SUMMARY + PRODUCT_REVISIONS + REFERENCE_VERSIONS)
+        conn.executescript(SEED_DATA)
+        conn.commit()
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    create_database()
+    print("✅ База данных создана")
@@ -0,0 +1,41 @@
+import tkinter as tk
+
+
+class App:
+    """Приложение с одним корневым окном и сменными экранами
+
+    Экраны (вход, главное окно для каждой роли) создаются один раз
+    и при переключении только скрываются и показываются снова,
+    поэтому смена пользователя не пересоздает окно и виджеты.
+    """
+
+    def __init__(self):
+        self.root = tk.Tk()
+        self.screens = {}
+        self.current = None
+
+        self.show_login()
+
+    def switch(self, key, factory):
+        """Экран по ключу (создается при первом обращении) становится текущим"""
+        screen = self.screens.get(key)
+        if screen is None:
+            screen = self.screens[key] = factory()
+        if self.current is not None and self.current is not screen:
+            self.current.hide()
+        self.current = screen
+        return screen
+
+    def show_login(self):
+        """Экран входа"""
+        from gui.login_window import LoginWindow
+        self.switch('login', lambda: LoginWindow(self)).show()
+
+    def show_main(self, user):
+        """Главный экран для пользователя (один экран на роль)"""
+        from gui.main_window import MainWindow
+        self.switch(('main', user['role']), lambda: MainWindow(self, user)).show(user)
+
+    def run(self):
+        """Запуск приложения"""
+        self.root.mainloop()
@@ -0,0 +1,172 @@
+import tkinter as tk
+from tkinter import ttk, messagebox
+
+from models.db_models import Database
+from models.validation import check_limit
+from gui.data_service import DataService
+
+# Значение выпадающего списка "оставить как есть"
+KEEP = "— не менять —"
+
+class BulkEditWindow:
+    """Окно изменения нескольких товаров сразу
+
+    Меняются только заполненные поля; все товары обновляются
+    одним запросом в одной транзакции.
+    """
+
+    def __init__(self, parent, user, product_ids, on_done=None):
+        self.user = user
+        self.product_ids = product_ids
+        self.on_done = on_done
+        self.db = Database()
+
+        # Проверка прав
+        if user['role'] != 'admin':
+            messagebox.showerror("Ошибка", "Только администратор может редактировать товары")
+            return
+
+        self.suppliers = self.db.get_reference('suppliers')
+        self.categories = self.db.get_reference('categories')
+
+        self.window = tk.Toplevel(parent)
+        self.window.title(f"Изменение товаров ({len(product_ids)})")
+        self.window.resizable(False, False)
+        self.window.grab_set()  # Модальное окно
+        self.window.focus_set()
+
+        self.setup_ui()
+        self.center_window()
+
+    def center_window(self):
+        """Центрирование окна"""
+        self.window.update_idletasks()
+        width = self.window.winfo_width()
+        height = self.window.winfo_height()
+        x = (self.window.winfo_screenwidth() // 2) - (width // 2)
+        y = (self.window.winfo_screenheight() // 2) - (height // 2)
+        self.window.geometry(f'+{x}+{y}')
+
+    def setup_ui(self):
+        """Создание интерфейса"""
+        main_frame = ttk.Frame(self.window, padding="20")
+        main_frame.pack(fill="both", expand=True)
+
+        ttk.Label(
+            main_frame,
+            text=f"Выбрано товаров: {len(self.product_ids)}\nПустые поля не изменяются."
+        ).grid(row=0, column=0, columnspan=2, sticky="w", pady=(0, 10))
+
+        # Поставщик
+        ttk.Label(main_frame, text="Поставщик").grid(row=1, column=0, sticky="w", pady=5)
+        self.supplier_combo = ttk.Combobox(
+            main_frame,
+            values=[KEEP] + self.suppliers.labels(),
+            postcommand=self.refresh_references,
+            state="readonly",
+            width=30
+        )
+        self.supplier_combo.set(KEEP)
+        self.supplier_combo.grid(row=1, column=1, sticky="w", pady=5, padx=10)
+
+        # Категория
+        ttk.Label(main_frame, text="Категория").grid(row=2, column=0, sticky="w", pady=5)
+        self.category_combo = ttk.Combobox(
+            main_frame,
+            values=[KEEP] + self.categories.labels(),
+            postcommand=self.refresh_references,
+            state="readonly",
+            width=30
+        )
+        self.category_combo.set(KEEP)
+        self.category_combo.grid(row=2, column=1, sticky="w", pady=5, padx=10)
+
+        # Скидка
+        ttk.Label(main_frame, text="Скидка %").grid(row=3, column=0, sticky="w", pady=5)
+        self.discount_entry = ttk.Entry(main_frame, width=10)
+        self.discount_entry.grid(row=3, column=1, sticky="w", pady=5, padx=10)
+
+        # Кнопки
+        button_frame = ttk.Frame(main_frame)
+        button_frame.grid(row=4, column=0, columnspan=2, pady=(20, 0))
+
+        self.save_btn = ttk.Button(
+            button_frame,
+            text="💾 Применить",
+            command=self.apply,
+            width=15
+        )
+        self.save_btn.pack(side="left", padx=5)
+
+        ttk.Button(
+            button_frame,
+            text="✖ Отмена",
+            command=self.window.destroy,
+            width=15
+        ).pack(side="left", padx=5)
+
+    def refresh_references(self):
+        """Перечитывание справочников, если они изменились в БД"""
+        self.suppliers = self.db.get_reference('suppliers')
+        self.categories = self.db.get_reference('categories')
+        self.supplier_combo['values'] = [KEEP] + self.suppliers.labels()
+        self.category_combo['values'] = [KEEP] + self.categories.labels()
+
+    def get_changes(self):
+        """Изменения из заполненных полей (ValueError при ошибке ввода)"""
+        changes = {}
+        for column, combo, reference in (
+            ('supplier_id', self.supplier_combo, 'suppliers'),
+            ('category_id', self.category_combo, 'categories')
+        ):
+            if combo.get() == KEEP:
+                continue
+            item_id = self.db.get_reference(reference).id_of(combo.get())
+            if item_id is None:
+                raise ValueError(f"«{combo.get()}» больше нет в справочнике, выберите другое значение")
+            changes[column] = item_id
+
+        discount = self.discount_entry.get().strip()
+        if discount:
+            try:
+                changes['discount'] = float(discount.replace(',', '.'))
+            except ValueError:
+                raise ValueError("Скидка должна быть числом")
+            error = check_limit('discount', changes['discount'])
+            if error:
+                raise ValueError(error)
+        return changes
+
+    def apply(self):
+        """Запись изменений"""
+        try:
+            changes = self.get_changes()
+        except ValueError as e:
+            messagebox.showerror("Ошибка ввода", str(e))
+            return
+        if not changes:
+            messagebox.showwarning("Предупреждение", "Укажите, что изменить")
+            return
+
+        # Запись выполняется в фоне, повторное нажатие блокируем
+        self.save_btn.config(state="disabled")
+        DataService.for_widget(self.window).submit(
+            self.db.update_products,
+            self.product_ids,
+            changes,
+            on_done=self.on_saved,
+            on_error=self.on_save_error
+        )
+
+    def on_saved(self, result):
+        """Изменения записаны"""
+        if self.window.winfo_exists():
+            self.window.destroy()
+        if self.on_done:
+            self.on_done(result)
+
+    def on_save_error(self, error):
+        """Ошибка записи"""
+        messagebox.showerror("Ошибка", f"Не удалось изменить товары: {str(error)}")
+        if self.window.winfo_exists():
+            self.save_btn.config(state="normal")
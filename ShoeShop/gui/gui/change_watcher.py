@@ -0,0 +1,131 @@
+import sqlite3
+
+from models.db_models import Database
+from gui.data_service import DataService
+
+
+class ChangeWatcher:
+    """Отслеживание изменений товаров в других окнах и процессах
+
+    По таймеру выполняется PRAGMA data_version на отдельном соединении:
+    значение меняется, только когда другое соединение (поток этого
+    приложения или другой терминал) зафиксировало запись. Тогда в фоне
+    читаются ID товаров, измененных после сохраненной ревизии, и
+    загружаются только они. Один наблюдатель создается на корневое окно.
+    """
+
+    # Период опроса, мс
+    POLL_INTERVAL = 1000
+
+    # Больше изменений за раз - подписчикам проще перезагрузить список
+    MAX_CHANGES = 1000
+
+    def __init__(self, widget, db=None):
+        self.widget = widget
+        self.db = db or Database()
+        self.conn = sqlite3.connect(self.db.db_path)
+        self.data_version = self.read_data_version()
+        self.revision = self.db.get_products_revision()
+
+        self.subscribers = []
+        self.fetching = False
+        self.poll_id = None
+
+        # Отдельный поток: обновления не мигают индикатором загрузки списка
+        self.data = DataService(widget, workers=1)
+
+    @classmethod
+    def for_widget(cls, widget):
+        """Общий наблюдатель для корневого окна виджета"""
+        root = widget.nametowidget('.')
+        watcher = getattr(root, 'change_watcher', None)
+        if watcher is None:
+            watcher = root.change_watcher = cls(root)
+            root.bind('<Destroy>', lambda e: watcher.shutdown() if e.widget is root else None, add='+')
+        return watcher
+
+    def subscribe(self, callback, widget=None):
+        """Подписка на изменения: callback(products, deleted_ids, since, revision)
+
+        products - измененные и новые товары; None означает, что
+        изменений слишком много и список нужно перезагрузить целиком.
+        since и revision - ревизии товаров до и после этих изменений.
+        Пока виджеты всех подписчиков скрыты, изменения не загружаются.
+        """
+        self.subscribers.append((callback, widget))
+        if self.poll_id is None:
+            self.poll_id = self.widget.after(self.POLL_INTERVAL, self.poll)
+
+    def unsubscribe(self, callback):
+        """Отписка от изменений"""
+        self.subscribers = [entry for entry in self.subscribers if entry[0] != callback]
+
+    def has_visible_subscribers(self):
+        """Есть ли подписчик, которому изменения нужны сейчас"""
+        return any(widget is None or widget.winfo_viewable() for _, widget in self.subscribers)
+
+    def read_data_version(self):
+        """Счетчик записей других соединений в файл БД"""
+        return self.conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def poll(self):
+        """Проверка изменений (в покое - один PRAGMA на соединении)"""
+        self.poll_id = None
+        if not self.subscribers:
+            return
+
+        try:
+            version = self.read_data_version()
+        except sqlite3.Error as e:
+            print(f"⚠️ Не удалось проверить изменения БД: {e}")
+            version = self.data_version
+
+        # Пока все подписчики скрыты, data_version не запоминаем:
+        # изменения загрузятся одним запросом, когда кто-то станет виден
+        if version != self.data_version and not self.fetching and self.has_visible_subscribers():
+            self.data_version = version
+            self.fetching = True
+            self.data.submit(self.fetch_changes, self.revision,
+                             on_done=self.on_changes, on_error=self.on_error)
+
+        self.poll_id = self.widget.after(self.POLL_INTERVAL, self.poll)
+
+    def fetch_changes(self, since):
+        """Измененные товары после ревизии since (в фоновом потоке)"""
+        changes = self.db.get_products_changed_since(since, limit=self.MAX_CHANGES)
+        if not changes['complete']:
+            return since, changes['revision'], None, []
+
+        products = self.db.get_products_by_ids(changes['changed']) if changes['changed'] else []
+        # Товар мог быть удален уже после чтения ревизии
+        found = {product['id'] for product in products}
+        deleted = changes['deleted'] + [
+            product_id for product_id in changes['changed'] if product_id not in found
+        ]
+        return since, changes['revision'], products, deleted
+
+    def on_changes(self, result):
+        """Рассылка изменений подписчикам"""
+        self.fetching = False
+        since, self.revision, products, deleted = result
+        if products == [] and not deleted:
+            return
+        for callback, _ in list(self.subscribers):
+            callback(products, deleted, since, self.revision)
+
+    def on_error(self, error):
+        """Ошибка чтения изменений (повторим при следующем опросе)"""
+        self.fetching = False
+        self.data_version = None
+        print(f"⚠️ Не удалось загрузить изменения: {error}")
+
+    def shutdown(self):
+        """Остановка опроса"""
+        if self.poll_id is not None:
+            try:
+                self.widget.after_cancel(self.poll_id)
+            except Exception:
+                pass
+            self.poll_id = None
+        self.data.shutdown()
+        self.conn.close()
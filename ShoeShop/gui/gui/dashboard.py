@@ -0,0 +1,130 @@
+import tkinter as tk
+from tkinter import ttk, messagebox
+
+from models.db_models import Database
+
+# Показатели на карточках: ключ итогов -> (подпись, цвет)
+CARDS = (
+    ('products', "📦 Товаров", "#34495e"),
+    ('units', "🗃 Единиц на складе", "#2980b9"),
+    ('stock_value', "💰 Стоимость по цене", "#16a085"),
+    ('discounted_value', "🏷 Стоимость со скидкой", "#27ae60"),
+    ('out_of_stock', "⛔ Нет в наличии", "#c0392b"),
+    ('high_discount', "🔥 Скидка больше 15%", "#d35400")
+)
+
+class DashboardWindow:
+    """Вкладка показателей склада
+
+    Показатели читаются из сводной таблицы, которую ведут триггеры БД,
+    поэтому обновление дешевое и выполняется по таймеру.
+    """
+
+    # Период обновления данных, мс
+    REFRESH_INTERVAL = 5000
+
+    def __init__(self, parent, user, main_window):
+        self.parent = parent
+        self.user = user
+        self.main_window = main_window
+        self.db = Database()
+        self.refresh_id = None
+
+        self.setup_ui()
+        self.parent.bind('<Destroy>', self.on_destroy, add='+')
+        self.parent.bind('<Map>', self.on_show, add='+')
+        self.refresh()
+
+    def setup_ui(self):
+        """Создание интерфейса"""
+
+        # Карточки с итогами
+        cards_frame = tk.Frame(self.parent, bg="#f8f9fa")
+        cards_frame.pack(fill="x", padx=10, pady=10)
+
+        self.card_values = {}
+        for index, (key, title, color) in enumerate(CARDS):
+            card = tk.Frame(cards_frame, bg=color, padx=10, pady=8)
+            card.grid(row=index // 3, column=index % 3, padx=5, pady=5, sticky="nsew")
+            cards_frame.grid_columnconfigure(index % 3, weight=1)
+
+            tk.Label(card, text=title, bg=color, fg="white", font=("Arial", 10)).pack(anchor="w")
+            value = tk.Label(card, text="—", bg=color, fg="white", font=("Arial", 16, "bold"))
+            value.pack(anchor="w")
+            self.card_values[key] = value
+
+        # Таблица по поставщикам
+        tk.Label(self.parent, text="🚚 По поставщикам:", font=("Arial", 10, "bold")).pack(
+            anchor="w", padx=10
+        )
+
+        tree_frame = tk.Frame(self.parent)
+        tree_frame.pack(fill="both", expand=True, padx=10, pady=(0, 10))
+
+        columns = ('supplier', 'products', 'units', 'stock_value', 'discounted_value',
+                   'out_of_stock', 'high_discount')
+        self.tree = ttk.Treeview(tree_frame, columns=columns, show='headings', height=10)
+
+        vsb = ttk.Scrollbar(tree_frame, orient="vertical", command=self.tree.yview)
+        vsb.pack(side="right", fill="y")
+        self.tree.configure(yscrollcommand=vsb.set)
+
+        self.tree.heading('supplier', text='Поставщик')
+        self.tree.heading('products', text='Товаров')
+        self.tree.heading('units', text='Единиц')
+        self.tree.heading('stock_value', text='По цене')
+        self.tree.heading('discounted_value', text='Со скидкой')
+        self.tree.heading('out_of_stock', text='Нет в наличии')
+        self.tree.heading('high_discount', text='Скидка > 15%')
+
+        self.tree.column('supplier', width=220)
+        for column in columns[1:]:
+            self.tree.column(column, width=100, anchor='e')
+
+        self.tree.pack(fill="both", expand=True)
+
+    def refresh(self):
+        """Обновление показателей"""
+        self.refresh_id = None
+        # Скрытая вкладка не обновляется, обновление возобновит on_show
+        if not self.parent.winfo_viewable():
+            return
+        try:
+            summary = self.db.inventory_summary()
+        except Exception as e:
+            messagebox.showerror("Ошибка", f"Не удалось загрузить показатели: {str(e)}")
+            return
+
+        totals = summary['totals']
+        for key, _, _ in CARDS:
+            self.card_values[key].config(text=self.format_value(key, totals[key]))
+
+        self.tree.delete(*self.tree.get_children())
+        for row in summary['suppliers']:
+            self.tree.insert('', 'end', values=(
+                row['supplier'],
+                *(self.format_value(key, row[key]) for key in self.tree['columns'][1:])
+            ))
+
+        self.refresh_id = self.parent.after(self.REFRESH_INTERVAL, self.refresh)
+
+    def format_value(self, key, value):
+        """Число для отображения (суммы - в рублях с копейками)"""
+        if key in ('stock_value', 'discounted_value'):
+            # Накопленная триггерами сумма может уйти в -0.00 при нуле
+            return f"{round(value, 2) or 0.0:,.2f} ₽".replace(",", " ")
+        return f"{value:,}".replace(",", " ")
+
+    def on_show(self, event):
+        """Вкладка снова видна: обновляем сразу"""
+        if event.widget is not self.parent:
+            return
+        if self.refresh_id is not None:
+            self.parent.after_cancel(self.refresh_id)
+        self.refresh()
+
+    def on_destroy(self, event):
+        """Остановка обновления при закрытии вкладки"""
+        if event.widget is self.parent and self.refresh_id is not None:
+            self.parent.after_cancel(self.refresh_id)
+            self.refresh_id = None
@@ -0,0 +1,134 @@
+import queue
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+
+
+class DataService:
+    """Выполнение запросов к БД в фоновых потоках
+
+    Функции выполняются в пуле потоков, а результаты передаются
+    обратно в поток Tk через after(), поэтому окно не зависает
+    во время долгих запросов. Один сервис создается на корневое окно.
+    """
+
+    # Период опроса готовых результатов, мс (~60 кадров в секунду)
+    POLL_INTERVAL = 16
+
+    def __init__(self, widget, workers=2):
+        self.widget = widget
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="db")
+        self.results = queue.SimpleQueue()
+
+        # Номер последнего запроса по каждому каналу
+        self.generations = {}
+
+        self.pending = 0
+        self.poll_id = None
+        self.busy_listeners = []
+
+    @classmethod
+    def for_widget(cls, widget):
+        """Общий сервис для корневого окна виджета"""
+        root = widget.nametowidget('.')
+        service = getattr(root, 'data_service', None)
+        if service is None:
+            service = root.data_service = cls(root)
+            root.bind('<Destroy>', lambda e: service.shutdown() if e.widget is root else None, add='+')
+        return service
+
+    def submit(self, func, *args, on_done=None, on_error=None, channel=None, **kwargs):
+        """Запуск func(*args, **kwargs) в фоновом потоке
+
+        on_done(result) и on_error(exception) вызываются в потоке Tk.
+        Если для канала channel поступил более новый запрос,
+        результат предыдущего отбрасывается.
+        """
+        generation = None
+        if channel is not None:
+            generation = self.generations.get(channel, 0) + 1
+            self.generations[channel] = generation
+
+        future = self.executor.submit(func, *args, **kwargs)
+        future.add_done_callback(
+            lambda f: self.results.put((f, channel, generation, on_done, on_error))
+        )
+
+        self.pending += 1
+        if self.pending == 1:
+            self.notify_busy(True)
+        self.schedule_poll()
+        return future
+
+    def cancel(self, channel):
+        """Отметить текущий запрос канала как устаревший"""
+        self.generations[channel] = self.generations.get(channel, 0) + 1
+
+    def schedule_poll(self):
+        """Планирование проверки готовых результатов"""
+        if self.poll_id is None:
+            self.poll_id = self.widget.after(self.POLL_INTERVAL, self.poll)
+
+    def poll(self):
+        """Доставка готовых результатов в поток Tk"""
+        self.poll_id = None
+        while True:
+            try:
+                future, channel, generation, on_done, on_error = self.results.get_nowait()
+            except queue.Empty:
+                break
+
+            self.pending -= 1
+
+            # Устаревший ответ: уже выполнен более новый запрос
+            if channel is not None and generation != self.generations.get(channel):
+                continue
+
+            error = future.exception()
+            if error is not None:
+                if on_error:
+                    self.deliver(on_error, error)
+                else:
+                    print(f"Ошибка фонового запроса: {error}")
+            elif on_done:
+                self.deliver(on_done, future.result())
+
+        if self.pending:
+            self.schedule_poll()
+        else:
+            self.notify_busy(False)
+
+    def deliver(self, callback, value):
+        """Вызов обработчика результата
+
+        Ошибка в обработчике (например, окно уже закрыто) только выводится:
+        остальные результаты доставляются, опрос продолжается.
+        """
+        try:
+            callback(value)
+        except Exception as e:
+            print(f"⚠️ Ошибка обработчика фонового запроса: {e}")
+            traceback.print_exc()
+
+    def add_busy_listener(self, callback):
+        """Подписка на начало и окончание фоновой работы: callback(busy)"""
+        self.busy_listeners.append(callback)
+
+    def remove_busy_listener(self, callback):
+        """Отписка от уведомлений о фоновой работе"""
+        if callback in self.busy_listeners:
+            self.busy_listeners.remove(callback)
+
+    def notify_busy(self, busy):
+        """Уведомление подписчиков"""
+        for callback in list(self.busy_listeners):
+            self.deliver(callback, busy)
+
+    def shutdown(self):
+        """Остановка пула потоков"""
+        if self.poll_id is not None:
+            try:
+                self.widget.after_cancel(self.poll_id)
+            except Exception:
+                pass
+            self.poll_id = None
+        self.executor.shutdown(wait=False, cancel_futures=True)
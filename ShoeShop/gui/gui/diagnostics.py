@@ -0,0 +1,172 @@
+import tkinter as tk
+from tkinter import ttk
+
+from models.instrumentation import profiler
+
+class DiagnosticsWindow:
+    """Вкладка диагностики: статистика запросов и медленные запросы"""
+
+    # Период обновления данных, мс
+    REFRESH_INTERVAL = 1000
+
+    def __init__(self, parent, user, main_window):
+        self.parent = parent
+        self.user = user
+        self.main_window = main_window
+        self.refresh_id = None
+
+        self.enabled_var = tk.BooleanVar(value=profiler.enabled)
+        self.threshold_var = tk.StringVar(value=f"{profiler.slow_threshold * 1000:g}")
+
+        self.setup_ui()
+        self.parent.bind('<Destroy>', self.on_destroy, add='+')
+        self.parent.bind('<Map>', self.on_show, add='+')
+        self.refresh()
+
+    def setup_ui(self):
+        """Создание интерфейса"""
+
+        # Панель управления
+        control_frame = tk.Frame(self.parent, bg="#f8f9fa")
+        control_frame.pack(fill="x", padx=10, pady=10)
+
+        ttk.Checkbutton(
+            control_frame,
+            text="Сбор статистики",
+            variable=self.enabled_var,
+            command=self.toggle
+        ).pack(side="left", padx=10, pady=10)
+
+        tk.Label(control_frame, text="Медленный запрос, мс:", bg="#f8f9fa", font=("Arial", 10)).pack(
+            side="left", padx=(20, 5)
+        )
+        threshold_entry = ttk.Entry(control_frame, textvariable=self.threshold_var, width=8)
+        threshold_entry.pack(side="left")
+        threshold_entry.bind('<Return>', lambda e: self.apply_threshold())
+        threshold_entry.bind('<FocusOut>', lambda e: self.apply_threshold())
+
+        tk.Button(
+            control_frame,
+            text="🧹 Сбросить",
+            command=self.reset,
+            bg="#95a5a6",
+            fg="white",
+            font=("Arial", 10),
+            cursor="hand2"
+        ).pack(side="right", padx=10)
+
+        # Таблица статистики
+        stats_frame = tk.Frame(self.parent)
+        stats_frame.pack(fill="both", expand=True, padx=10, pady=5)
+
+        columns = ('name', 'calls', 'total', 'avg', 'p95', 'max', 'rows')
+        self.tree = ttk.Treeview(stats_frame, columns=columns, show='headings', height=12)
+
+        vsb = ttk.Scrollbar(stats_frame, orient="vertical", command=self.tree.yview)
+        vsb.pack(side="right", fill="y")
+        self.tree.configure(yscrollcommand=vsb.set)
+
+        self.tree.heading('name', text='Операция')
+        self.tree.heading('calls', text='Вызовы')
+        self.tree.heading('total', text='Всего, мс')
+        self.tree.heading('avg', text='Среднее, мс')
+        self.tree.heading('p95', text='p95, мс')
+        self.tree.heading('max', text='Макс., мс')
+        self.tree.heading('rows', text='Строк')
+
+        self.tree.column('name', width=380)
+        for column in columns[1:]:
+            self.tree.column(column, width=80, anchor='e')
+
+        self.tree.pack(fill="both", expand=True)
+
+        # Журнал медленных запросов
+        tk.Label(
+            self.parent,
+            text="🐢 Медленные запросы (с планом выполнения):",
+            font=("Arial", 10, "bold")
+        ).pack(anchor="w", padx=10)
+
+        self.slow_text = tk.Text(self.parent, height=10, font=("Courier", 9), state="disabled")
+        self.slow_text.pack(fill="both", padx=10, pady=(0, 10))
+
+        # Строки таблицы по имени операции
+        self.rows = {}
+        self.last_seq = 0
+
+    def toggle(self):
+        """Включение и выключение сбора статистики"""
+        if self.enabled_var.get():
+            profiler.enable()
+        else:
+            profiler.disable()
+
+    def apply_threshold(self):
+        """Новый порог медленного запроса"""
+        try:
+            profiler.slow_threshold = max(0.0, float(self.threshold_var.get().replace(',', '.'))) / 1000
+        except ValueError:
+            self.threshold_var.set(f"{profiler.slow_threshold * 1000:g}")
+
+    def reset(self):
+        """Очистка статистики"""
+        profiler.reset()
+        self.tree.delete(*self.tree.get_children())
+        self.rows = {}
+        self.slow_text.config(state="normal")
+        self.slow_text.delete("1.0", "end")
+        self.slow_text.config(state="disabled")
+
+    def refresh(self):
+        """Обновление таблицы и журнала"""
+        self.refresh_id = None
+        # Скрытая вкладка не обновляется, обновление возобновит on_show
+        if not self.parent.winfo_viewable():
+            return
+        items, slow = profiler.snapshot()
+
+        for index, item in enumerate(items):
+            values = (
+                item['name'],
+                item['calls'],
+                f"{item['total_ms']:.1f}",
+                f"{item['avg_ms']:.2f}",
+                f"{item['p95_ms']:.1f}",
+                f"{item['max_ms']:.1f}",
+                item['rows']
+            )
+            iid = self.rows.get(item['name'])
+            if iid is None:
+                iid = self.rows[item['name']] = self.tree.insert('', index, values=values)
+            else:
+                self.tree.item(iid, values=values)
+                if self.tree.index(iid) != index:
+                    self.tree.move(iid, '', index)
+
+        # В журнал дописываем только новые записи
+        new_entries = [entry for entry in slow if entry['seq'] > self.last_seq]
+        if new_entries:
+            self.slow_text.config(state="normal")
+            for entry in new_entries:
+                self.slow_text.insert("end", f"[{entry['time']}] {entry['ms']:.1f} мс: {entry['sql']}\n")
+                for line in entry['plan']:
+                    self.slow_text.insert("end", f"    {line}\n")
+            self.slow_text.see("end")
+            self.slow_text.config(state="disabled")
+            self.last_seq = new_entries[-1]['seq']
+
+        self.refresh_id = self.parent.after(self.REFRESH_INTERVAL, self.refresh)
+
+    def on_show(self, event):
+        """Вкладка снова видна: обновляем сразу"""
+        if event.widget is not self.parent:
+            return
+        if self.refresh_id is not None:
+            self.parent.after_cancel(self.refresh_id)
+        self.refresh()
+
+    def on_destroy(self, event):
+        """Остановка обновления при закрытии вкладки"""
+        if event.widget is self.parent and self.refresh_id is not None:
+            self.parent.after_cancel(self.refresh_id)
+            self.refresh_id = None
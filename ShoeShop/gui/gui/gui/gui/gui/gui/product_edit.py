@@ -1,13 +1,20 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
-import sys
 import os
-from PIL import Image, ImageTk
-import shutil
-
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from models.db_models import Database
+from models.photo_store import PhotoStore
+from models.validation import check_limit
+from gui.data_service import DataService
+from gui.image_cache import PhotoCache, ingest_photo
+
+# Поля с выбором из справочника: поле -> (справочник, колонка товара)
+REFERENCE_FIELDS = {
+    'category': ('categories', 'category_id'),
+    'manufacturer': ('manufacturers', 'manufacturer_id'),
+    'supplier': ('suppliers', 'supplier_id'),
+    'unit': ('units', 'unit_id')
+}
 
 class ProductEditWindow:
     """Окно редактирования товара"""
@@ -17,9 +24,18 @@ class ProductEditWindow:
         self.product_id = product_id
         self.parent_window = parent_window
         self.db = Database()
+        self.photo_cache = None
+        self.photo_store = PhotoStore()
         self.photo_path = None
         self.old_photo_path = None
         
+        # Значения полей-справочников у товара до редактирования
+        self.original_ids = {}
+        
+        # Фото, загруженные в этом окне (путь -> байты JPEG), и признак сохранения товара
+        self.uploaded_photos = {}
+        self.saved = False
+        
         # Проверка прав
         if user['role'] != 'admin':
             messagebox.showerror("Ошибка", "Только администратор может редактировать товары")
@@ -33,6 +49,9 @@ class ProductEditWindow:
         self.window.grab_set()  # Модальное окно
         self.window.focus_set()
         
+        # Кэш миниатюр фото
+        self.photo_cache = PhotoCache.for_widget(self.window)
+        
         # Центрируем
         self.center_window()
         
@@ -59,11 +78,46 @@ class ProductEditWindow:
         self.window.geometry(f'+{x}+{y}')
     
     def load_reference_data(self):
-        """Загрузка справочников"""
-        self.categories = self.db.get_categories()
-        self.manufacturers = self.db.get_manufacturers()
-        self.suppliers = self.db.get_suppliers()
-        self.units = self.db.get_units()
+        """Загрузка справочников (из общего кэша)"""
+        self.references = {
+            field: self.db.get_reference(table) for field, (table, _) in REFERENCE_FIELDS.items()
+        }
+    
+    def refresh_reference(self, field):
+        """Перечитывание справочника поля, если он изменился в БД"""
+        table, _ = REFERENCE_FIELDS[field]
+        self.references[field] = self.db.get_reference(table)
+        self.entries[field]['values'] = self.references[field].labels()
+    
+    def set_reference(self, field, item_id):
+        """Выбор элемента справочника по ID товара"""
+        self.original_ids[field] = item_id
+        if item_id is None:
+            return
+        label = self.references[field].label_of(item_id)
+        if label is None:
+            # Элемент добавлен в другом терминале после загрузки справочника
+            self.refresh_reference(field)
+            label = self.references[field].label_of(item_id)
+        if label:
+            self.entries[field].set(label)
+    
+    def reference_id(self, field):
+        """ID выбранного элемента справочника
+        
+        Если ничего не выбрано, остается прежнее значение товара,
+        чтобы не записать пустое значение, которое пользователь не выбирал.
+        """
+        label = self.entries[field].get()
+        if not label:
+            return self.original_ids.get(field)
+        item_id = self.references[field].id_of(label)
+        if item_id is None:
+            self.refresh_reference(field)
+            item_id = self.references[field].id_of(label)
+        if item_id is None:
+            raise ValueError(f"«{label}» больше нет в справочнике, выберите другое значение")
+        return item_id
     
     def setup_ui(self):
         """Создание интерфейса"""
@@ -156,7 +210,8 @@ class ProductEditWindow:
         )
         self.entries['category'] = ttk.Combobox(
             fields_frame,
-            values=[c['name'] for c in self.categories],
+            values=self.references['category'].labels(),
+            postcommand=lambda: self.refresh_reference('category'),
             state="readonly",
             width=38
         )
@@ -169,7 +224,8 @@ class ProductEditWindow:
         )
         self.entries['manufacturer'] = ttk.Combobox(
             fields_frame,
-            values=[m['name'] for m in self.manufacturers],
+            values=self.references['manufacturer'].labels(),
+            postcommand=lambda: self.refresh_reference('manufacturer'),
             state="readonly",
             width=38
         )
@@ -182,7 +238,8 @@ class ProductEditWindow:
         )
         self.entries['supplier'] = ttk.Combobox(
             fields_frame,
-            values=[s['name'] for s in self.suppliers],
+            values=self.references['supplier'].labels(),
+            postcommand=lambda: self.refresh_reference('supplier'),
             state="readonly",
             width=38
         )
@@ -219,7 +276,8 @@ class ProductEditWindow:
         )
         self.entries['unit'] = ttk.Combobox(
             fields_frame,
-            values=[f"{u['name']} ({u['short_name']})" for u in self.units],
+            values=self.references['unit'].labels(),
+            postcommand=lambda: self.refresh_reference('unit'),
             state="readonly",
             width=38
         )
@@ -268,12 +326,13 @@ class ProductEditWindow:
         button_frame = ttk.Frame(parent)
         button_frame.pack(fill="x", pady=20)
         
-        ttk.Button(
+        self.save_btn = ttk.Button(
             button_frame,
             text="💾 Сохранить",
             command=self.save_product,
             width=15
-        ).pack(side="left", padx=5)
+        )
+        self.save_btn.pack(side="left", padx=5)
         
         ttk.Button(
             button_frame,
@@ -288,9 +347,7 @@ class ProductEditWindow:
             # Пробуем загрузить заглушку
             placeholder = "resources/picture.png"
             if os.path.exists(placeholder):
-                img = Image.open(placeholder)
-                img = img.resize((150, 150), Image.Resampling.LANCZOS)
-                photo = ImageTk.PhotoImage(img)
+                photo = self.photo_cache.get(placeholder)
                 self.photo_label.config(image=photo)
                 self.photo_label.image = photo
             else:
@@ -313,48 +370,52 @@ class ProductEditWindow:
         if not file_path:
             return
         
-        try:
-            # Открываем изображение
-            img = Image.open(file_path)
-            
-            # Ресайз до 300x200
-            img = img.resize((300, 200), Image.Resampling.LANCZOS)
-            
-            # Генерируем имя файла
-            import time
-            filename = f"product_{int(time.time())}.jpg"
-            save_path = os.path.join("uploads", filename)
-            
-            # Сохраняем
-            img.save(save_path, "JPEG", quality=85)
-            
-            # Обновляем путь
-            if self.photo_path and not self.old_photo_path:
-                self.old_photo_path = self.photo_path
-            self.photo_path = save_path
-            
-            # Показываем в интерфейсе
-            display_img = img.resize((150, 150), Image.Resampling.LANCZOS)
-            photo = ImageTk.PhotoImage(display_img)
-            self.photo_label.config(image=photo)
-            self.photo_label.image = photo
-            
-            messagebox.showinfo("Успех", "Фото загружено")
-            
-        except Exception as e:
-            messagebox.showerror("Ошибка", f"Не удалось загрузить фото: {str(e)}")
+        # Декодирование, ресайз и запись в хранилище выполняются в фоне
+        self.window.config(cursor="watch")
+        DataService.for_widget(self.window).submit(
+            ingest_photo,
+            file_path,
+            self.photo_store,
+            on_done=self.on_photo_loaded,
+            on_error=self.on_photo_error
+        )
+    
+    def on_photo_loaded(self, result):
+        """Фото обработано"""
+        if not self.window.winfo_exists():
+            return
+        self.window.config(cursor="")
+        save_path, data, preview = result
+        self.uploaded_photos[save_path] = data
+        
+        # Обновляем путь
+        if self.photo_path and not self.old_photo_path:
+            self.old_photo_path = self.photo_path
+        self.photo_path = save_path
+        
+        # Показываем в интерфейсе (PIL к этому моменту уже загружен)
+        from PIL import ImageTk
+        photo = ImageTk.PhotoImage(preview)
+        self.photo_label.config(image=photo)
+        self.photo_label.image = photo
+        
+        messagebox.showinfo("Успех", "Фото загружено")
+    
+    def on_photo_error(self, error):
+        """Ошибка обработки фото"""
+        if self.window.winfo_exists():
+            self.window.config(cursor="")
+        messagebox.showerror("Ошибка", f"Не удалось загрузить фото: {str(error)}")
     
     def delete_photo(self):
-        """Удаление фото"""
-        if self.photo_path and os.path.exists(self.photo_path):
+        """Удаление фото (файл удаляется после сохранения, если он больше не нужен)"""
+        if self.photo_path:
             if messagebox.askyesno("Подтверждение", "Удалить фото?"):
-                try:
-                    os.remove(self.photo_path)
-                    self.photo_path = None
-                    self.show_placeholder()
-                    messagebox.showinfo("Успех", "Фото удалено")
-                except Exception as e:
-                    messagebox.showerror("Ошибка", f"Не удалось удалить фото: {str(e)}")
+                if not self.old_photo_path:
+                    self.old_photo_path = self.photo_path
+                self.photo_path = None
+                self.show_placeholder()
+                messagebox.showinfo("Успех", "Фото удалено")
     
     def load_product_data(self):
         """Загрузка данных товара"""
@@ -368,23 +429,10 @@ class ProductEditWindow:
         # Заполняем поля
         self.entries['name'].insert(0, product['name'] or "")
         
-        # Категория
-        if product['category_id']:
-            cat = next((c for c in self.categories if c['id'] == product['category_id']), None)
-            if cat:
-                self.entries['category'].set(cat['name'])
-        
-        # Производитель
-        if product['manufacturer_id']:
-            man = next((m for m in self.manufacturers if m['id'] == product['manufacturer_id']), None)
-            if man:
-                self.entries['manufacturer'].set(man['name'])
-        
-        # Поставщик
-        if product['supplier_id']:
-            sup = next((s for s in self.suppliers if s['id'] == product['supplier_id']), None)
-            if sup:
-                self.entries['supplier'].set(sup['name'])
+        # Категория, производитель, поставщик
+        self.set_reference('category', product['category_id'])
+        self.set_reference('manufacturer', product['manufacturer_id'])
+        self.set_reference('supplier', product['supplier_id'])
         
         # Цена
         self.entries['price'].insert(0, str(product['price']))
@@ -394,10 +442,7 @@ class ProductEditWindow:
             self.entries['discount'].insert(0, str(product['discount']))
         
         # Единица измерения
-        if product['unit_id']:
-            unit = next((u for u in self.units if u['id'] == product['unit_id']), None)
-            if unit:
-                self.entries['unit'].set(f"{unit['name']} ({unit['short_name']})")
+        self.set_reference('unit', product['unit_id'])
         
         # Количество
         self.entries['quantity'].insert(0, str(product['quantity']))
@@ -410,9 +455,7 @@ class ProductEditWindow:
         if product['photo_path'] and os.path.exists(product['photo_path']):
             self.photo_path = product['photo_path']
             try:
-                img = Image.open(product['photo_path'])
-                img = img.resize((150, 150), Image.Resampling.LANCZOS)
-                photo = ImageTk.PhotoImage(img)
+                photo = self.photo_cache.get(product['photo_path'])
                 self.photo_label.config(image=photo)
                 self.photo_label.image = photo
             except Exception as e:
@@ -429,8 +472,9 @@ class ProductEditWindow:
         # Цена
         try:
             price = float(self.entries['price'].get().strip())
-            if price < 0:
-                errors.append("Цена не может быть отрицательной")
+            error = check_limit('price', price)
+            if error:
+                errors.append(error)
         except ValueError:
             errors.append("Цена должна быть числом")
         
@@ -438,9 +482,9 @@ class ProductEditWindow:
         disc = self.entries['discount'].get().strip()
         if disc:
             try:
-                d = float(disc)
-                if d < 0 or d > 100:
-                    errors.append("Скидка должна быть от 0 до 100")
+                error = check_limit('discount', float(disc))
+                if error:
+                    errors.append(error)
             except ValueError:
                 errors.append("Скидка должна быть числом")
         
@@ -448,9 +492,9 @@ class ProductEditWindow:
         qty = self.entries['quantity'].get().strip()
         if qty:
             try:
-                q = int(qty)
-                if q < 0:
-                    errors.append("Количество не может быть отрицательным")
+                error = check_limit('quantity', int(qty))
+                if error:
+                    errors.append(error)
             except ValueError:
                 errors.append("Количество должно быть целым числом")
         
@@ -477,78 +521,72 @@ class ProductEditWindow:
                 'discount': float(self.entries['discount'].get().strip() or 0),
                 'quantity': int(self.entries['quantity'].get().strip() or 0),
                 'photo_path': self.photo_path,
-                'manufacturer_id': None,
-                'supplier_id': None,
-                'category_id': None,
-                'unit_id': None
+                # ID из выпадающих списков
+                'manufacturer_id': self.reference_id('manufacturer'),
+                'supplier_id': self.reference_id('supplier'),
+                'category_id': self.reference_id('category'),
+                'unit_id': self.reference_id('unit')
             }
-            
-            # Получаем ID из выпадающих списков
-            cat_name = self.entries['category'].get()
-            if cat_name:
-                cat = next((c for c in self.categories if c['name'] == cat_name), None)
-                if cat:
-                    data['category_id'] = cat['id']
-            
-            man_name = self.entries['manufacturer'].get()
-            if man_name:
-                man = next((m for m in self.manufacturers if m['name'] == man_name), None)
-                if man:
-                    data['manufacturer_id'] = man['id']
-            
-            sup_name = self.entries['supplier'].get()
-            if sup_name:
-                sup = next((s for s in self.suppliers if s['name'] == sup_name), None)
-                if sup:
-                    data['supplier_id'] = sup['id']
-            
-            unit_text = self.entries['unit'].get()
-            if unit_text:
-                unit_name = unit_text.split(' (')[0]
-                unit = next((u for u in self.units if u['name'] == unit_name), None)
-                if unit:
-                    data['unit_id'] = unit['id']
-            
-            # Сохраняем
-            if self.product_id:
-                # Удаляем старое фото если нужно
-                if self.old_photo_path and os.path.exists(self.old_photo_path):
-                    try:
-                        os.remove(self.old_photo_path)
-                    except:
-                        pass
-                
-                self.db.update_product(self.product_id, data)
-                messagebox.showinfo("Успех", "Товар обновлен")
-            else:
-                new_id = self.db.add_product(data)
-                # Переименовываем временное фото
-                if self.photo_path and 'temp_' not in self.photo_path:
-                    new_path = os.path.join("uploads", f"product_{new_id}.jpg")
-                    try:
-                        os.rename(self.photo_path, new_path)
-                        data['photo_path'] = new_path
-                        self.db.update_product(new_id, data)
-                    except:
-                        pass
-                messagebox.showinfo("Успех", "Товар добавлен")
-            
-            # Обновляем список
-            if self.parent_window:
-                self.parent_window.refresh_products()
-            
-            self.on_closing()
-            
         except Exception as e:
             messagebox.showerror("Ошибка", f"Не удалось сохранить: {str(e)}")
+            return
+        
+        # Запись в БД выполняется в фоне, повторное нажатие блокируем
+        self.save_btn.config(state="disabled")
+        DataService.for_widget(self.window).submit(
+            self.write_product,
+            data,
+            on_done=self.on_saved,
+            on_error=self.on_save_error
+        )
+    
+    def write_product(self, data):
+        """Запись товара в БД (выполняется в фоновом потоке)"""
+        if self.product_id:
+            self.db.update_product(self.product_id, data)
+            saved_id = self.product_id
+        else:
+            saved_id = self.db.add_product(data)
+        
+        # Загруженный файл совпал с чужим и мог быть удален вместе с тем
+        # товаром до сохранения: теперь ссылка записана, возвращаем файл
+        photo_data = self.uploaded_photos.get(data['photo_path'])
+        if photo_data is not None:
+            self.photo_store.restore(data['photo_path'], photo_data)
+        
+        # Удаляем старое фото, если на него больше никто не ссылается
+        if self.product_id and self.old_photo_path != data['photo_path']:
+            self.photo_store.release(self.old_photo_path, self.db)
+        return saved_id
+    
+    def on_saved(self, saved_id):
+        """Товар сохранен"""
+        self.saved = True
+        messagebox.showinfo("Успех", "Товар обновлен" if self.product_id else "Товар добавлен")
+        
+        # Обновляем список
+        if self.parent_window:
+            self.parent_window.refresh_products(saved_id)
+        
+        if self.window.winfo_exists():
+            self.on_closing()
+    
+    def on_save_error(self, error):
+        """Ошибка сохранения"""
+        messagebox.showerror("Ошибка", f"Не удалось сохранить: {str(error)}")
+        if self.window.winfo_exists():
+            self.save_btn.config(state="normal")
     
     def on_closing(self):
         """Закрытие окна"""
-        # Удаляем временные фото
-        if self.photo_path and 'temp_' in self.photo_path and os.path.exists(self.photo_path):
-            try:
-                os.remove(self.photo_path)
-            except:
-                pass
+        # Удаляем загруженные, но не сохраненные в товаре фото
+        unused = [
+            path for path in self.uploaded_photos
+            if not (self.saved and path == self.photo_path)
+        ]
+        if unused:
+            DataService.for_widget(self.window).submit(
+                lambda: [self.photo_store.release(path, self.db) for path in unused]
+            )
         
         self.window.destroy()
\ No newline at end of file
@@ -1,11 +1,28 @@
 import tkinter as tk
-from tkinter import ttk, messagebox
-import sys
-import os
+from tkinter import ttk, messagebox, filedialog
 
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from models.db_models import Database, parse_sort
+from models.catalog import ProductCatalog
+from models.photo_store import PhotoStore
+from models.exporter import export_products
+from models.instrumentation import timed
+from gui.virtual_tree import VirtualTreeview
+from gui.data_service import DataService
+from gui.change_watcher import ChangeWatcher
+from gui.image_cache import ThumbnailLoader, LIST_THUMB_SIZE
 
-from models.db_models import Database
+# Сколько товаров подгружать из БД за один запрос
+PAGE_SIZE = 200
+
+# Держать весь каталог в памяти с триграммным индексом
+# (мгновенный поиск по мере ввода на мощных терминалах)
+MEMORY_CATALOG = False
+
+# Колонка с миниатюрами фото (загружаются только для видимых строк)
+SHOW_THUMBNAILS = True
+
+# Колонки, сортируемые щелчком по заголовку (Shift+щелчок - дополнительный ключ)
+SORTABLE_COLUMNS = ('id', 'name', 'category', 'manufacturer', 'supplier', 'price', 'discount', 'quantity')
 
 class ProductListWindow:
     """Окно списка товаров"""
@@ -15,6 +32,10 @@ class ProductListWindow:
         self.user = user
         self.main_window = main_window
         self.db = Database()
+        self.catalog = ProductCatalog() if MEMORY_CATALOG else None
+        
+        # Запросы к БД выполняются в фоне
+        self.data = DataService.for_widget(parent)
         
         # Переменные для фильтрации
         self.search_var = tk.StringVar()
@@ -30,6 +51,17 @@ class ProductListWindow:
         # Создаем интерфейс
         self.setup_ui()
         
+        # Индикатор загрузки
+        self.data.add_busy_listener(self.show_loading)
+        self.parent.bind('<Destroy>', self.on_destroy, add='+')
+        
+        # Изменения товаров из других окон и терминалов; скрытая вкладка
+        # только отмечает, что отстала, и догоняет при показе
+        self.stale = False
+        self.watcher = ChangeWatcher.for_widget(parent)
+        self.watcher.subscribe(self.on_external_changes, parent)
+        self.parent.bind('<Map>', self.on_show, add='+')
+        
         # Загружаем товары
         self.load_products()
     
@@ -99,18 +131,20 @@ class ProductListWindow:
             row=1, column=0, padx=(10,5), pady=10, sticky="w"
         )
         
-        suppliers = self.db.get_suppliers()
-        supplier_values = ["all"] + [s['name'] for s in suppliers]
-        
         self.supplier_combo = ttk.Combobox(
             filter_frame,
             textvariable=self.filter_supplier_var,
-            values=supplier_values,
+            postcommand=self.update_supplier_values,
             state="readonly",
             width=25
         )
         self.supplier_combo.grid(row=1, column=1, columnspan=3, padx=5, pady=10, sticky="w")
         self.supplier_combo.bind('<<ComboboxSelected>>', lambda e: self.apply_filters())
+        self.update_supplier_values()
+    
+    def update_supplier_values(self):
+        """Список поставщиков фильтра (справочник перечитывается, если изменился)"""
+        self.supplier_combo['values'] = ["all"] + self.db.get_reference('suppliers').labels()
     
     def setup_treeview(self):
         """Создание таблицы товаров"""
@@ -136,26 +170,45 @@ class ProductListWindow:
         self.tree = ttk.Treeview(
             tree_frame,
             columns=columns,
-            show='headings',
-            yscrollcommand=vsb.set,
+            show='tree headings' if SHOW_THUMBNAILS else 'headings',
+            selectmode='extended',
             xscrollcommand=hsb.set,
             height=20
         )
         
+        # Миниатюры выводятся в колонке #0, строки делаем выше
+        self.thumbnails = None
+        if SHOW_THUMBNAILS:
+            ttk.Style(self.tree).configure('Products.Treeview', rowheight=LIST_THUMB_SIZE[1] + 4)
+            self.tree.configure(style='Products.Treeview')
+            self.tree.heading('#0', text='Фото')
+            self.tree.column('#0', width=LIST_THUMB_SIZE[0] + 16, stretch=False, anchor='center')
+            self.thumbnails = ThumbnailLoader(self.tree, on_ready=lambda: self.table.render())
+        
         # Настройка скроллбаров
-        vsb.config(command=self.tree.yview)
         hsb.config(command=self.tree.xview)
         
         # Заголовки
-        self.tree.heading('id', text='ID')
-        self.tree.heading('name', text='Наименование')
-        self.tree.heading('category', text='Категория')
-        self.tree.heading('manufacturer', text='Производитель')
-        self.tree.heading('supplier', text='Поставщик')
-        self.tree.heading('price', text='Цена')
-        self.tree.heading('discount', text='Скидка %')
-        self.tree.heading('quantity', text='Кол-во')
-        self.tree.heading('unit', text='Ед.')
+        self.headings = {
+            'id': 'ID',
+            'name': 'Наименование',
+            'category': 'Категория',
+            'manufacturer': 'Производитель',
+            'supplier': 'Поставщик',
+            'price': 'Цена',
+            'discount': 'Скидка %',
+            'quantity': 'Кол-во',
+            'unit': 'Ед.'
+        }
+        for column, text in self.headings.items():
+            self.tree.heading(column, text=text)
+        
+        # Сортировка по заголовкам (для менеджера и админа)
+        if self.user['role'] in ['manager', 'admin']:
+            for column in SORTABLE_COLUMNS:
+                self.tree.heading(column, command=lambda c=column: self.sort_by_column(c))
+            self.tree.bind('<Shift-Button-1>', self.on_shift_click, add='+')
+            self.update_headings()
         
         # Ширина колонок
         self.tree.column('id', width=50, anchor='center')
@@ -175,6 +228,20 @@ class ProductListWindow:
         self.tree.tag_configure('high_discount', background='#c8e6c9')  # Зеленый
         self.tree.tag_configure('discounted', foreground='red')
         
+        # Виртуальная прокрутка: строки создаются только для видимой области
+        self.table = VirtualTreeview(
+            self.tree,
+            vsb,
+            fetch_page=self.fetch_page,
+            format_row=self.format_row,
+            page_size=PAGE_SIZE,
+            # Каталог в памяти отвечает мгновенно, фон нужен только для БД
+            submit=self.submit_page if self.catalog is None else None,
+            on_loaded=self.update_count,
+            on_error=self.show_load_error,
+            row_image=self.row_image if SHOW_THUMBNAILS else None
+        )
+        
         # Привязываем события
         if self.user['role'] == 'admin':
             self.tree.bind('<Double-1>', self.edit_product)
@@ -189,13 +256,25 @@ class ProductListWindow:
         tk.Button(
             button_frame,
             text="🔄 Обновить",
-            command=self.load_products,
+            command=self.refresh,
             bg="#3498db",
             fg="white",
             font=("Arial", 10),
             cursor="hand2"
         ).pack(side="left", padx=10, pady=10)
         
+        # Выгрузка для менеджера и админа
+        if self.user['role'] in ['manager', 'admin']:
+            tk.Button(
+                button_frame,
+                text="📤 Экспорт",
+                command=self.export_products,
+                bg="#8e44ad",
+                fg="white",
+                font=("Arial", 10),
+                cursor="hand2"
+            ).pack(side="left", padx=5, pady=10)
+        
         # Для администратора
         if self.user['role'] == 'admin':
             tk.Button(
@@ -208,6 +287,16 @@ class ProductListWindow:
                 cursor="hand2"
             ).pack(side="left", padx=5, pady=10)
             
+            tk.Button(
+                button_frame,
+                text="✏️ Изменить выбранные",
+                command=self.bulk_edit,
+                bg="#f39c12",
+                fg="white",
+                font=("Arial", 10),
+                cursor="hand2"
+            ).pack(side="left", padx=5, pady=10)
+            
             tk.Button(
                 button_frame,
                 text="🗑️ Удалить",
@@ -218,6 +307,16 @@ class ProductListWindow:
                 cursor="hand2"
             ).pack(side="left", padx=5, pady=10)
         
+        # Индикатор фоновой загрузки
+        self.loading_label = tk.Label(
+            button_frame,
+            text="",
+            bg="#f8f9fa",
+            fg="#7f8c8d",
+            font=("Arial", 10)
+        )
+        self.loading_label.pack(side="right", padx=5)
+        
         # Счетчик товаров
         self.count_label = tk.Label(
             button_frame,
@@ -227,113 +326,202 @@ class ProductListWindow:
         )
         self.count_label.pack(side="right", padx=20)
     
+    def get_query_params(self):
+        """Текущие параметры поиска, фильтра и сортировки"""
+        return {
+            'search': self.search_var.get().strip(),
+            'supplier': self.filter_supplier_var.get(),
+            'sort': self.sort_var.get()
+        }
+    
     def load_products(self):
         """Загрузка товаров из БД"""
-        try:
-            self.products = self.db.get_all_products()
-            self.display_products(self.products)
-        except Exception as e:
-            messagebox.showerror("Ошибка", f"Не удалось загрузить товары: {str(e)}")
-    
-    def display_products(self, products):
-        """Отображение товаров в таблице"""
-        # Очищаем таблицу
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-        
-        # Заполняем новыми данными
-        for product in products:
-            # Определяем теги для форматирования
-            tags = []
-            
-            if product['quantity'] == 0:
-                tags.append('no_stock')
-            
-            if product['discount'] > 15:
-                tags.append('high_discount')
-            
-            # Форматирование цены со скидкой
-            if product['discount'] > 0:
-                final_price = product['price'] * (1 - product['discount'] / 100)
-                price_display = f"~~{product['price']:.2f}~~ {final_price:.2f}"
-                tags.append('discounted')
-            else:
-                price_display = f"{product['price']:.2f}"
-            
-            # Вставляем строку
-            self.tree.insert(
-                '',
-                'end',
-                values=(
-                    product['id'],
-                    product['name'],
-                    product['category'],
-                    product['manufacturer'],
-                    product['supplier'],
-                    price_display,
-                    f"{product['discount']}%",
-                    product['quantity'],
-                    product['unit']
-                ),
-                tags=tags
+        if self.catalog is not None:
+            # Каталог в памяти строится в фоне и подменяется целиком
+            self.data.submit(
+                self.fetch_catalog,
+                on_done=self.set_catalog,
+                on_error=self.show_load_error,
+                channel=('catalog', id(self))
             )
-        
-        # Обновляем счетчик
-        self.count_label.config(text=f"Всего товаров: {len(products)}")
+        else:
+            self.table.reload()
     
-    def apply_filters(self, *args):
-        """Применение фильтров"""
-        if not hasattr(self, 'products'):
+    def fetch_catalog(self):
+        """Полная загрузка каталога (в фоновом потоке)"""
+        # Ревизия читается до товаров: изменения во время загрузки
+        # будут применены повторно при следующей синхронизации
+        revision = self.db.get_products_revision()
+        return ProductCatalog(self.db.get_all_products(), revision)
+    
+    def sync_catalog(self):
+        """Подтягивание в каталог только товаров, измененных после его ревизии"""
+        catalog = self.catalog
+        if catalog.revision is None:
+            # Каталог еще загружается
             return
         
-        filtered = self.products.copy()
-        
-        # Поиск по тексту
-        search_text = self.search_var.get().lower()
-        if search_text:
-            filtered = [
-                p for p in filtered
-                if search_text in p['name'].lower()
-                or search_text in (p['description'] or '').lower()
-                or search_text in p['category'].lower()
-                or search_text in p['manufacturer'].lower()
-                or search_text in p['supplier'].lower()
-            ]
-        
-        # Фильтр по поставщику
-        supplier_filter = self.filter_supplier_var.get()
-        if supplier_filter and supplier_filter != "all":
-            filtered = [
-                p for p in filtered
-                if p['supplier'] == supplier_filter
-            ]
+        def fetch():
+            changes = self.db.get_products_changed_since(
+                catalog.revision, limit=ChangeWatcher.MAX_CHANGES
+            )
+            if not changes['complete']:
+                return changes, None
+            return changes, self.db.get_products_by_ids(changes['changed']) if changes['changed'] else []
+        
+        def apply(result):
+            changes, products = result
+            if catalog is not self.catalog:
+                return
+            if products is None:
+                self.load_products()
+                return
+            found = {product['id'] for product in products}
+            deleted = changes['deleted'] + [pid for pid in changes['changed'] if pid not in found]
+            # Пока шел запрос, каталог могли продвинуть рассылки наблюдателя
+            catalog.revision = max(catalog.revision, changes['revision'])
+            self.apply_changes(products, deleted)
+        
+        self.data.submit(fetch, on_done=apply, on_error=self.show_load_error)
+    
+    def set_catalog(self, catalog):
+        """Подключение загруженного каталога"""
+        self.catalog = catalog
+        self.table.reload()
+    
+    def submit_page(self, func, on_done, on_error):
+        """Фоновая загрузка страницы таблицы"""
+        self.data.submit(func, on_done=on_done, on_error=on_error)
+    
+    def show_load_error(self, error):
+        """Сообщение об ошибке загрузки"""
+        messagebox.showerror("Ошибка", f"Не удалось загрузить товары: {str(error)}")
+    
+    def show_loading(self, busy):
+        """Показ индикатора фоновой загрузки"""
+        self.loading_label.config(text="⏳ Загрузка..." if busy else "")
+    
+    def on_destroy(self, event):
+        """Отписка от сервиса данных при закрытии вкладки"""
+        if event.widget is self.parent:
+            self.data.remove_busy_listener(self.show_loading)
+            self.watcher.unsubscribe(self.on_external_changes)
+            if self.thumbnails is not None:
+                self.thumbnails.shutdown()
+    
+    def fetch_page(self, offset, limit):
+        """Страница товаров для таблицы с учетом текущих фильтров"""
+        source = self.catalog if self.catalog is not None else self.db
+        return source.query_products(**self.get_query_params(), offset=offset, limit=limit)
+    
+    def update_count(self):
+        """Обновление счетчика товаров"""
+        self.count_label.config(text=f"Всего товаров: {self.table.total}")
+    
+    def format_row(self, product):
+        """Значения и теги строки таблицы для товара"""
+        # Определяем теги для форматирования
+        tags = []
+        
+        if product['quantity'] == 0:
+            tags.append('no_stock')
+        
+        if product['discount'] > 15:
+            tags.append('high_discount')
+        
+        # Форматирование цены со скидкой
+        if product['discount'] > 0:
+            final_price = product['price'] * (1 - product['discount'] / 100)
+            price_display = f"~~{product['price']:.2f}~~ {final_price:.2f}"
+            tags.append('discounted')
+        else:
+            price_display = f"{product['price']:.2f}"
+        
+        values = (
+            product['id'],
+            product['name'],
+            product['category'],
+            product['manufacturer'],
+            product['supplier'],
+            price_display,
+            f"{product['discount']}%",
+            product['quantity'],
+            product['unit']
+        )
+        return values, tags
+    
+    def sort_by_column(self, column, add=False):
+        """Сортировка по колонке заголовка
+
+        Повторный щелчок меняет направление. С add=True колонка
+        добавляется следующим ключом (или меняет свое направление).
+        """
+        keys = parse_sort(self.sort_var.get())
+        directions = dict(keys)
+        
+        if add:
+            if column in directions:
+                keys = [(c, not d if c == column else d) for c, d in keys]
+            else:
+                keys.append((column, False))
+        elif len(keys) == 1 and column in directions:
+            keys = [(column, not directions[column])]
+        else:
+            keys = [(column, False)]
+        
+        self.sort_var.set(",".join(f"{c}_{'desc' if d else 'asc'}" for c, d in keys))
+        self.apply_filters()
+    
+    def on_shift_click(self, event):
+        """Shift+щелчок по заголовку - дополнительный ключ сортировки"""
+        if self.tree.identify_region(event.x, event.y) != 'heading':
+            return None
+        column = self.tree.column(self.tree.identify_column(event.x), 'id')
+        if column in SORTABLE_COLUMNS:
+            self.sort_by_column(column, add=True)
+        return "break"
+    
+    def update_headings(self):
+        """Стрелки сортировки в заголовках (с номером ключа, если ключей несколько)"""
+        keys = parse_sort(self.sort_var.get())
+        marks = {}
+        for index, (column, descending) in enumerate(keys, start=1):
+            arrow = "▼" if descending else "▲"
+            marks[column] = f" {arrow}{index}" if len(keys) > 1 else f" {arrow}"
+        
+        for column in SORTABLE_COLUMNS:
+            self.tree.heading(column, text=self.headings[column] + marks.get(column, ""))
+    
+    def row_image(self, product):
+        """Миниатюра фото товара для видимой строки"""
+        return self.thumbnails.get(product['photo_path'])
+    
+    @timed('ui.apply_filters')
+    def apply_filters(self, *args):
+        """Применение фильтров: поиск, фильтр и сортировка выполняются в БД"""
+        if self.user['role'] in ['manager', 'admin']:
+            self.update_headings()
+        self.table.reload()
+    
+    def reset_filters(self):
+        """Сброс поиска, фильтра и сортировки (при смене пользователя)"""
+        self.sort_var.set("name_asc")
+        self.filter_supplier_var.set("all")
+        self.search_var.set("")
         
-        # Сортировка
-        sort_by = self.sort_var.get()
-        if sort_by == "name_asc":
-            filtered.sort(key=lambda x: x['name'])
-        elif sort_by == "name_desc":
-            filtered.sort(key=lambda x: x['name'], reverse=True)
-        elif sort_by == "price_asc":
-            filtered.sort(key=lambda x: x['price'])
-        elif sort_by == "price_desc":
-            filtered.sort(key=lambda x: x['price'], reverse=True)
-        elif sort_by == "quantity_asc":
-            filtered.sort(key=lambda x: x['quantity'])
-        elif sort_by == "quantity_desc":
-            filtered.sort(key=lambda x: x['quantity'], reverse=True)
-        
-        self.display_products(filtered)
+        # Отложенный поиск от отслеживания ввода не нужен - перезагружаем сразу
+        if self.search_after_id:
+            self.parent.after_cancel(self.search_after_id)
+            self.search_after_id = None
+        self.apply_filters()
     
     def edit_product(self, event):
         """Редактирование товара"""
-        selection = self.tree.selection()
+        selection = self.table.selected_rows()
         if not selection:
             return
         
-        item = selection[0]
-        values = self.tree.item(item, 'values')
-        product_id = values[0]
+        product_id = selection[0]['id']
         
         from gui.product_edit import ProductEditWindow
         ProductEditWindow(
@@ -354,34 +542,166 @@ class ProductListWindow:
         )
     
     def delete_product(self):
-        """Удаление товара"""
-        selection = self.tree.selection()
-        if not selection:
+        """Удаление выделенных товаров одной транзакцией"""
+        product_ids = sorted(self.table.selected_keys)
+        if not product_ids:
             messagebox.showwarning("Предупреждение", "Выберите товар для удаления")
             return
         
-        item = selection[0]
-        values = self.tree.item(item, 'values')
-        product_id = values[0]
-        product_name = values[1]
+        visible = self.table.selected_rows()
+        if len(product_ids) == 1 and visible:
+            question = f"Удалить товар '{visible[0]['name']}'?"
+        else:
+            question = f"Удалить выбранные товары ({len(product_ids)})?"
         
         if messagebox.askyesno(
             "Подтверждение",
-            f"Удалить товар '{product_name}'?\nЭто действие нельзя отменить!"
+            question + "\nЭто действие нельзя отменить!"
         ):
-            try:
-                success = self.db.delete_product(product_id)
-                if success:
-                    self.load_products()
-                    messagebox.showinfo("Успех", "Товар удален")
-                else:
-                    messagebox.showerror(
-                        "Ошибка",
-                        "Невозможно удалить товар, так как он есть в заказах"
-                    )
-            except Exception as e:
-                messagebox.showerror("Ошибка", f"Не удалось удалить товар: {str(e)}")
-    
-    def refresh(self):
-        """Обновление списка"""
-        self.load_products()
\ No newline at end of file
+            def remove():
+                result = self.db.delete_products(product_ids)
+                # Файлы фото удаляем после записи, если на них больше никто не ссылается
+                store = PhotoStore()
+                for photo_path in result.photos:
+                    store.release(photo_path, self.db)
+                return result
+            
+            def deleted(result):
+                self.table.selected_keys -= set(result.done)
+                self.refresh_products(product_ids)
+                self.show_bulk_result("Удаление товаров", result)
+            
+            self.data.submit(
+                remove,
+                on_done=deleted,
+                on_error=lambda e: messagebox.showerror(
+                    "Ошибка", f"Не удалось удалить товар: {str(e)}"
+                )
+            )
+    
+    def bulk_edit(self):
+        """Изменение поставщика, категории или скидки у выделенных товаров"""
+        product_ids = sorted(self.table.selected_keys)
+        if not product_ids:
+            messagebox.showwarning("Предупреждение", "Выберите товары для изменения")
+            return
+        
+        def edited(result):
+            self.refresh_products(product_ids)
+            self.show_bulk_result("Изменение товаров", result)
+        
+        from gui.bulk_edit import BulkEditWindow
+        BulkEditWindow(self.parent.winfo_toplevel(), self.user, product_ids, on_done=edited)
+    
+    def show_bulk_result(self, title, result):
+        """Итог массовой операции со списком товаров, которые не удалось обработать"""
+        # Показываем не больше 20 ошибок, остальные - количеством
+        lines = [f"ID {product_id}: {message}" for product_id, message in result.errors[:20]]
+        if len(result.errors) > 20:
+            lines.append(f"... и еще {len(result.errors) - 20}")
+        text = result.summary()
+        if lines:
+            text += "\n\n" + "\n".join(lines)
+        
+        if result.errors:
+            messagebox.showwarning(title, text)
+        else:
+            messagebox.showinfo(title, text)
+    
+    def export_products(self):
+        """Выгрузка товаров с текущими фильтром и сортировкой"""
+        file_path = filedialog.asksaveasfilename(
+            title="Экспорт товаров",
+            defaultextension=".csv",
+            filetypes=[
+                ("CSV", "*.csv"),
+                ("JSON Lines", "*.jsonl")
+            ]
+        )
+        if not file_path:
+            return
+        
+        # Параметры читаем здесь: переменные Tk нельзя трогать из фонового потока
+        self.data.submit(
+            export_products,
+            self.db,
+            file_path,
+            **self.get_query_params(),
+            on_done=lambda count: messagebox.showinfo(
+                "Экспорт", f"Выгружено товаров: {count}"
+            ),
+            on_error=lambda e: messagebox.showerror(
+                "Ошибка", f"Не удалось выгрузить товары: {str(e)}"
+            )
+        )
+    
+    def refresh(self, product_id=None):
+        """Обновление списка без сброса прокрутки и выделения
+
+        Если известен ID измененного товара, каталог в памяти
+        обновляется только для него, иначе - только для товаров,
+        измененных после его ревизии.
+        """
+        if self.catalog is None:
+            self.table.refresh()
+        elif product_id is None:
+            self.sync_catalog()
+        else:
+            self.refresh_products([product_id])
+    
+    def refresh_products(self, product_ids):
+        """Обновление списка после изменения нескольких товаров
+
+        Каталог в памяти перечитывает только эти товары одним запросом.
+        """
+        if self.catalog is None:
+            self.table.refresh()
+            return
+        
+        def apply(products):
+            found = {product['id'] for product in products}
+            self.apply_changes(products, [pid for pid in product_ids if pid not in found])
+        
+        self.data.submit(
+            self.db.get_products_by_ids,
+            product_ids,
+            on_done=apply,
+            on_error=self.show_load_error
+        )
+    
+    def apply_changes(self, products, deleted_ids):
+        """Замена измененных товаров в каталоге в памяти и перерисовка"""
+        for product in products:
+            self.catalog.update(product)
+        for product_id in deleted_ids:
+            self.catalog.remove(product_id)
+        self.table.refresh()
+    
+    def on_external_changes(self, products, deleted_ids, since, revision):
+        """Товары изменены в другом окне или на другом терминале
+
+        Без каталога в памяти перечитывается только видимая страница.
+        Каталог применяет изменения, только если они продолжают его
+        ревизию, иначе сам догоняет изменения после своей ревизии.
+        """
+        if not self.parent.winfo_viewable():
+            self.stale = True
+        elif self.catalog is None:
+            self.table.refresh()
+        elif products is None:
+            self.load_products()
+        elif self.catalog.revision == since:
+            self.apply_changes(products, deleted_ids)
+            self.catalog.revision = revision
+        else:
+            self.sync_catalog()
+    
+    def on_show(self, event):
+        """Вкладка снова видна: догоняем изменения, пропущенные в скрытом виде"""
+        if event.widget is not self.parent or not self.stale:
+            return
+        self.stale = False
+        if self.catalog is None:
+            self.table.refresh()
+        else:
+            self.sync_catalog()
\ No newline at end of file
@@ -1,31 +1,28 @@
 import tkinter as tk
-from tkinter import ttk, messagebox
-import sys
-import os
+from tkinter import ttk, messagebox, filedialog
 
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Названия ролей
+ROLE_NAMES = {
+    'guest': 'Гость',
+    'client': 'Клиент',
+    'manager': 'Менеджер',
+    'admin': 'Администратор'
+}
 
 class MainWindow:
-    """Главное окно приложения"""
+    """Главный экран приложения
+
+    Экран создается один раз на роль и переиспользуется
+    при следующих входах пользователей с той же ролью.
+    """
     
-    def __init__(self, user):
+    def __init__(self, app, user):
+        self.app = app
         self.user = user
-        self.root = tk.Tk()
-        
-        # Названия ролей
-        role_names = {
-            'guest': 'Гость',
-            'client': 'Клиент',
-            'manager': 'Менеджер',
-            'admin': 'Администратор'
-        }
-        role_display = role_names.get(user['role'], user['role'])
-        
-        self.root.title(f"Магазин обуви - {role_display}")
-        self.root.geometry("1000x700")
-        
-        # Центрируем окно
-        self.center_window()
+        self.root = app.root
+        self.frame = tk.Frame(self.root)
+        self.product_list = None
+        self.products_frame = None
         
         # Верхняя панель
         self.setup_header()
@@ -36,21 +33,48 @@ class MainWindow:
         # Основная область с вкладками
         self.setup_main_area()
         
+        # Схема БД обновляется в фоне с момента запуска, дожидаемся ее
+        from database.create_db import wait_for_upgrade
+        wait_for_upgrade()
+        
         # Показываем товары по умолчанию
         self.show_products()
     
+    def show(self, user):
+        """Показ экрана для пользователя"""
+        reused = self.user is not user
+        self.user = user
+        
+        role_display = ROLE_NAMES.get(user['role'], user['role'])
+        self.root.title(f"Магазин обуви - {role_display}")
+        self.root.resizable(True, True)
+        self.center_window()
+        self.user_name.config(text=user['full_name'])
+        
+        # Экран остался от прошлого пользователя: начинаем с чистого списка товаров
+        if reused:
+            self.product_list.user = user
+            self.product_list.reset_filters()
+            self.show_products()
+        
+        self.root.config(menu=self.menubar)
+        self.frame.pack(fill="both", expand=True)
+    
+    def hide(self):
+        """Скрытие экрана (виджеты сохраняются для следующего входа)"""
+        self.root.config(menu="")
+        self.frame.pack_forget()
+    
     def center_window(self):
         """Центрирование окна"""
-        self.root.update_idletasks()
-        width = self.root.winfo_width()
-        height = self.root.winfo_height()
+        width, height = 1000, 700
         x = (self.root.winfo_screenwidth() // 2) - (width // 2)
         y = (self.root.winfo_screenheight() // 2) - (height // 2)
-        self.root.geometry(f'+{x}+{y}')
+        self.root.geometry(f'{width}x{height}+{x}+{y}')
     
     def setup_header(self):
         """Верхняя панель с информацией о пользователе"""
-        header = tk.Frame(self.root, bg="#34495e", height=50)
+        header = tk.Frame(self.frame, bg="#34495e", height=50)
         header.pack(fill="x")
         header.pack_propagate(False)
         
@@ -79,14 +103,14 @@ class MainWindow:
         user_icon.pack(side="left", padx=5)
         
         # ФИО пользователя
-        user_name = tk.Label(
+        self.user_name = tk.Label(
             user_frame,
             text=self.user['full_name'],
             bg="#34495e",
             fg="white",
             font=("Arial", 11)
         )
-        user_name.pack(side="left", padx=5)
+        self.user_name.pack(side="left", padx=5)
         
         # Кнопка выхода
         logout_btn = tk.Button(
@@ -104,8 +128,8 @@ class MainWindow:
     
     def setup_menu(self):
         """Создание меню"""
-        menubar = tk.Menu(self.root)
-        self.root.config(menu=menubar)
+        # Меню подключается к окну при показе экрана
+        menubar = self.menubar = tk.Menu(self.root)
         
         # Меню Файл
         file_menu = tk.Menu(menubar, tearoff=0)
@@ -117,39 +141,99 @@ class MainWindow:
         menubar.add_cascade(label="Товары", menu=products_menu)
         products_menu.add_command(label="Список товаров", command=self.show_products)
         
+        # Сводка по складу (для менеджера и админа)
+        if self.user['role'] in ['manager', 'admin']:
+            products_menu.add_command(label="📊 Сводка по складу", command=self.show_dashboard)
+        
         # Для админа - добавление товара
         if self.user['role'] == 'admin':
             products_menu.add_separator()
             products_menu.add_command(label="➕ Добавить товар", command=self.add_product)
+            products_menu.add_command(label="📥 Импорт товаров...", command=self.import_products)
+            products_menu.add_command(label="💲 Переоценка...", command=self.reprice_products)
         
         # Меню Заказы (для менеджера и админа)
         if self.user['role'] in ['manager', 'admin']:
             orders_menu = tk.Menu(menubar, tearoff=0)
             menubar.add_cascade(label="Заказы", menu=orders_menu)
             orders_menu.add_command(label="Все заказы", command=self.show_orders)
+        
+        # Меню Сервис (только админ)
+        if self.user['role'] == 'admin':
+            service_menu = tk.Menu(menubar, tearoff=0)
+            menubar.add_cascade(label="Сервис", menu=service_menu)
+            service_menu.add_command(label="🩺 Диагностика", command=self.show_diagnostics)
     
     def setup_main_area(self):
         """Основная область с вкладками"""
-        self.notebook = ttk.Notebook(self.root)
+        self.notebook = ttk.Notebook(self.frame)
         self.notebook.pack(fill="both", expand=True, padx=10, pady=10)
     
     def show_products(self):
         """Показать список товаров"""
-        # Очищаем вкладки
-        for tab in self.notebook.tabs():
-            self.notebook.forget(tab)
+        # Вкладка с товарами создается один раз
+        if self.product_list is None:
+            from gui.product_list import ProductListWindow
+            self.products_frame = ttk.Frame(self.notebook)
+            self.notebook.add(self.products_frame, text="📦 Товары")
+            self.product_list = ProductListWindow(self.products_frame, self.user, self)
         
-        # Создаем вкладку с товарами
-        from gui.product_list import ProductListWindow
-        products_frame = ttk.Frame(self.notebook)
-        self.notebook.add(products_frame, text="📦 Товары")
-        ProductListWindow(products_frame, self.user, self)
+        # Остальные вкладки закрываем
+        for tab in self.notebook.tabs():
+            if tab != str(self.products_frame):
+                self.notebook.forget(tab)
+                self.root.nametowidget(tab).destroy()
+        self.notebook.select(self.products_frame)
     
     def add_product(self):
         """Добавление товара (только админ)"""
         from gui.product_edit import ProductEditWindow
         ProductEditWindow(self.root, self.user, product_id=None, parent_window=self)
     
+    def import_products(self):
+        """Массовый импорт товаров из CSV/XLSX (только админ)"""
+        file_path = filedialog.askopenfilename(
+            title="Выберите файл с товарами",
+            filetypes=[
+                ("Таблицы", "*.csv *.xlsx"),
+                ("Все файлы", "*.*")
+            ]
+        )
+        if not file_path:
+            return
+        
+        from models.db_models import Database
+        from models.importer import ProductImporter
+        from gui.data_service import DataService
+        
+        def done(report):
+            # Показываем не больше 20 ошибок, остальные - количеством
+            lines = [f"Строка {row}: {message}" for row, message in report.errors[:20]]
+            if len(report.errors) > 20:
+                lines.append(f"... и еще {len(report.errors) - 20}")
+            text = report.summary()
+            if lines:
+                text += "\n\n" + "\n".join(lines)
+            
+            if report.errors:
+                messagebox.showwarning("Импорт завершен с ошибками", text)
+            else:
+                messagebox.showinfo("Импорт завершен", text)
+            self.refresh_products()
+        
+        importer = ProductImporter(Database())
+        DataService.for_widget(self.root).submit(
+            importer.import_file,
+            file_path,
+            on_done=done,
+            on_error=lambda e: messagebox.showerror("Ошибка", f"Не удалось импортировать: {str(e)}")
+        )
+    
+    def reprice_products(self):
+        """Массовая переоценка товаров (только админ)"""
+        from gui.repricing import RepricingWindow
+        RepricingWindow(self.root, self.user, main_window=self)
+    
     def show_orders(self):
         """Показать заказы"""
         # Проверяем, есть ли уже вкладка с заказами
@@ -165,21 +249,38 @@ class MainWindow:
         OrdersWindow(orders_frame, self.user, self)
         self.notebook.select(orders_frame)
     
+    def show_dashboard(self):
+        """Показать сводку по складу"""
+        for tab in self.notebook.tabs():
+            if self.notebook.tab(tab, "text") == "📊 Склад":
+                self.notebook.select(tab)
+                return
+        
+        from gui.dashboard import DashboardWindow
+        dashboard_frame = ttk.Frame(self.notebook)
+        self.notebook.add(dashboard_frame, text="📊 Склад")
+        DashboardWindow(dashboard_frame, self.user, self)
+        self.notebook.select(dashboard_frame)
+    
+    def show_diagnostics(self):
+        """Показать статистику производительности (только админ)"""
+        for tab in self.notebook.tabs():
+            if self.notebook.tab(tab, "text") == "🩺 Диагностика":
+                self.notebook.select(tab)
+                return
+        
+        from gui.diagnostics import DiagnosticsWindow
+        diagnostics_frame = ttk.Frame(self.notebook)
+        self.notebook.add(diagnostics_frame, text="🩺 Диагностика")
+        DiagnosticsWindow(diagnostics_frame, self.user, self)
+        self.notebook.select(diagnostics_frame)
+    
     def logout(self):
         """Выход из системы"""
         if messagebox.askyesno("Подтверждение", "Вы действительно хотите выйти?"):
-            self.root.destroy()
-            from gui.login_window import LoginWindow
-            LoginWindow().run()
+            self.app.show_login()
     
-    def refresh_products(self):
+    def refresh_products(self, product_id=None):
         """Обновление списка товаров"""
-        # Находим вкладку с товарами и обновляем её
-        for tab in self.notebook.tabs():
-            if self.notebook.tab(tab, "text") == "📦 Товары":
-                # Получаем содержимое вкладки и вызываем refresh
-                content = self.nametowidget(tab)
-                for child in content.winfo_children():
-                    if hasattr(child, 'refresh'):
-                        child.refresh()
-                break
\ No newline at end of file
+        if self.product_list:
+            self.product_list.refresh(product_id)
\ No newline at end of file
@@ -1,46 +1,62 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
-import sys
-import os
-
-# Добавляем путь к корневой папке
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
-from models.db_models import Database
 
 class LoginWindow:
-    """Окно авторизации"""
+    """Экран авторизации"""
     
-    def __init__(self):
-        self.root = tk.Tk()
-        self.root.title("Авторизация - Магазин обуви")
-        self.root.geometry("450x400")
-        self.root.resizable(False, False)
+    def __init__(self, app):
+        self.app = app
+        self.root = app.root
+        self.frame = tk.Frame(self.root)
         
-        # Подключение к БД
-        self.db = Database()
-        
-        # Центрируем окно
-        self.center_window()
+        # Подключение к БД создается после показа окна
+        self.db = None
         
         # Создаем интерфейс
         self.setup_ui()
         
+        # Модули БД загружаем, пока пользователь вводит логин
+        self.root.after(100, self.get_db)
+    
+    def get_db(self):
+        """Подключение к БД (создается при первом обращении)"""
+        if self.db is None:
+            from models.db_models import Database
+            self.db = Database()
+        return self.db
+    
+    def show(self):
+        """Показ экрана входа с пустыми полями"""
+        self.root.title("Авторизация - Магазин обуви")
+        self.root.resizable(False, False)
+        self.center_window()
+        
+        self.login_entry.delete(0, tk.END)
+        self.password_entry.delete(0, tk.END)
+        self.login_btn.config(state="normal")
+        self.guest_btn.config(state="normal")
+        
+        self.frame.pack(fill="both", expand=True)
+        self.login_entry.focus()
+    
+    def hide(self):
+        """Скрытие экрана (виджеты сохраняются для следующего входа)"""
+        self.frame.pack_forget()
+    
     def center_window(self):
         """Центрирование окна"""
-        self.root.update_idletasks()
-        width = self.root.winfo_width()
-        height = self.root.winfo_height()
+        # Размер задаем сами: окно могло остаться от главного экрана
+        width, height = 450, 400
         x = (self.root.winfo_screenwidth() // 2) - (width // 2)
         y = (self.root.winfo_screenheight() // 2) - (height // 2)
-        self.root.geometry(f'450x400+{x}+{y}')
+        self.root.geometry(f'{width}x{height}+{x}+{y}')
     
     def setup_ui(self):
         """Создание интерфейса"""
         
         # Заголовок
         title_label = tk.Label(
-            self.root, 
+            self.frame, 
             text="👞 Магазин обуви", 
             font=("Arial", 24, "bold"),
             fg="#2c3e50"
@@ -48,7 +64,7 @@ class LoginWindow:
         title_label.pack(pady=30)
         
         # Рамка для входа
-        login_frame = ttk.LabelFrame(self.root, text="Вход в систему", padding=30)
+        login_frame = ttk.LabelFrame(self.frame, text="Вход в систему", padding=30)
         login_frame.pack(padx=40, pady=10, fill="both", expand=True)
         
         # Логин
@@ -100,7 +116,7 @@ class LoginWindow:
         self.guest_btn.pack(side="left", padx=5)
         
         # Подсказка
-        hint_frame = tk.Frame(self.root, bg="#ecf0f1")
+        hint_frame = tk.Frame(self.frame, bg="#ecf0f1")
         hint_frame.pack(fill="x", padx=20, pady=20)
         
         hint_text = """📝 Тестовые учетные записи:
@@ -135,13 +151,10 @@ class LoginWindow:
         self.guest_btn.config(state="disabled")
         
         try:
-            user = self.db.check_user(login, password)
+            user = self.get_db().check_user(login, password)
             
             if user:
-                self.root.destroy()
-                # Импортируем здесь, чтобы избежать циклического импорта
-                from gui.main_window import MainWindow
-                MainWindow(user)
+                self.app.show_main(user)
             else:
                 messagebox.showerror(
                     "Ошибка входа",
@@ -155,15 +168,9 @@ class LoginWindow:
     
     def guest_login(self):
         """Вход как гость"""
-        self.root.destroy()
-        from gui.main_window import MainWindow
         guest_user = {
             'id': 0,
             'full_name': 'Гость',
             'role': 'guest'
         }
-        MainWindow(guest_user)
-    
-    def run(self):
-        """Запуск окна"""
-        self.root.mainloop()
\ No newline at end of file
+        self.app.show_main(guest_user)
\ No newline at end of file
@@ -0,0 +1,259 @@
+import os
+import io
+import hashlib
+import tempfile
+import threading
+from collections import OrderedDict, deque
+
+from gui.data_service import DataService
+
+# Папка для миниатюр (рядом с uploads/)
+THUMB_DIR = os.path.join('cache', 'thumbnails')
+
+# Размер миниатюры в окне редактирования
+PREVIEW_SIZE = (150, 150)
+
+# Размер фото товара, сохраняемого в uploads/
+PHOTO_SIZE = (300, 200)
+
+# Размер миниатюры в списке товаров (пропорции как у PHOTO_SIZE)
+LIST_THUMB_SIZE = (48, 32)
+
+# Заглушка для товаров без фото
+PLACEHOLDER_PATH = os.path.join('resources', 'picture.png')
+
+# Режимы, с которыми работают reduce() и качественный ресайз; остальные
+# (палитра "P" у GIF и многих PNG, черно-белый "1", 16-битный и т.п.)
+# перед уменьшением приводятся к RGB
+RESIZABLE_MODES = ('RGB', 'RGBA', 'L')
+
+
+def resizable(img):
+    """Изображение в режиме, пригодном для reduce() и ресайза"""
+    if img.mode in RESIZABLE_MODES:
+        return img
+    return img.convert('RGBA' if 'transparency' in img.info else 'RGB')
+
+
+def thumbnail_path(source, size):
+    """Путь к миниатюре: ключ - путь к файлу, время изменения и размер"""
+    stat = os.stat(source)
+    key = f"{os.path.abspath(source)}|{stat.st_mtime_ns}|{stat.st_size}|{size[0]}x{size[1]}"
+    digest = hashlib.sha1(key.encode('utf-8')).hexdigest()
+    return os.path.join(THUMB_DIR, f"{digest}.png")
+
+
+def load_thumbnail(source, size=PREVIEW_SIZE):
+    """Миниатюра изображения из кэша на диске (создается при первом обращении)"""
+    # PIL загружается при первом показе фото, а не при запуске
+    from PIL import Image
+
+    cached = thumbnail_path(source, size)
+    if os.path.exists(cached):
+        try:
+            with Image.open(cached) as img:
+                img.load()
+                return img
+        except OSError:
+            # Поврежденный файл кэша пересоздаем
+            pass
+
+    with Image.open(source) as img:
+        thumb = resizable(img).resize(size, Image.Resampling.LANCZOS)
+
+    # Атомарная запись: временный файл и переименование
+    os.makedirs(THUMB_DIR, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=THUMB_DIR, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            thumb.save(f, 'PNG')
+        os.replace(tmp_path, cached)
+    except OSError:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return thumb
+
+
+def open_downscaled(source, size):
+    """Открытие изображения с уменьшением еще на этапе декодирования
+
+    Для JPEG используется draft-режим (декодер сразу выдает 1/2, 1/4
+    или 1/8 размера), для остальных форматов - reduce() в целое число раз.
+    Изображение остается не меньше удвоенного size для качественного ресайза.
+    """
+    from PIL import Image
+    target = (size[0] * 2, size[1] * 2)
+    with Image.open(source) as img:
+        if img.format == 'JPEG':
+            img.draft('RGB', target)
+            return img.convert('RGB')
+
+        factor = min(img.width // target[0], img.height // target[1])
+        if factor >= 2:
+            return resizable(img).reduce(factor).convert('RGB')
+        return img.convert('RGB')
+
+
+def ingest_photo(source, store, size=PHOTO_SIZE, preview_size=PREVIEW_SIZE):
+    """Подготовка загруженного фото (выполняется в фоновом потоке)
+
+    Изображение декодируется один раз, из него получаются фото товара
+    для хранилища store (PhotoStore) и миниатюра для окна.
+    Возвращает (путь в хранилище, байты JPEG для PhotoStore.restore, миниатюра).
+    """
+    from PIL import Image
+    needed = (max(size[0], preview_size[0]), max(size[1], preview_size[1]))
+    with open_downscaled(source, needed) as img:
+        photo = img.resize(size, Image.Resampling.LANCZOS)
+        preview = img.resize(preview_size, Image.Resampling.LANCZOS)
+
+    buffer = io.BytesIO()
+    photo.save(buffer, 'JPEG', quality=85)
+    data = buffer.getvalue()
+    return store.put(data), data, preview
+
+
+class PhotoCache:
+    """Ограниченный LRU-кэш готовых PhotoImage
+
+    PhotoImage привязан к интерпретатору Tk, поэтому кэш
+    создается на каждое корневое окно.
+    """
+
+    def __init__(self, max_items=64):
+        self.max_items = max_items
+        self.items = OrderedDict()
+
+    @classmethod
+    def for_widget(cls, widget):
+        """Общий кэш для корневого окна виджета"""
+        root = widget.nametowidget('.')
+        cache = getattr(root, 'photo_cache', None)
+        if cache is None:
+            cache = root.photo_cache = cls()
+        return cache
+
+    def get(self, source, size=PREVIEW_SIZE):
+        """PhotoImage миниатюры файла source"""
+        stat = os.stat(source)
+        key = (os.path.abspath(source), stat.st_mtime_ns, size)
+
+        photo = self.items.get(key)
+        if photo is not None:
+            self.items.move_to_end(key)
+            return photo
+
+        from PIL import ImageTk
+        photo = ImageTk.PhotoImage(load_thumbnail(source, size))
+        self.put(key, photo)
+        return photo
+
+    def put(self, key, photo):
+        """Добавление изображения с вытеснением самых старых"""
+        self.items[key] = photo
+        self.items.move_to_end(key)
+        while len(self.items) > self.max_items:
+            self.items.popitem(last=False)
+
+
+class ThumbnailLoader:
+    """Ленивая загрузка миниатюр для строк таблицы
+
+    get(path) сразу возвращает готовую картинку из кэша или пустую строку,
+    а файл ставит в очередь на декодирование в отдельном фоновом потоке.
+    Очередь обрабатывается с конца и ограничена по длине, поэтому при
+    быстрой прокрутке сначала грузятся строки, видимые сейчас, а запросы
+    для давно пролистанных строк отбрасываются. Когда миниатюры готовы,
+    вызывается on_ready() (не чаще раза в REDRAW_DELAY мс).
+    """
+
+    # Пауза перед перерисовкой, чтобы собрать несколько готовых миниатюр
+    REDRAW_DELAY = 50
+
+    def __init__(self, widget, on_ready, size=LIST_THUMB_SIZE,
+                 max_items=256, max_pending=64, placeholder=PLACEHOLDER_PATH):
+        self.widget = widget
+        self.on_ready = on_ready
+        self.size = size
+        self.max_pending = max_pending
+        self.placeholder = placeholder
+        self.cache = PhotoCache(max_items)
+
+        # Декодирование не занимает потоки запросов к БД
+        self.service = DataService(widget, workers=1)
+        self.lock = threading.Lock()
+        self.pending = deque()
+        self.requested = set()
+        self.failed = set()
+        self.redraw_id = None
+
+    def get(self, path):
+        """Миниатюра файла или '' (пока загружается или нет заглушки)"""
+        # Нет фото или файл не читается - показываем заглушку
+        if not path or path in self.failed:
+            path = self.placeholder
+            if path in self.failed:
+                return ''
+
+        # Файлы в хранилище не меняются, ключом достаточно пути
+        key = (path, self.size)
+        photo = self.cache.items.get(key)
+        if photo is not None:
+            self.cache.items.move_to_end(key)
+            return photo
+
+        if path not in self.requested:
+            self.request(path)
+        return ''
+
+    def request(self, path):
+        """Постановка файла в очередь на декодирование"""
+        with self.lock:
+            self.requested.add(path)
+            self.pending.append(path)
+            # Самые старые запросы уже не видны на экране
+            while len(self.pending) > self.max_pending:
+                self.requested.discard(self.pending.popleft())
+        self.service.submit(self.decode_next, on_done=self.on_decoded)
+
+    def decode_next(self):
+        """Декодирование самого свежего запроса (в фоновом потоке)"""
+        with self.lock:
+            if not self.pending:
+                return None
+            path = self.pending.pop()
+        try:
+            return path, load_thumbnail(path, self.size)
+        except (OSError, ValueError):
+            return path, None
+
+    def on_decoded(self, result):
+        """Создание PhotoImage в потоке Tk"""
+        if result is None:
+            return
+        path, image = result
+        with self.lock:
+            self.requested.discard(path)
+        if image is None:
+            self.failed.add(path)
+        else:
+            from PIL import ImageTk
+            self.cache.put((path, self.size), ImageTk.PhotoImage(image))
+
+        if self.redraw_id is None:
+            self.redraw_id = self.widget.after(self.REDRAW_DELAY, self.redraw)
+
+    def redraw(self):
+        """Перерисовка строк с готовыми миниатюрами"""
+        self.redraw_id = None
+        self.on_ready()
+
+    def shutdown(self):
+        """Остановка фонового потока"""
+        if self.redraw_id is not None:
+            try:
+                self.widget.after_cancel(self.redraw_id)
+            except Exception:
+                pass
+            self.redraw_id = None
+        self.service.shutdown()
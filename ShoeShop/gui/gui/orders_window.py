@@ -0,0 +1,346 @@
+import tkinter as tk
+from tkinter import ttk, messagebox
+from datetime import date, timedelta
+
+from models.db_models import Database, ORDER_STATUSES
+from gui.data_service import DataService
+
+# Сколько заказов подгружать за один запрос
+PAGE_SIZE = 100
+
+# Периоды фильтра: подпись -> количество дней (None - вся история)
+PERIODS = {
+    "30 дней": 30,
+    "90 дней": 90,
+    "Год": 365,
+    "Все время": None
+}
+
+class OrdersWindow:
+    """Вкладка заказов
+
+    Заказы подгружаются страницами по ключу (дата, id) по мере
+    прокрутки к концу списка. Сводка по статусам считается
+    одним запросом в фоне.
+    """
+
+    def __init__(self, parent, user, main_window):
+        self.parent = parent
+        self.user = user
+        self.main_window = main_window
+        self.db = Database()
+        self.data = DataService.for_widget(parent)
+
+        # Переменные для фильтрации
+        self.status_var = tk.StringVar(value="all")
+        self.period_var = tk.StringVar(value="30 дней")
+        self.new_status_var = tk.StringVar(value=ORDER_STATUSES[0])
+
+        # Ключ последнего загруженного заказа и признак конца списка
+        self.last_key = None
+        self.has_more = False
+        self.loading = False
+        self.orders = {}
+
+        self.setup_ui()
+        self.reload()
+
+    def setup_ui(self):
+        """Создание интерфейса"""
+        self.setup_filter_panel()
+        self.setup_orders_tree()
+        self.setup_items_tree()
+        self.setup_button_panel()
+
+    def setup_filter_panel(self):
+        """Панель фильтров и сводка по статусам"""
+        filter_frame = tk.Frame(self.parent, bg="#f8f9fa")
+        filter_frame.pack(fill="x", padx=10, pady=10)
+
+        tk.Label(filter_frame, text="📌 Статус:", bg="#f8f9fa", font=("Arial", 10)).grid(
+            row=0, column=0, padx=(10, 5), pady=10, sticky="w"
+        )
+        status_combo = ttk.Combobox(
+            filter_frame,
+            textvariable=self.status_var,
+            values=["all"] + list(ORDER_STATUSES),
+            state="readonly",
+            width=15
+        )
+        status_combo.grid(row=0, column=1, padx=5, pady=10, sticky="w")
+        status_combo.bind('<<ComboboxSelected>>', lambda e: self.reload())
+
+        tk.Label(filter_frame, text="📅 Период:", bg="#f8f9fa", font=("Arial", 10)).grid(
+            row=0, column=2, padx=(20, 5), pady=10, sticky="w"
+        )
+        period_combo = ttk.Combobox(
+            filter_frame,
+            textvariable=self.period_var,
+            values=list(PERIODS.keys()),
+            state="readonly",
+            width=12
+        )
+        period_combo.grid(row=0, column=3, padx=5, pady=10, sticky="w")
+        period_combo.bind('<<ComboboxSelected>>', lambda e: self.reload())
+
+        # Сводка по статусам
+        self.stats_label = tk.Label(
+            filter_frame,
+            text="",
+            bg="#f8f9fa",
+            font=("Arial", 10),
+            justify="left"
+        )
+        self.stats_label.grid(row=1, column=0, columnspan=6, padx=10, pady=(0, 10), sticky="w")
+
+    def setup_orders_tree(self):
+        """Таблица заказов"""
+        tree_frame = tk.Frame(self.parent)
+        tree_frame.pack(fill="both", expand=True, padx=10, pady=5)
+
+        vsb = ttk.Scrollbar(tree_frame, orient="vertical")
+        vsb.pack(side="right", fill="y")
+
+        columns = (
+            'id', 'code', 'order_date', 'delivery_date', 'customer',
+            'pickup_point', 'items', 'total', 'status'
+        )
+        self.tree = ttk.Treeview(tree_frame, columns=columns, show='headings', height=12)
+
+        # При прокрутке к концу подгружаем следующую страницу
+        vsb.config(command=self.tree.yview)
+        self.tree.configure(yscrollcommand=lambda first, last: self.on_scroll(vsb, first, last))
+
+        self.tree.heading('id', text='№')
+        self.tree.heading('code', text='Код')
+        self.tree.heading('order_date', text='Дата заказа')
+        self.tree.heading('delivery_date', text='Дата доставки')
+        self.tree.heading('customer', text='Клиент')
+        self.tree.heading('pickup_point', text='Пункт выдачи')
+        self.tree.heading('items', text='Товаров')
+        self.tree.heading('total', text='Сумма')
+        self.tree.heading('status', text='Статус')
+
+        self.tree.column('id', width=60, anchor='center')
+        self.tree.column('code', width=70, anchor='center')
+        self.tree.column('order_date', width=90, anchor='center')
+        self.tree.column('delivery_date', width=90, anchor='center')
+        self.tree.column('customer', width=160)
+        self.tree.column('pickup_point', width=220)
+        self.tree.column('items', width=70, anchor='center')
+        self.tree.column('total', width=100, anchor='e')
+        self.tree.column('status', width=90, anchor='center')
+
+        self.tree.pack(fill="both", expand=True)
+        self.tree.tag_configure('new', background='#fff8e1')
+        self.tree.bind('<<TreeviewSelect>>', self.on_select)
+
+    def setup_items_tree(self):
+        """Позиции выбранного заказа"""
+        tk.Label(self.parent, text="🧾 Состав заказа:", font=("Arial", 10, "bold")).pack(
+            anchor="w", padx=10
+        )
+
+        columns = ('name', 'quantity', 'price', 'discount', 'total')
+        self.items_tree = ttk.Treeview(self.parent, columns=columns, show='headings', height=5)
+
+        self.items_tree.heading('name', text='Товар')
+        self.items_tree.heading('quantity', text='Кол-во')
+        self.items_tree.heading('price', text='Цена')
+        self.items_tree.heading('discount', text='Скидка %')
+        self.items_tree.heading('total', text='Сумма')
+
+        self.items_tree.column('name', width=300)
+        self.items_tree.column('quantity', width=70, anchor='center')
+        self.items_tree.column('price', width=90, anchor='e')
+        self.items_tree.column('discount', width=80, anchor='center')
+        self.items_tree.column('total', width=100, anchor='e')
+
+        self.items_tree.pack(fill="x", padx=10, pady=(0, 5))
+
+    def setup_button_panel(self):
+        """Панель с кнопками"""
+        button_frame = tk.Frame(self.parent, bg="#f8f9fa", height=50)
+        button_frame.pack(fill="x", side="bottom")
+        button_frame.pack_propagate(False)
+
+        tk.Button(
+            button_frame,
+            text="🔄 Обновить",
+            command=self.reload,
+            bg="#3498db",
+            fg="white",
+            font=("Arial", 10),
+            cursor="hand2"
+        ).pack(side="left", padx=10, pady=10)
+
+        # Смена статуса выбранного заказа
+        ttk.Combobox(
+            button_frame,
+            textvariable=self.new_status_var,
+            values=list(ORDER_STATUSES),
+            state="readonly",
+            width=12
+        ).pack(side="left", padx=(20, 5), pady=10)
+
+        tk.Button(
+            button_frame,
+            text="✔ Изменить статус",
+            command=self.change_status,
+            bg="#27ae60",
+            fg="white",
+            font=("Arial", 10),
+            cursor="hand2"
+        ).pack(side="left", padx=5, pady=10)
+
+        self.count_label = tk.Label(button_frame, text="", bg="#f8f9fa", font=("Arial", 10))
+        self.count_label.pack(side="right", padx=20)
+
+    def get_filter(self):
+        """Текущие параметры фильтра"""
+        days = PERIODS.get(self.period_var.get())
+        date_from = (date.today() - timedelta(days=days)).isoformat() if days else None
+        return {'status': self.status_var.get(), 'date_from': date_from}
+
+    def reload(self):
+        """Загрузка заказов с начала и сводки по статусам"""
+        self.tree.delete(*self.tree.get_children())
+        self.items_tree.delete(*self.items_tree.get_children())
+        self.orders = {}
+        self.last_key = None
+        self.has_more = True
+        self.loading = False
+        self.load_more()
+
+        self.stats_label.config(text="⏳ Подсчет...")
+        self.data.submit(
+            self.db.order_stats,
+            **self.get_filter(),
+            on_done=self.show_stats,
+            on_error=self.show_error,
+            channel=('order_stats', id(self))
+        )
+
+    def load_more(self):
+        """Загрузка следующей страницы заказов"""
+        if self.loading or not self.has_more:
+            return
+        self.loading = True
+        self.data.submit(
+            self.db.query_orders,
+            **self.get_filter(),
+            after=self.last_key,
+            limit=PAGE_SIZE,
+            on_done=self.show_page,
+            on_error=self.show_error,
+            channel=('orders', id(self))
+        )
+
+    def show_page(self, orders):
+        """Добавление страницы заказов в таблицу"""
+        self.loading = False
+        self.has_more = len(orders) == PAGE_SIZE
+        if orders:
+            self.last_key = (orders[-1]['order_date'], orders[-1]['id'])
+
+        for order in orders:
+            self.orders[str(order['id'])] = order
+            self.tree.insert('', 'end', iid=str(order['id']), values=self.format_row(order),
+                             tags=('new',) if order['status'] == 'Новый' else ())
+
+        suffix = "+" if self.has_more else ""
+        self.count_label.config(text=f"Загружено заказов: {len(self.orders)}{suffix}")
+
+    def format_row(self, order):
+        """Значения строки таблицы для заказа"""
+        return (
+            order['id'],
+            order['code'] or "",
+            order['order_date'],
+            order['delivery_date'] or "",
+            order['customer'],
+            order['pickup_point'],
+            order['items'],
+            f"{order['total']:.2f}",
+            order['status']
+        )
+
+    def show_stats(self, stats):
+        """Сводка по статусам"""
+        if not stats:
+            self.stats_label.config(text="Заказов за период нет")
+            return
+        parts = [f"{item['status']}: {item['orders']} на {item['total']:,.2f} ₽" for item in stats]
+        total_orders = sum(item['orders'] for item in stats)
+        total_sum = sum(item['total'] for item in stats)
+        parts.append(f"Всего: {total_orders} на {total_sum:,.2f} ₽")
+        self.stats_label.config(text="   |   ".join(parts).replace(",", " "))
+
+    def show_error(self, error):
+        """Ошибка фонового запроса"""
+        self.loading = False
+        messagebox.showerror("Ошибка", f"Не удалось загрузить заказы: {str(error)}")
+
+    def on_scroll(self, scrollbar, first, last):
+        """Положение скроллбара; у конца списка подгружаем еще"""
+        scrollbar.set(first, last)
+        if float(last) > 0.9:
+            self.load_more()
+
+    def on_select(self, event):
+        """Показ позиций выбранного заказа"""
+        selection = self.tree.selection()
+        if not selection:
+            return
+        self.data.submit(
+            self.db.get_order_items,
+            int(selection[0]),
+            on_done=self.show_items,
+            on_error=self.show_error,
+            channel=('order_items', id(self))
+        )
+
+    def show_items(self, items):
+        """Заполнение таблицы позиций"""
+        self.items_tree.delete(*self.items_tree.get_children())
+        for item in items:
+            self.items_tree.insert('', 'end', values=(
+                item['name'],
+                item['quantity'],
+                f"{item['price']:.2f}",
+                f"{item['discount'] or 0:g}%",
+                f"{item['total']:.2f}"
+            ))
+
+    def change_status(self):
+        """Изменение статуса выбранного заказа"""
+        selection = self.tree.selection()
+        if not selection:
+            messagebox.showwarning("Предупреждение", "Выберите заказ")
+            return
+
+        order = self.orders[selection[0]]
+        status = self.new_status_var.get()
+        if status == order['status']:
+            return
+
+        def updated(_):
+            order['status'] = status
+            self.tree.item(selection[0], values=self.format_row(order),
+                           tags=('new',) if status == 'Новый' else ())
+            # Сводка изменилась, пересчитываем ее
+            self.data.submit(
+                self.db.order_stats,
+                **self.get_filter(),
+                on_done=self.show_stats,
+                on_error=self.show_error,
+                channel=('order_stats', id(self))
+            )
+
+        self.data.submit(
+            self.db.update_order_status,
+            order['id'],
+            status,
+            on_done=updated,
+            on_error=lambda e: messagebox.showerror("Ошибка", f"Не удалось изменить статус: {str(e)}")
+        )
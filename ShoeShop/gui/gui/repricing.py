@@ -0,0 +1,287 @@
+import tkinter as tk
+from tkinter import ttk, messagebox
+
+from models.db_models import Database
+from models.repricing import RepricingRule, preview_repricing, apply_repricing
+from models.validation import check_limit
+from gui.data_service import DataService
+
+# Подписи вариантов в выпадающих списках
+ALL = "Все"
+TARGET_LABELS = {"Цена": 'price', "Скидка %": 'discount'}
+MODE_LABELS = {
+    "Изменить на %": 'percent',
+    "Прибавить": 'add',
+    "Установить": 'set'
+}
+ROUNDING_LABELS = {
+    "Без округления": None,
+    "До 0.01": 0.01,
+    "До 1": 1,
+    "До 10": 10,
+    "До 100": 100
+}
+
+class RepricingWindow:
+    """Окно массовой переоценки товаров
+
+    Сначала выполняется предпросмотр с итогами, применяется
+    переоценка с теми же параметрами одним запросом.
+    """
+
+    def __init__(self, parent, user, main_window=None):
+        self.user = user
+        self.main_window = main_window
+        self.db = Database()
+
+        # Проверка прав
+        if user['role'] != 'admin':
+            messagebox.showerror("Ошибка", "Только администратор может менять цены")
+            return
+
+        self.suppliers = self.db.get_reference('suppliers')
+        self.categories = self.db.get_reference('categories')
+
+        # Параметры последнего предпросмотра (применяются именно они)
+        # и счетчик изменений полей после него
+        self.previewed = None
+        self.version = 0
+
+        self.window = tk.Toplevel(parent)
+        self.window.title("Переоценка товаров")
+        self.window.geometry("760x620")
+        self.window.grab_set()  # Модальное окно
+        self.window.focus_set()
+        self.data = DataService.for_widget(self.window)
+
+        self.setup_ui()
+
+    def setup_ui(self):
+        """Создание интерфейса"""
+        main_frame = ttk.Frame(self.window, padding="15")
+        main_frame.pack(fill="both", expand=True)
+
+        # Отбор товаров
+        filter_frame = ttk.LabelFrame(main_frame, text="Какие товары", padding="10")
+        filter_frame.pack(fill="x")
+
+        ttk.Label(filter_frame, text="Поставщик").grid(row=0, column=0, sticky="w", pady=5)
+        self.supplier_combo = ttk.Combobox(
+            filter_frame, values=[ALL] + self.suppliers.labels(),
+            postcommand=self.refresh_references, state="readonly", width=25
+        )
+        self.supplier_combo.set(ALL)
+        self.supplier_combo.grid(row=0, column=1, sticky="w", padx=10, pady=5)
+
+        ttk.Label(filter_frame, text="Категория").grid(row=0, column=2, sticky="w", pady=5)
+        self.category_combo = ttk.Combobox(
+            filter_frame, values=[ALL] + self.categories.labels(),
+            postcommand=self.refresh_references, state="readonly", width=20
+        )
+        self.category_combo.set(ALL)
+        self.category_combo.grid(row=0, column=3, sticky="w", padx=10, pady=5)
+
+        ttk.Label(filter_frame, text="Поиск").grid(row=1, column=0, sticky="w", pady=5)
+        self.search_entry = ttk.Entry(filter_frame, width=28)
+        self.search_entry.grid(row=1, column=1, sticky="w", padx=10, pady=5)
+
+        # Правило переоценки
+        rule_frame = ttk.LabelFrame(main_frame, text="Что изменить", padding="10")
+        rule_frame.pack(fill="x", pady=10)
+
+        self.target_combo = ttk.Combobox(
+            rule_frame, values=list(TARGET_LABELS), state="readonly", width=10
+        )
+        self.target_combo.set("Цена")
+        self.target_combo.grid(row=0, column=0, padx=(0, 10))
+
+        self.mode_combo = ttk.Combobox(
+            rule_frame, values=list(MODE_LABELS), state="readonly", width=15
+        )
+        self.mode_combo.set("Изменить на %")
+        self.mode_combo.grid(row=0, column=1, padx=10)
+
+        self.value_entry = ttk.Entry(rule_frame, width=10)
+        self.value_entry.grid(row=0, column=2, padx=10)
+
+        self.rounding_combo = ttk.Combobox(
+            rule_frame, values=list(ROUNDING_LABELS), state="readonly", width=15
+        )
+        self.rounding_combo.set("До 0.01")
+        self.rounding_combo.grid(row=0, column=3, padx=10)
+
+        # Любое изменение параметров требует нового предпросмотра
+        for combo in (self.supplier_combo, self.category_combo, self.target_combo,
+                      self.mode_combo, self.rounding_combo):
+            combo.bind('<<ComboboxSelected>>', lambda e: self.invalidate())
+        for entry in (self.search_entry, self.value_entry):
+            entry.bind('<KeyRelease>', lambda e: self.invalidate())
+
+        # Кнопки
+        button_frame = ttk.Frame(main_frame)
+        button_frame.pack(fill="x")
+
+        ttk.Button(
+            button_frame, text="👁 Предпросмотр", command=self.preview, width=18
+        ).pack(side="left", padx=(0, 5))
+
+        self.apply_btn = ttk.Button(
+            button_frame, text="✔ Применить", command=self.apply, width=15, state="disabled"
+        )
+        self.apply_btn.pack(side="left", padx=5)
+
+        ttk.Button(
+            button_frame, text="✖ Закрыть", command=self.window.destroy, width=15
+        ).pack(side="right")
+
+        # Итоги и товары
+        self.totals_label = ttk.Label(main_frame, text="", justify="left")
+        self.totals_label.pack(anchor="w", pady=10)
+
+        columns = ('name', 'price', 'new_price', 'discount', 'new_discount', 'quantity')
+        self.tree = ttk.Treeview(main_frame, columns=columns, show='headings', height=12)
+        self.tree.heading('name', text='Наименование')
+        self.tree.heading('price', text='Цена')
+        self.tree.heading('new_price', text='Новая цена')
+        self.tree.heading('discount', text='Скидка %')
+        self.tree.heading('new_discount', text='Новая скидка %')
+        self.tree.heading('quantity', text='Кол-во')
+
+        self.tree.column('name', width=220)
+        for column in columns[1:]:
+            self.tree.column(column, width=90, anchor='e')
+
+        self.tree.pack(fill="both", expand=True)
+        self.tree.tag_configure('invalid', foreground='red')
+
+    def get_params(self):
+        """Правило и отбор из полей окна (ValueError при ошибке ввода)"""
+        try:
+            value = float(self.value_entry.get().strip().replace(',', '.'))
+        except ValueError:
+            raise ValueError("Значение должно быть числом")
+
+        rule = RepricingRule(
+            TARGET_LABELS[self.target_combo.get()],
+            MODE_LABELS[self.mode_combo.get()],
+            value,
+            ROUNDING_LABELS[self.rounding_combo.get()]
+        )
+        selection = {'search': self.search_entry.get().strip() or None}
+        for key, combo, reference in (
+            ('supplier_id', self.supplier_combo, 'suppliers'),
+            ('category_id', self.category_combo, 'categories')
+        ):
+            item_id = None
+            if combo.get() != ALL:
+                # Пропавший из справочника элемент не должен превратиться в "Все"
+                item_id = self.db.get_reference(reference).id_of(combo.get())
+                if item_id is None:
+                    raise ValueError(f"«{combo.get()}» больше нет в справочнике, выберите другое значение")
+            selection[key] = item_id
+        return rule, selection
+
+    def refresh_references(self):
+        """Перечитывание справочников, если они изменились в БД"""
+        self.suppliers = self.db.get_reference('suppliers')
+        self.categories = self.db.get_reference('categories')
+        self.supplier_combo['values'] = [ALL] + self.suppliers.labels()
+        self.category_combo['values'] = [ALL] + self.categories.labels()
+
+    def invalidate(self):
+        """Параметры изменились: применять можно только после предпросмотра"""
+        self.previewed = None
+        self.version += 1
+        self.apply_btn.config(state="disabled")
+
+    def preview(self):
+        """Предпросмотр переоценки"""
+        try:
+            rule, selection = self.get_params()
+        except ValueError as e:
+            messagebox.showerror("Ошибка ввода", str(e), parent=self.window)
+            return
+
+        def done(result):
+            totals, rows = result
+            self.show_preview(rule, totals, rows)
+            # Пока шел подсчет, поля могли измениться
+            if version == self.version and totals['products'] and not totals['invalid']:
+                self.previewed = (rule, selection)
+                self.apply_btn.config(state="normal")
+
+        self.invalidate()
+        version = self.version
+        self.totals_label.config(text="⏳ Подсчет...")
+        self.data.submit(
+            preview_repricing,
+            self.db,
+            rule,
+            **selection,
+            on_done=done,
+            on_error=lambda e: messagebox.showerror(
+                "Ошибка", f"Не удалось выполнить предпросмотр: {str(e)}", parent=self.window
+            ),
+            channel='preview'
+        )
+
+    def show_preview(self, rule, totals, rows):
+        """Итоги и первые товары предпросмотра"""
+        text = (f"Товаров: {totals['products']}, изменится: {totals['changed']}\n"
+                f"Стоимость склада со скидкой: {totals['old_value']:,.2f} → "
+                f"{totals['new_value']:,.2f} ₽").replace(",", " ")
+        if totals['invalid']:
+            text += f"\n⚠️ Недопустимое значение у товаров: {totals['invalid']} - переоценка невозможна"
+        if totals['products'] > len(rows):
+            text += f"\nПоказаны первые {len(rows)} товаров"
+        self.totals_label.config(text=text)
+
+        self.tree.delete(*self.tree.get_children())
+        for row in rows:
+            invalid = check_limit(rule.target, row['new_' + rule.target]) is not None
+            self.tree.insert('', 'end', values=(
+                row['name'],
+                f"{row['price']:.2f}",
+                f"{row['new_price']:.2f}",
+                f"{row['discount']:g}",
+                f"{row['new_discount']:g}",
+                row['quantity']
+            ), tags=('invalid',) if invalid else ())
+
+    def apply(self):
+        """Применение переоценки с параметрами предпросмотра"""
+        if self.previewed is None:
+            return
+        rule, selection = self.previewed
+        if not messagebox.askyesno(
+            "Подтверждение",
+            "Применить переоценку к отобранным товарам?\nЭто действие нельзя отменить!",
+            parent=self.window
+        ):
+            return
+
+        def done(result):
+            if self.main_window:
+                self.main_window.refresh_products()
+            # Окно могли закрыть, пока шла переоценка
+            if not self.window.winfo_exists():
+                return
+            messagebox.showinfo("Переоценка", f"Изменено товаров: {len(result.done)}", parent=self.window)
+            self.window.destroy()
+
+        def failed(error):
+            if not self.window.winfo_exists():
+                messagebox.showerror("Ошибка", f"Не удалось выполнить переоценку: {str(error)}")
+                return
+            messagebox.showerror("Ошибка", f"Не удалось выполнить переоценку: {str(error)}", parent=self.window)
+            self.preview()
+
+        self.apply_btn.config(state="disabled")
+        self.data.submit(
+            apply_repricing,
+            self.db,
+            rule,
+            **selection,
+            on_done=done,
+            on_error=failed
+        )
@@ -0,0 +1,320 @@
+from collections import OrderedDict
+
+from models.instrumentation import timed
+
+
+class VirtualTreeview:
+    """Виртуальная прокрутка для ttk.Treeview
+
+    В таблице создается ровно столько строк, сколько помещается на экране.
+    При прокрутке строки не пересоздаются, а получают новые значения.
+    Данные запрашиваются постранично через fetch_page(offset, limit),
+    который возвращает кортеж (строки, общее количество).
+    format_row(row) возвращает кортеж (values, tags) для строки таблицы.
+    Необязательный row_image(row) возвращает картинку для колонки #0;
+    он вызывается только для видимых строк.
+
+    Если задан submit(func, on_done, on_error), страницы загружаются
+    в фоне: пока страница не пришла, строки показываются заглушками,
+    а ответы на устаревшие запросы отбрасываются.
+    """
+
+    # Значения строки, данные которой еще загружаются
+    PLACEHOLDER = ('…',)
+
+    def __init__(self, tree, scrollbar, fetch_page, format_row,
+                 key='id', page_size=200, max_pages=20,
+                 submit=None, on_loaded=None, on_error=None, row_image=None):
+        self.tree = tree
+        self.scrollbar = scrollbar
+        self.fetch_page = fetch_page
+        self.format_row = format_row
+        self.key = key
+        self.page_size = page_size
+        self.max_pages = max_pages
+        self.submit = submit
+        self.on_loaded = on_loaded
+        self.on_error = on_error
+        self.row_image = row_image
+
+        # Кэш загруженных страниц (номер страницы -> строки)
+        self.pages = OrderedDict()
+        self.total = 0
+        self.top = 0
+
+        # Страницы в процессе загрузки и номер актуального набора данных
+        self.loading = set()
+        self.generation = 0
+        self.rendering = False
+
+        # Пул строк Treeview и данные, отображаемые в каждой из них
+        self.pool = []
+        self.slot_rows = {}
+        self.slot_values = {}
+        self.detached = set()
+
+        # Выделение хранится по ключу записи, а не по строке пула
+        self.selected_keys = set()
+        self.rendered_selection = ()
+        self.extend_selection = False
+
+        # Прокруткой управляем сами
+        self.tree.configure(yscrollcommand=lambda *args: None)
+        self.scrollbar.configure(command=self.on_scrollbar)
+
+        self.tree.bind('<Configure>', self.on_resize, add='+')
+        self.tree.bind('<<TreeviewSelect>>', self.on_select, add='+')
+        self.tree.bind('<Button-1>', lambda e: self.on_click(False), add='+')
+        self.tree.bind('<Shift-Button-1>', lambda e: self.on_click(True), add='+')
+        self.tree.bind('<Control-Button-1>', lambda e: self.on_click(True), add='+')
+        self.tree.bind('<MouseWheel>', self.on_mousewheel)
+        self.tree.bind('<Button-4>', lambda e: self.scroll_by(-3))
+        self.tree.bind('<Button-5>', lambda e: self.scroll_by(3))
+        self.tree.bind('<Up>', lambda e: self.on_key_move(-1))
+        self.tree.bind('<Down>', lambda e: self.on_key_move(1))
+        self.tree.bind('<Prior>', lambda e: self.scroll_by(-len(self.pool)))
+        self.tree.bind('<Next>', lambda e: self.scroll_by(len(self.pool)))
+
+        self.resize_pool(int(self.tree.cget('height')))
+
+    def reload(self):
+        """Полная перезагрузка данных с первой строки"""
+        def reset_view():
+            self.top = 0
+            self.selected_keys = set()
+
+        self.load_page(0, reset=True, on_loaded=reset_view)
+
+    def refresh(self):
+        """Обновление данных с сохранением прокрутки и выделения
+
+        Перечитываются только видимые страницы, а в Treeview меняются
+        только те строки, содержимое которых изменилось.
+        """
+        self.load_page(self.top // self.page_size, reset=True)
+
+    def load_page(self, page_no, reset=False, on_loaded=None):
+        """Загрузка страницы данных в кэш
+
+        reset=True начинает новый набор данных: ответы на прежние
+        запросы отбрасываются, а кэш очищается с приходом страницы.
+        """
+        if reset:
+            self.generation += 1
+            self.loading.clear()
+        elif page_no in self.loading:
+            return
+
+        generation = self.generation
+        offset = page_no * self.page_size
+        self.loading.add(page_no)
+
+        def done(result):
+            # Ответ на устаревший запрос
+            if generation != self.generation:
+                return
+            self.loading.discard(page_no)
+            rows, self.total = result
+            if reset:
+                self.pages.clear()
+            self.pages[page_no] = rows
+
+            # Ограничиваем размер кэша
+            while len(self.pages) > self.max_pages:
+                self.pages.popitem(last=False)
+
+            if on_loaded:
+                on_loaded()
+            if not self.rendering:
+                self.render()
+            if self.on_loaded:
+                self.on_loaded()
+
+        def failed(error):
+            if generation != self.generation:
+                return
+            self.loading.discard(page_no)
+            if self.on_error:
+                self.on_error(error)
+
+        if self.submit is None:
+            done(self.fetch_page(offset, self.page_size))
+        else:
+            self.submit(lambda: self.fetch_page(offset, self.page_size), done, failed)
+
+    def get_row(self, index):
+        """Запись по порядковому номеру (None, если страница еще загружается)"""
+        page_no, pos = divmod(index, self.page_size)
+        rows = self.pages.get(page_no)
+        if rows is None:
+            self.load_page(page_no)
+            rows = self.pages.get(page_no)
+            if rows is None:
+                return None
+        else:
+            self.pages.move_to_end(page_no)
+        return rows[pos] if pos < len(rows) else None
+
+    def resize_pool(self, size):
+        """Изменение количества строк в пуле"""
+        size = max(1, size)
+        while len(self.pool) < size:
+            self.pool.append(self.tree.insert('', 'end'))
+        while len(self.pool) > size:
+            iid = self.pool.pop()
+            self.tree.delete(iid)
+            self.slot_rows.pop(iid, None)
+            self.slot_values.pop(iid, None)
+            self.detached.discard(iid)
+
+    @timed('ui.render')
+    def render(self):
+        """Привязка видимых записей к строкам пула"""
+        self.rendering = True
+        try:
+            self.render_rows()
+        finally:
+            self.rendering = False
+        self.update_scrollbar()
+
+    def render_rows(self):
+        """Заполнение строк пула"""
+        self.top = max(0, min(self.top, self.total - len(self.pool)))
+        selection = []
+
+        for slot, iid in enumerate(self.pool):
+            index = self.top + slot
+
+            # Лишние строки прячем, но не удаляем
+            if index >= self.total:
+                if iid not in self.detached:
+                    self.tree.detach(iid)
+                    self.detached.add(iid)
+                self.slot_rows.pop(iid, None)
+                continue
+
+            row = self.get_row(index)
+            image = ''
+            if row is None:
+                # Страница еще загружается
+                values, tags = self.PLACEHOLDER, ()
+                self.slot_rows.pop(iid, None)
+            else:
+                values, tags = self.format_row(row)
+                if self.row_image:
+                    image = self.row_image(row)
+                self.slot_rows[iid] = row
+                if row[self.key] in self.selected_keys:
+                    selection.append(iid)
+
+            # Строку обновляем, только если ее содержимое изменилось
+            content = (tuple(values), tuple(tags), str(image))
+            if self.slot_values.get(iid) != content:
+                if self.row_image:
+                    self.tree.item(iid, values=values, tags=tags, image=image)
+                else:
+                    self.tree.item(iid, values=values, tags=tags)
+                self.slot_values[iid] = content
+            if iid in self.detached:
+                self.tree.move(iid, '', slot)
+                self.detached.discard(iid)
+
+        selection = tuple(selection)
+        if selection != self.rendered_selection:
+            self.rendered_selection = selection
+            self.tree.selection_set(selection)
+
+    def update_scrollbar(self):
+        """Положение ползунка по номеру первой видимой записи"""
+        if not self.total:
+            self.scrollbar.set(0, 1)
+            return
+        first = self.top / self.total
+        last = min(1, (self.top + len(self.pool)) / self.total)
+        self.scrollbar.set(first, last)
+
+    def scroll_to(self, index):
+        """Прокрутка к записи с указанным номером"""
+        index = max(0, min(index, self.total - len(self.pool)))
+        if index != self.top:
+            self.top = index
+            self.render()
+
+    def scroll_by(self, delta):
+        """Прокрутка на delta записей"""
+        self.scroll_to(self.top + delta)
+        return "break"
+
+    def on_scrollbar(self, *args):
+        """Обработка команд скроллбара"""
+        if args[0] == 'moveto':
+            self.scroll_to(int(float(args[1]) * self.total))
+        elif args[0] == 'scroll':
+            step = int(args[1])
+            if args[2] == 'pages':
+                step *= len(self.pool)
+            self.scroll_by(step)
+
+    def on_mousewheel(self, event):
+        """Прокрутка колесом мыши"""
+        return self.scroll_by(-3 if event.delta > 0 else 3)
+
+    def on_key_move(self, step):
+        """Стрелки на границе видимой области прокручивают таблицу"""
+        focus = self.tree.focus()
+        if focus not in self.slot_rows:
+            return None
+
+        slot = self.pool.index(focus) + step
+        if 0 <= slot < len(self.pool) and self.pool[slot] not in self.detached:
+            # Переход внутри экрана Treeview выполнит сам
+            return None
+
+        old_top = self.top
+        self.scroll_to(self.top + step)
+        row = self.slot_rows.get(focus)
+        if self.top != old_top and row is not None:
+            self.selected_keys = {row[self.key]}
+            self.render()
+        return "break"
+
+    def on_resize(self, event):
+        """Подгонка размера пула под высоту таблицы"""
+        visible = [iid for iid in self.pool if iid not in self.detached]
+        if not visible:
+            return
+        bbox = self.tree.bbox(visible[0])
+        if not bbox:
+            return
+        y, row_height = bbox[1], bbox[3]
+        size = (event.height - y) // row_height
+        if size != len(self.pool):
+            self.resize_pool(size)
+            self.render()
+
+    def on_click(self, extend):
+        """Щелчок с Shift или Ctrl дополняет выделение, а не заменяет его"""
+        self.extend_selection = extend
+
+    def on_select(self, event):
+        """Запоминаем ключи выделенных записей
+
+        При дополнении выделения записи, выделенные за пределами
+        экрана, остаются выделенными.
+        """
+        selection = self.tree.selection()
+        if selection == self.rendered_selection:
+            return
+        self.rendered_selection = selection
+        selected = {
+            self.slot_rows[iid][self.key] for iid in selection if iid in self.slot_rows
+        }
+        if self.extend_selection:
+            visible = {row[self.key] for row in self.slot_rows.values()}
+            selected |= self.selected_keys - visible
+            self.extend_selection = False
+        self.selected_keys = selected
+
+    def selected_rows(self):
+        """Выделенные записи, видимые на экране (все ключи - в selected_keys)"""
+        return [self.slot_rows[iid] for iid in self.tree.selection() if iid in self.slot_rows]
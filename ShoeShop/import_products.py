@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Массовый импорт товаров из CSV/XLSX
+
+Пример: python import_products.py price_list.csv
+"""
+
+import sys
+import os
+import argparse
+import time
+
+# Добавляем текущую папку в путь поиска модулей
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from models.db_models import Database, DB_PATH
+from models.importer import ProductImporter
+
+def main():
+    """Главная функция"""
+    parser = argparse.ArgumentParser(description="Импорт товаров из CSV/XLSX")
+    parser.add_argument("file", help="файл с товарами (.csv или .xlsx)")
+    parser.add_argument("--db", default=DB_PATH, help="путь к базе данных")
+    parser.add_argument("--batch-size", type=int, default=1000, help="товаров в одной транзакции")
+    args = parser.parse_args()
+    
+    if not os.path.exists(args.db):
+        print(f"❌ База данных не найдена: {args.db}")
+        return 1
+    
+    print(f"🔄 Импорт из {args.file}...")
+    started = time.perf_counter()
+    
+    importer = ProductImporter(Database(args.db), batch_size=args.batch_size)
+    try:
+        report = importer.import_file(
+            args.file,
+            on_progress=lambda n: print(f"   обработано строк: {n}", end="\r")
+        )
+    except Exception as e:
+        print(f"❌ Ошибка импорта: {e}")
+        return 1
+    
+    print()
+    for row_no, message in report.errors:
+        print(f"⚠️ Строка {row_no}: {message}")
+    
+    print(f"✅ {report.summary()} ({time.perf_counter() - started:.1f} с)")
+    return 0 if not report.errors else 2
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,23 +3,45 @@
 
 """
 Точка входа в приложение "Магазин обуви"
+
+Флаг --startup-profile выводит время импортов и инициализации.
 """
 
+import time
+
+STARTED = time.perf_counter()
+
 import sys
 import os
 
 # Добавляем текущую папку в путь поиска модулей
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-# Создаем необходимые папки
-os.makedirs('uploads', exist_ok=True)
-os.makedirs('resources', exist_ok=True)
+# Этапы запуска для --startup-profile: (название, момент от старта)
+startup_marks = []
+
+def mark(stage):
+    """Отметка этапа запуска"""
+    startup_marks.append((stage, time.perf_counter() - STARTED))
+
+def report_startup():
+    """Вывод времени этапов запуска"""
+    print("⏱️ Профиль запуска:")
+    previous = 0.0
+    for stage, moment in startup_marks:
+        print(f"   {stage:<32} {(moment - previous) * 1000:7.1f} мс  (всего {moment * 1000:.1f} мс)")
+        previous = moment
 
 def main():
     """Главная функция"""
+    profile_startup = '--startup-profile' in sys.argv
+    mark("интерпретатор и main.py")
     
-    # Создаем базу данных при первом запуске
-    if not os.path.exists(os.path.join('database', 'shoe_shop.db')):
+    # Создаем базу данных при первом запуске (единственная проверка файла)
+    db_path = os.path.join('database', 'shoe_shop.db')
+    try:
+        os.stat(db_path)
+    except FileNotFoundError:
         print("🔄 Создание базы данных...")
         try:
             from database.create_db import create_database
@@ -29,11 +51,36 @@ def main():
             print(f"❌ Ошибка создания БД: {e}")
             input("Нажмите Enter для выхода...")
             return
+    else:
+        # Дополняем схему существующей БД (поисковый индекс и т.п.) в фоне,
+        # главное окно дождется окончания
+        from database.create_db import start_upgrade
+        start_upgrade(db_path)
+    mark("проверка БД")
+    
+    # Сбор статистики производительности с самого запуска
+    if os.environ.get('SHOESHOP_PROFILE'):
+        from models.instrumentation import profiler
+        profiler.enable()
     
     # Запускаем приложение
     try:
-        from gui.login_window import LoginWindow
-        app = LoginWindow()
+        # tkinter отдельно, чтобы в профиле была видна его доля (и версия Tk)
+        import tkinter
+        mark(f"импорт tkinter {tkinter.TkVersion}")
+        from gui.app import App
+        mark("импорт приложения")
+        app = App()
+        mark("создание окна входа")
+        
+        if profile_startup:
+            def shown():
+                # Окно отрисовано: обработаны все события после создания
+                app.root.update_idletasks()
+                mark("первая отрисовка")
+                report_startup()
+            app.root.after_idle(shown)
+        
         app.run()
     except Exception as e:
         print(f"❌ Ошибка запуска: {e}")
@@ -0,0 +1,318 @@
+import re
+import unicodedata
+from bisect import bisect_left, insort
+from collections import defaultdict
+
+from models.db_models import parse_sort
+
+# Поля товара, по которым выполняется поиск
+SEARCH_FIELDS = ('name', 'description', 'category', 'manufacturer', 'supplier')
+
+
+def final_price(product):
+    """Итоговая цена со скидкой (так же, как FINAL_PRICE в запросах БД)"""
+    return product['price'] * (1 - (product['discount'] or 0) / 100)
+
+
+# Значения для сортировки (совпадают с колонками Database.query_products)
+SORT_VALUES = {
+    'id': lambda p: p['id'],
+    'name': lambda p: p['name'],
+    'category': lambda p: p['category'] or '',
+    'manufacturer': lambda p: p['manufacturer'] or '',
+    'supplier': lambda p: p['supplier'] or '',
+    'price': final_price,
+    'discount': lambda p: p['discount'],
+    'quantity': lambda p: p['quantity']
+}
+
+# Колонки, порядок по которым хранится готовым и обновляется при правках
+PRESORTED = ('name', 'price', 'quantity')
+
+
+# Латинские буквы с диакритикой -> базовая буква, отдельные знаки удаляются.
+# Так же работает remove_diacritics в FTS5: кириллицу (й, ё) он не меняет.
+FOLD_DIACRITICS = {code: None for code in range(0x300, 0x370)}
+for code in range(0xC0, 0x250):
+    base = unicodedata.normalize('NFD', chr(code))[0]
+    if base != chr(code) and base.isascii():
+        FOLD_DIACRITICS[code] = base
+HAS_DIACRITICS = re.compile('[\u00c0-\u024f\u0300-\u036f]')
+
+WORD = re.compile(r'[^\W_]+')
+
+
+def search_words(text):
+    """Слова строки так же, как их видит индекс FTS5 (unicode61 remove_diacritics 2):
+    нижний регистр, латиница без диакритики, разделители - не буквы и не цифры"""
+    text = text.lower()
+    # translate дорогой, а в русских названиях такие буквы редкость
+    if HAS_DIACRITICS.search(text):
+        text = text.translate(FOLD_DIACRITICS)
+    return WORD.findall(text)
+
+
+def search_text(product):
+    """Текст товара для поиска: слова всех полей, каждое с пробелом впереди
+
+    Проверка ' ' + слово in текст означает "какое-то слово товара
+    начинается с этого слова" - как префиксный запрос FTS5.
+    """
+    words = search_words('\n'.join(product.get(field) or '' for field in SEARCH_FIELDS))
+    return ' ' + ' '.join(words) if words else ''
+
+
+def trigrams(text):
+    """Множество триграмм строки"""
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class SortOrder:
+    """Товары, упорядоченные по (значение колонки, ID)
+
+    Порядок строится один раз при загрузке каталога, а при правках
+    товар переставляется двоичным поиском без полной сортировки.
+    """
+
+    def __init__(self, value, products):
+        self.value = value
+        self.products = products
+        self.entries = []
+
+    def build(self, products):
+        """Построение порядка по всем товарам"""
+        self.entries = sorted((self.value(p), p['id']) for p in products)
+
+    def add(self, product):
+        """Вставка товара на свое место"""
+        insort(self.entries, (self.value(product), product['id']))
+
+    def remove(self, product):
+        """Удаление товара (нужна версия товара, с которой он был вставлен)"""
+        entry = (self.value(product), product['id'])
+        i = bisect_left(self.entries, entry)
+        if i < len(self.entries) and self.entries[i] == entry:
+            del self.entries[i]
+
+    def select(self, ids, descending=False):
+        """ID из множества ids в этом порядке (None - все товары)
+
+        Большой набор пересекается с готовым порядком за один проход,
+        маленький дешевле отсортировать по значению.
+        """
+        if ids is not None and len(ids) * 16 < len(self.entries):
+            return sorted(ids, key=lambda pid: (self.value(self.products[pid]), pid),
+                          reverse=descending)
+        entries = reversed(self.entries) if descending else self.entries
+        if ids is None:
+            return [pid for _, pid in entries]
+        return [pid for _, pid in entries if pid in ids]
+
+
+class ProductCatalog:
+    """Каталог товаров в памяти с триграммным индексом
+
+    Поиск совпадает с поиском БД (make_search_query): каждое слово
+    запроса должно быть началом какого-то слова в полях SEARCH_FIELDS.
+    Триграммы отбирают кандидатов, точная проверка - по тексту товара.
+    Если новый запрос продолжает предыдущий (пользователь дописал символы),
+    проверяются только результаты предыдущего запроса.
+
+    Для колонок PRESORTED порядок хранится готовым: результат фильтра
+    выдается пересечением с ним, а смена сортировки не пересчитывает
+    фильтр.
+    """
+
+    def __init__(self, products=(), revision=None):
+        self.products = {}
+        # Ревизия товаров БД, на которой каталог был актуален
+        self.revision = revision
+        self.texts = {}
+        self.index = defaultdict(set)
+        self.orders = {column: SortOrder(SORT_VALUES[column], self.products) for column in PRESORTED}
+
+        # Результат последнего поиска для уточнения при наборе
+        self.last_search = None
+        self.last_found = None
+
+        # Результат последнего фильтра (None - все товары)
+        self.last_filter = None
+        self.last_ids = None
+
+        # Результат последнего запроса страниц для query_products()
+        self.last_query = None
+        self.last_rows = None
+
+        self.load(products)
+
+    def load(self, products):
+        """Построение индекса и готовых порядков по списку товаров"""
+        self.products.clear()
+        self.texts.clear()
+        self.index.clear()
+        for product in products:
+            self._index_product(product)
+        for order in self.orders.values():
+            order.build(self.products.values())
+        self._reset_results()
+
+    def __len__(self):
+        return len(self.products)
+
+    def get(self, product_id):
+        """Товар по ID"""
+        return self.products.get(product_id)
+
+    def add(self, product):
+        """Добавление или замена одного товара"""
+        if product['id'] in self.products:
+            self._unorder_product(self.products[product['id']])
+            self._unindex_product(product['id'])
+        self._index_product(product)
+        for order in self.orders.values():
+            order.add(product)
+
+        # Уточняем кэш последнего поиска без полного пересчета
+        if self.last_found is not None:
+            text = self.texts[product['id']]
+            if all(' ' + word in text for word in self.last_search.split()):
+                self.last_found.add(product['id'])
+            else:
+                self.last_found.discard(product['id'])
+        self.last_filter = None
+        self.last_query = None
+
+    update = add
+
+    def remove(self, product_id):
+        """Удаление товара из каталога"""
+        if product_id not in self.products:
+            return
+        self._unorder_product(self.products[product_id])
+        self._unindex_product(product_id)
+        if self.last_found is not None:
+            self.last_found.discard(product_id)
+        self.last_filter = None
+        self.last_query = None
+
+    def search(self, text):
+        """Множество ID товаров, в которых каждое слово text - начало слова товара
+
+        Возвращаемое множество кэшируется и не должно изменяться вызывающим.
+        """
+        words = search_words(text)
+        if not words:
+            return set(self.products)
+        # Запрос в том же виде, что и текст товара
+        query = ''.join(' ' + word for word in words)
+
+        if self.last_found is not None and query.startswith(self.last_search):
+            # Запрос уточнен: слова те же или длиннее, новые слова только
+            # сужают результат - проверяем только прошлые результаты
+            candidates = self.last_found
+        else:
+            # Пересечение списков триграмм, начиная с самого короткого
+            grams = set().union(*(trigrams(word) for word in words))
+            postings = sorted((self.index.get(gram, ()) for gram in grams), key=len)
+            if postings:
+                candidates = set(postings[0])
+                for posting in postings[1:]:
+                    if not candidates:
+                        break
+                    candidates &= posting
+            else:
+                # Все слова короче трех букв
+                candidates = self.products
+
+        prefixes = [' ' + word for word in words]
+        found = {
+            pid for pid in candidates
+            if all(prefix in self.texts[pid] for prefix in prefixes)
+        }
+        self.last_search = query
+        self.last_found = found
+        return found
+
+    def query_products(self, search=None, supplier=None, sort='name_asc', offset=0, limit=100):
+        """Страница товаров с поиском, фильтром и сортировкой
+
+        Повторяет контракт Database.query_products: (товары, общее количество),
+        в том числе правила поиска по словам.
+        """
+        key = (search or '', supplier, sort)
+        if key != self.last_query:
+            self.last_rows = self.sort_ids(self.filter_ids(search, supplier), sort)
+            self.last_query = key
+
+        page = self.last_rows[offset:offset + limit]
+        return [self.products[pid] for pid in page], len(self.last_rows)
+
+    def filter_ids(self, search=None, supplier=None):
+        """Множество ID товаров по поиску и поставщику (None - все товары)"""
+        key = (search or '', supplier)
+        if key != self.last_filter:
+            ids = self.search(search) if search else None
+
+            if supplier and supplier != 'all':
+                candidates = self.products if ids is None else ids
+                ids = {pid for pid in candidates if self.products[pid]['supplier'] == supplier}
+
+            self.last_filter = key
+            self.last_ids = ids
+        return self.last_ids
+
+    def sort_ids(self, ids, sort):
+        """Список ID в порядке сортировки sort (как в Database.query_products)
+
+        Последний ключ берется из готового порядка (или из порядка ID),
+        предыдущие применяются устойчивой сортировкой поверх него.
+        """
+        keys = parse_sort(sort)
+        column, descending = keys[-1]
+        order = self.orders.get(column)
+        if order is not None:
+            rows = order.select(ids, descending)
+        else:
+            rows = sorted(self.products if ids is None else ids, reverse=descending)
+            if column != 'id':
+                value = SORT_VALUES[column]
+                rows.sort(key=lambda pid: value(self.products[pid]), reverse=descending)
+
+        for column, descending in reversed(keys[:-1]):
+            value = SORT_VALUES[column]
+            rows.sort(key=lambda pid: value(self.products[pid]), reverse=descending)
+        return rows
+
+    def _index_product(self, product):
+        """Добавление товара в индекс"""
+        pid = product['id']
+        text = search_text(product)
+        self.products[pid] = product
+        self.texts[pid] = text
+        for gram in trigrams(text):
+            self.index[gram].add(pid)
+
+    def _unorder_product(self, product):
+        """Удаление старой версии товара из готовых порядков"""
+        for order in self.orders.values():
+            order.remove(product)
+
+    def _unindex_product(self, product_id):
+        """Удаление товара из индекса"""
+        text = self.texts.pop(product_id)
+        del self.products[product_id]
+        for gram in trigrams(text):
+            posting = self.index.get(gram)
+            if posting is not None:
+                posting.discard(product_id)
+                if not posting:
+                    del self.index[gram]
+
+    def _reset_results(self):
+        """Сброс кэшированных результатов"""
+        self.last_search = None
+        self.last_found = None
+        self.last_filter = None
+        self.last_ids = None
+        self.last_query = None
+        self.last_rows = None
@@ -0,0 +1,691 @@
+import sqlite3
+import os
+import re
+import json
+import threading
+
+from models.instrumentation import TimedConnection
+from models.validation import check_limit
+
+# Путь к файлу базы данных
+DB_PATH = os.path.join('database', 'shoe_shop.db')
+
+# Итоговая цена товара со скидкой (совпадает с индексом idx_products_final_price)
+FINAL_PRICE = "p.price * (1 - COALESCE(p.discount, 0) / 100.0)"
+
+# Колонки, по которым можно сортировать список товаров.
+# Цена сортируется по итоговой цене, которая показана в таблице.
+SORT_COLUMNS = {
+    'id': 'p.id',
+    'name': 'p.name',
+    'category': "COALESCE(c.name, '')",
+    'manufacturer': "COALESCE(m.name, '')",
+    'supplier': "COALESCE(s.name, '')",
+    'price': FINAL_PRICE,
+    'discount': 'p.discount',
+    'quantity': 'p.quantity'
+}
+
+# Готовые варианты сортировки (для выпадающего списка)
+SORT_ORDERS = (
+    'name_asc', 'name_desc',
+    'price_asc', 'price_desc',
+    'quantity_asc', 'quantity_desc'
+)
+
+# Общая часть запросов списка товаров
+PRODUCT_SELECT = """
+    SELECT p.id, p.name, p.description, p.price, p.discount, p.quantity,
+           p.photo_path, p.category_id, p.manufacturer_id, p.supplier_id, p.unit_id,
+           COALESCE(c.name, '') AS category,
+           COALESCE(m.name, '') AS manufacturer,
+           COALESCE(s.name, '') AS supplier,
+           COALESCE(u.short_name, '') AS unit
+    FROM products p
+    LEFT JOIN categories c ON c.id = p.category_id
+    LEFT JOIN manufacturers m ON m.id = p.manufacturer_id
+    LEFT JOIN suppliers s ON s.id = p.supplier_id
+    LEFT JOIN units u ON u.id = p.unit_id
+"""
+
+# Веса полей поискового индекса для bm25:
+# name, description, category, manufacturer, supplier
+SEARCH_WEIGHTS = (10.0, 1.0, 3.0, 3.0, 2.0)
+
+
+# Поля, которые можно изменить сразу у нескольких товаров
+BULK_FIELDS = ('supplier_id', 'category_id', 'discount')
+
+# Список ID, переданный одним параметром в виде JSON-массива
+ID_LIST = "SELECT value FROM json_each(?)"
+
+
+# Статусы заказов
+ORDER_STATUSES = ('Новый', 'Завершен')
+
+# Сумма позиций заказа по текущим ценам товаров со скидкой
+ORDER_ITEM_TOTAL = "oi.quantity * p.price * (1 - COALESCE(p.discount, 0) / 100.0)"
+
+
+# Справочники: запрос загрузки и подпись элемента для выпадающих списков
+REFERENCE_TABLES = {
+    'categories': ("SELECT id, name FROM categories ORDER BY name", None),
+    'manufacturers': ("SELECT id, name FROM manufacturers ORDER BY name", None),
+    'suppliers': ("SELECT id, name FROM suppliers ORDER BY name", None),
+    'units': (
+        "SELECT id, name, short_name FROM units ORDER BY name",
+        lambda item: f"{item['name']} ({item['short_name']})"
+    )
+}
+
+
+def parse_sort(sort):
+    """Разбор сортировки вида 'supplier_asc,price_desc'
+
+    Возвращает список пар (колонка, по убыванию). Неизвестные
+    колонки пропускаются, по умолчанию - по названию.
+    """
+    keys = []
+    for part in (sort or '').split(','):
+        column, _, direction = part.strip().rpartition('_')
+        if column in SORT_COLUMNS and direction in ('asc', 'desc') \
+                and column not in (key[0] for key in keys):
+            keys.append((column, direction == 'desc'))
+    return keys or [('name', False)]
+
+
+def make_order_by(sort):
+    """Выражение ORDER BY для сортировки списка товаров
+
+    При равенстве всех ключей порядок задает ID в направлении
+    последнего ключа, поэтому страницы не пересекаются.
+    """
+    keys = parse_sort(sort)
+    terms = [f"{SORT_COLUMNS[column]} {'DESC' if desc else 'ASC'}" for column, desc in keys]
+    if keys[-1][0] != 'id':
+        terms.append(f"p.id {'DESC' if keys[-1][1] else 'ASC'}")
+    return ", ".join(terms)
+
+
+def make_search_query(text):
+    """Запрос FTS5 из строки поиска: все слова, каждое как префикс"""
+    words = re.findall(r'\w+', text.lower())
+    if not words:
+        return None
+    return ' AND '.join(f'"{word}"*' for word in words)
+
+
+class ReferenceData:
+    """Справочник с поиском по ID и по названию за O(1)"""
+
+    def __init__(self, items, label=None):
+        self.items = items
+        self.label = label or (lambda item: item['name'])
+        self.by_id = {item['id']: item for item in items}
+        self.by_label = {self.label(item): item for item in items}
+
+    def labels(self):
+        """Подписи элементов в порядке справочника"""
+        return list(self.by_label)
+
+    def label_of(self, item_id):
+        """Подпись элемента по ID"""
+        item = self.by_id.get(item_id)
+        return self.label(item) if item else None
+
+    def id_of(self, label):
+        """ID элемента по подписи"""
+        item = self.by_label.get(label)
+        return item['id'] if item else None
+
+
+class BulkResult:
+    """Итоги массовой операции над товарами"""
+
+    def __init__(self):
+        self.done = []
+        self.errors = []
+        # Файлы фото удаленных товаров (для освобождения после записи)
+        self.photos = []
+
+    def add_error(self, product_id, message):
+        """Товар, который не удалось обработать"""
+        self.errors.append((product_id, message))
+
+    def summary(self):
+        """Краткий итог одной строкой"""
+        return f"Обработано товаров: {len(self.done)}, ошибок: {len(self.errors)}"
+
+
+class ConnectionManager:
+    """Общий для процесса пул соединений с файлом БД
+
+    Каждый поток получает собственное соединение и использует его повторно,
+    поэтому кэш подготовленных запросов sqlite3 живет между вызовами.
+    """
+
+    _managers = {}
+    _managers_lock = threading.Lock()
+
+    # Размер кэша подготовленных запросов на соединение
+    CACHED_STATEMENTS = 256
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self.local = threading.local()
+        self.connections = []
+        self.lock = threading.Lock()
+
+        # Кэш справочников, общий для всех окон (таблица -> ReferenceData)
+        self.references = {}
+
+    @classmethod
+    def for_path(cls, db_path):
+        """Менеджер соединений для файла БД (один на процесс)"""
+        key = os.path.abspath(db_path)
+        with cls._managers_lock:
+            manager = cls._managers.get(key)
+            if manager is None:
+                manager = cls._managers[key] = cls(db_path)
+            return manager
+
+    def connection(self):
+        """Соединение текущего потока"""
+        conn = getattr(self.local, 'conn', None)
+        if conn is None:
+            conn = self._open()
+            self.local.conn = conn
+            with self.lock:
+                self.connections.append(conn)
+        return conn
+
+    def _open(self):
+        """Открытие и настройка нового соединения"""
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=10,
+            cached_statements=self.CACHED_STATEMENTS,
+            check_same_thread=False,
+            # Запросы замеряются, только пока включен профилировщик,
+            # поэтому при переключении соединение не меняется
+            factory=TimedConnection
+        )
+        conn.row_factory = sqlite3.Row
+        # WAL: читатели не блокируются пишущим соединением
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA synchronous = NORMAL")
+        conn.execute("PRAGMA foreign_keys = ON")
+        return conn
+
+    def close_all(self):
+        """Закрытие всех соединений (при выходе из приложения)"""
+        with self.lock:
+            for conn in self.connections:
+                conn.close()
+            self.connections.clear()
+        self.local = threading.local()
+
+
+class Database:
+    """Работа с базой данных магазина"""
+
+    def __init__(self, db_path=DB_PATH):
+        self.db_path = db_path
+        self.manager = ConnectionManager.for_path(db_path)
+
+    def get_connection(self):
+        """Соединение с БД для текущего потока
+
+        Используется как контекстный менеджер: with фиксирует
+        транзакцию или откатывает ее при ошибке, но не закрывает соединение.
+        """
+        return self.manager.connection()
+
+    def check_user(self, login, password):
+        """Проверка логина и пароля"""
+        with self.get_connection() as conn:
+            row = conn.execute(
+                "SELECT id, login, full_name, role FROM users WHERE login = ? AND password = ?",
+                (login, password)
+            ).fetchone()
+        return dict(row) if row else None
+
+    def get_all_products(self):
+        """Получение всех товаров"""
+        with self.get_connection() as conn:
+            rows = conn.execute(PRODUCT_SELECT + " ORDER BY p.name").fetchall()
+        return [dict(r) for r in rows]
+
+    def product_filter(self, search=None, supplier=None):
+        """Условие WHERE и параметры для поиска и фильтра по поставщику"""
+        conditions = []
+        params = []
+
+        # Поиск по тексту через полнотекстовый индекс
+        match = make_search_query(search) if search else None
+        if match:
+            conditions.append(
+                "p.id IN (SELECT rowid FROM product_search WHERE product_search MATCH ?)"
+            )
+            params.append(match)
+
+        # Фильтр по поставщику
+        if supplier and supplier != 'all':
+            conditions.append("s.name = ?")
+            params.append(supplier)
+
+        where = " WHERE " + " AND ".join(conditions) if conditions else ""
+        return where, params
+
+    def query_products(self, search=None, supplier=None, sort='name_asc', offset=0, limit=100):
+        """Страница товаров с поиском, фильтром и сортировкой на стороне БД
+
+        Возвращает кортеж (список товаров, общее количество найденных).
+        """
+        where, params = self.product_filter(search, supplier)
+        order_by = make_order_by(sort)
+
+        with self.get_connection() as conn:
+            total = conn.execute(
+                """SELECT COUNT(*) FROM products p
+                   LEFT JOIN categories c ON c.id = p.category_id
+                   LEFT JOIN manufacturers m ON m.id = p.manufacturer_id
+                   LEFT JOIN suppliers s ON s.id = p.supplier_id""" + where,
+                params
+            ).fetchone()[0]
+            rows = conn.execute(
+                PRODUCT_SELECT + where + f" ORDER BY {order_by} LIMIT ? OFFSET ?",
+                params + [limit, offset]
+            ).fetchall()
+
+        return [dict(r) for r in rows], total
+
+    def iter_products(self, search=None, supplier=None, sort='name_asc', batch_size=500):
+        """Все товары с поиском, фильтром и сортировкой по одному
+
+        Строки читаются курсором порциями fetchmany, поэтому в памяти
+        одновременно находится не больше batch_size товаров.
+        """
+        where, params = self.product_filter(search, supplier)
+        order_by = make_order_by(sort)
+
+        cursor = self.get_connection().execute(
+            PRODUCT_SELECT + where + f" ORDER BY {order_by}", params
+        )
+        try:
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                for row in rows:
+                    yield dict(row)
+        finally:
+            cursor.close()
+
+    def search_products(self, search, supplier=None, offset=0, limit=100):
+        """Полнотекстовый поиск товаров по префиксам слов
+
+        Результаты упорядочены по релевантности (bm25),
+        совпадения в наименовании важнее совпадений в описании.
+        """
+        match = make_search_query(search)
+        if not match:
+            return []
+
+        weights = ", ".join(str(w) for w in SEARCH_WEIGHTS)
+        query = f"""
+            WITH found AS (
+                SELECT rowid AS id, bm25(product_search, {weights}) AS rank
+                FROM product_search
+                WHERE product_search MATCH ?
+            )
+            {PRODUCT_SELECT}
+            JOIN found f ON f.id = p.id
+        """
+        params = [match]
+
+        if supplier and supplier != 'all':
+            query += " WHERE s.name = ?"
+            params.append(supplier)
+
+        query += " ORDER BY f.rank, p.id LIMIT ? OFFSET ?"
+        params.extend([limit, offset])
+
+        with self.get_connection() as conn:
+            rows = conn.execute(query, params).fetchall()
+        return [dict(r) for r in rows]
+
+    def get_product_by_id(self, product_id):
+        """Получение товара по ID"""
+        with self.get_connection() as conn:
+            row = conn.execute(
+                PRODUCT_SELECT + " WHERE p.id = ?", (product_id,)
+            ).fetchone()
+        return dict(row) if row else None
+
+    def add_product(self, data):
+        """Добавление товара"""
+        with self.get_connection() as conn:
+            cursor = conn.execute(
+                """INSERT INTO products (name, description, price, discount, quantity,
+                                         photo_path, manufacturer_id, supplier_id,
+                                         category_id, unit_id)
+                   VALUES (:name, :description, :price, :discount, :quantity,
+                           :photo_path, :manufacturer_id, :supplier_id,
+                           :category_id, :unit_id)""",
+                data
+            )
+            return cursor.lastrowid
+
+    def update_product(self, product_id, data):
+        """Обновление товара"""
+        with self.get_connection() as conn:
+            conn.execute(
+                """UPDATE products SET
+                       name = :name, description = :description, price = :price,
+                       discount = :discount, quantity = :quantity, photo_path = :photo_path,
+                       manufacturer_id = :manufacturer_id, supplier_id = :supplier_id,
+                       category_id = :category_id, unit_id = :unit_id
+                   WHERE id = :id""",
+                dict(data, id=product_id)
+            )
+
+    def delete_product(self, product_id):
+        """Удаление товара (нельзя удалить товар, который есть в заказах)"""
+        with self.get_connection() as conn:
+            in_orders = conn.execute(
+                "SELECT 1 FROM order_items WHERE product_id = ? LIMIT 1", (product_id,)
+            ).fetchone()
+            if in_orders:
+                return False
+            conn.execute("DELETE FROM products WHERE id = ?", (product_id,))
+        return True
+
+    def get_products_by_ids(self, product_ids):
+        """Товары с указанными ID (одним запросом)"""
+        with self.get_connection() as conn:
+            rows = conn.execute(
+                PRODUCT_SELECT + f" WHERE p.id IN ({ID_LIST})",
+                (json.dumps(list(product_ids)),)
+            ).fetchall()
+        return [dict(r) for r in rows]
+
+    def get_products_changed_since(self, revision, limit=None):
+        """ID товаров, измененных и удаленных после ревизии revision
+
+        Возвращает словарь: revision - текущая ревизия (передается
+        в следующий вызов), changed - новые и измененные товары,
+        deleted - удаленные, complete - False, если изменений больше
+        limit или надгробия после revision уже очищены (тогда список
+        нужно перезагрузить целиком).
+        """
+        with self.get_connection() as conn:
+            current, pruned = conn.execute(
+                "SELECT value, pruned FROM product_revision"
+            ).fetchone()
+            if current <= revision:
+                return {'revision': current, 'changed': [], 'deleted': [], 'complete': True}
+
+            # Изменения после чтения счетчика попадут в следующий вызов
+            params = (revision, current, limit + 1 if limit else -1)
+            changed = [row[0] for row in conn.execute(
+                "SELECT id FROM products WHERE revision > ? AND revision <= ? LIMIT ?", params
+            )]
+            deleted = [row[0] for row in conn.execute(
+                "SELECT product_id FROM product_tombstones WHERE revision > ? AND revision <= ? LIMIT ?",
+                params
+            )]
+
+        complete = revision >= pruned and (not limit or len(changed) + len(deleted) <= limit)
+        return {'revision': current, 'changed': changed, 'deleted': deleted, 'complete': complete}
+
+    def get_products_revision(self):
+        """Текущая ревизия товаров"""
+        with self.get_connection() as conn:
+            return conn.execute("SELECT value FROM product_revision").fetchone()[0]
+
+    def delete_products(self, product_ids):
+        """Удаление нескольких товаров одним запросом в одной транзакции
+
+        Товары, которые есть в заказах, пропускаются и попадают
+        в ошибки результата.
+        """
+        ids = sorted(set(product_ids))
+        result = BulkResult()
+        with self.get_connection() as conn:
+            deleted = conn.execute(
+                f"""DELETE FROM products
+                    WHERE id IN ({ID_LIST})
+                      AND NOT EXISTS (SELECT 1 FROM order_items WHERE product_id = products.id)
+                    RETURNING id, photo_path""",
+                (json.dumps(ids),)
+            ).fetchall()
+
+        result.done = sorted(row['id'] for row in deleted)
+        result.photos = list(dict.fromkeys(row['photo_path'] for row in deleted if row['photo_path']))
+
+        # Причину пропуска узнаем только для неудаленных товаров
+        skipped = sorted(set(ids) - set(result.done))
+        if skipped:
+            with self.get_connection() as conn:
+                rows = conn.execute(
+                    """SELECT j.value AS id, p.id IS NOT NULL AS found
+                        FROM json_each(?) j
+                        LEFT JOIN products p ON p.id = j.value""",
+                    (json.dumps(skipped),)
+                ).fetchall()
+            for row in rows:
+                result.add_error(
+                    row['id'],
+                    "Товар есть в заказах" if row['found'] else "Товар не найден"
+                )
+        return result
+
+    def update_products(self, product_ids, changes):
+        """Изменение полей BULK_FIELDS у нескольких товаров одним запросом"""
+        fields = [field for field in BULK_FIELDS if field in changes]
+        if not fields:
+            raise ValueError("Не указано, что изменить")
+        if 'discount' in changes:
+            error = check_limit('discount', changes['discount'])
+            if error:
+                raise ValueError(error)
+
+        ids = sorted(set(product_ids))
+        params = {field: changes[field] for field in fields}
+        params['ids'] = json.dumps(ids)
+        assignments = ", ".join(f"{field} = :{field}" for field in fields)
+
+        result = BulkResult()
+        with self.get_connection() as conn:
+            rows = conn.execute(
+                f"""UPDATE products SET {assignments}
+                    WHERE id IN (SELECT value FROM json_each(:ids))
+                    RETURNING id""",
+                params
+            ).fetchall()
+        result.done = sorted(row['id'] for row in rows)
+
+        for product_id in sorted(set(ids) - set(result.done)):
+            result.add_error(product_id, "Товар не найден")
+        return result
+
+    def inventory_summary(self):
+        """Показатели склада: итоги и строки по поставщикам
+
+        Данные берутся из таблицы inventory_summary, которую ведут
+        триггеры, поэтому время чтения не зависит от размера каталога.
+        """
+        with self.get_connection() as conn:
+            rows = conn.execute("""
+                SELECT s.supplier_id, COALESCE(sp.name, 'Без поставщика') AS supplier,
+                       s.products, s.units, s.stock_value, s.discounted_value,
+                       s.out_of_stock, s.high_discount
+                FROM inventory_summary s
+                LEFT JOIN suppliers sp ON sp.id = s.supplier_id
+                WHERE s.products > 0
+                ORDER BY s.discounted_value DESC
+            """).fetchall()
+        suppliers = [dict(r) for r in rows]
+
+        fields = ('products', 'units', 'stock_value', 'discounted_value', 'out_of_stock', 'high_discount')
+        totals = {field: sum(row[field] for row in suppliers) for field in fields}
+        return {'totals': totals, 'suppliers': suppliers}
+
+    def order_filter(self, status=None, user_id=None, date_from=None):
+        """Условия и параметры фильтра заказов по статусу, клиенту и периоду"""
+        conditions = []
+        params = []
+        if status and status != 'all':
+            conditions.append("o.status = ?")
+            params.append(status)
+        if user_id is not None:
+            conditions.append("o.user_id = ?")
+            params.append(user_id)
+        if date_from:
+            conditions.append("o.order_date >= ?")
+            params.append(date_from)
+        return conditions, params
+
+    def query_orders(self, status=None, user_id=None, date_from=None, after=None, limit=100):
+        """Страница заказов, новые сначала
+
+        Постраничный вывод по ключу: after - кортеж (дата, id) последнего
+        заказа предыдущей страницы. В отличие от OFFSET, время запроса
+        не растет по мере пролистывания истории.
+        """
+        conditions, params = self.order_filter(status, user_id, date_from)
+        if after is not None:
+            conditions.append("(o.order_date, o.id) < (?, ?)")
+            params.extend(after)
+        where = " WHERE " + " AND ".join(conditions) if conditions else ""
+
+        # Суммы считаются только для заказов страницы
+        query = f"""
+            WITH page AS (
+                SELECT o.id FROM orders o{where}
+                ORDER BY o.order_date DESC, o.id DESC
+                LIMIT ?
+            ),
+            totals AS (
+                SELECT oi.order_id, SUM(oi.quantity) AS items, SUM({ORDER_ITEM_TOTAL}) AS total
+                FROM order_items oi
+                JOIN products p ON p.id = oi.product_id
+                WHERE oi.order_id IN (SELECT id FROM page)
+                GROUP BY oi.order_id
+            )
+            SELECT o.id, o.order_date, o.delivery_date, o.code, o.status, o.user_id,
+                   COALESCE(pp.address, '') AS pickup_point,
+                   COALESCE(u.full_name, '') AS customer,
+                   COALESCE(t.items, 0) AS items,
+                   COALESCE(t.total, 0) AS total
+            FROM page
+            JOIN orders o ON o.id = page.id
+            LEFT JOIN pickup_points pp ON pp.id = o.pickup_point_id
+            LEFT JOIN users u ON u.id = o.user_id
+            LEFT JOIN totals t ON t.order_id = o.id
+            ORDER BY o.order_date DESC, o.id DESC
+        """
+
+        with self.get_connection() as conn:
+            rows = conn.execute(query, params + [limit]).fetchall()
+        return [dict(r) for r in rows]
+
+    def order_stats(self, status=None, user_id=None, date_from=None):
+        """Количество и сумма заказов по статусам одним запросом
+
+        Заказы отбираются по индексу, сумма каждого считается по его
+        позициям через покрывающий индекс, поэтому время запроса
+        зависит от числа заказов за период, а не от всей истории.
+        """
+        conditions, params = self.order_filter(status, user_id, date_from)
+        where = " WHERE " + " AND ".join(conditions) if conditions else ""
+        query = f"""
+            SELECT o.status,
+                   COUNT(*) AS orders,
+                   COALESCE(SUM((
+                       SELECT SUM({ORDER_ITEM_TOTAL})
+                       FROM order_items oi
+                       JOIN products p ON p.id = oi.product_id
+                       WHERE oi.order_id = o.id
+                   )), 0) AS total
+            FROM orders o{where}
+            GROUP BY o.status
+            ORDER BY o.status
+        """
+        with self.get_connection() as conn:
+            rows = conn.execute(query, params).fetchall()
+        return [dict(r) for r in rows]
+
+    def get_order_items(self, order_id):
+        """Позиции заказа"""
+        with self.get_connection() as conn:
+            rows = conn.execute(
+                f"""SELECT oi.product_id, p.name, oi.quantity, p.price, p.discount,
+                           {ORDER_ITEM_TOTAL} AS total
+                    FROM order_items oi
+                    JOIN products p ON p.id = oi.product_id
+                    WHERE oi.order_id = ?
+                    ORDER BY oi.id""",
+                (order_id,)
+            ).fetchall()
+        return [dict(r) for r in rows]
+
+    def update_order_status(self, order_id, status):
+        """Изменение статуса заказа"""
+        with self.get_connection() as conn:
+            conn.execute("UPDATE orders SET status = ? WHERE id = ?", (status, order_id))
+
+    def get_categories(self):
+        """Список категорий"""
+        return self.get_reference('categories').items
+
+    def get_manufacturers(self):
+        """Список производителей"""
+        return self.get_reference('manufacturers').items
+
+    def get_suppliers(self):
+        """Список поставщиков"""
+        return self.get_reference('suppliers').items
+
+    def get_units(self):
+        """Список единиц измерения"""
+        return self.get_reference('units').items
+
+    def get_reference(self, table):
+        """Справочник из общего кэша
+
+        Перед выдачей сверяется версия справочника в БД (ее меняют
+        триггеры), поэтому правки из других терминалов и импорта видны
+        сразу; из БД справочник перечитывается только после изменения.
+        """
+        with self.get_connection() as conn:
+            version = conn.execute(
+                "SELECT version FROM reference_versions WHERE name = ?", (table,)
+            ).fetchone()[0]
+            cached = self.manager.references.get(table)
+            if cached is not None and cached[0] == version:
+                return cached[1]
+
+            query, label = REFERENCE_TABLES[table]
+            items = [dict(r) for r in conn.execute(query).fetchall()]
+        reference = ReferenceData(items, label)
+        self.manager.references[table] = (version, reference)
+        return reference
+
+    def add_reference(self, table, name):
+        """Добавление элемента справочника по названию, возвращает его ID"""
+        if table not in ('categories', 'manufacturers', 'suppliers'):
+            raise ValueError(f"Нельзя добавить элемент в справочник {table}")
+        with self.get_connection() as conn:
+            conn.execute(f"INSERT OR IGNORE INTO {table} (name) VALUES (?)", (name,))
+            item_id = conn.execute(
+                f"SELECT id FROM {table} WHERE name = ?", (name,)
+            ).fetchone()[0]
+        self.invalidate_references(table)
+        return item_id
+
+    def invalidate_references(self, *tables):
+        """Сброс кэша справочников после их изменения (без аргументов - всех)"""
+        for table in tables or list(self.manager.references):
+            self.manager.references.pop(table, None)
@@ -0,0 +1,83 @@
+import os
+import csv
+import json
+import tempfile
+
+# Поля выгрузки: ключ товара -> заголовок колонки CSV
+# (заголовки совпадают с теми, что понимает импорт товаров)
+EXPORT_FIELDS = [
+    ('id', 'ID'),
+    ('name', 'Наименование'),
+    ('description', 'Описание'),
+    ('category', 'Категория'),
+    ('manufacturer', 'Производитель'),
+    ('supplier', 'Поставщик'),
+    ('price', 'Цена'),
+    ('discount', 'Скидка'),
+    ('final_price', 'Цена со скидкой'),
+    ('quantity', 'Количество'),
+    ('unit', 'Ед.')
+]
+
+EXPORT_FORMATS = ('csv', 'jsonl')
+
+
+def export_record(product):
+    """Данные товара для выгрузки"""
+    record = {key: product.get(key) for key, _ in EXPORT_FIELDS}
+    record['final_price'] = round(product['price'] * (1 - (product['discount'] or 0) / 100), 2)
+    return record
+
+
+def write_csv(products, f):
+    """Запись товаров в CSV (разделитель ';' для Excel)"""
+    writer = csv.writer(f, delimiter=';')
+    writer.writerow([title for _, title in EXPORT_FIELDS])
+    count = 0
+    for product in products:
+        record = export_record(product)
+        writer.writerow([record[key] for key, _ in EXPORT_FIELDS])
+        count += 1
+    return count
+
+
+def write_jsonl(products, f):
+    """Запись товаров в JSON Lines: один объект на строку"""
+    count = 0
+    for product in products:
+        f.write(json.dumps(export_record(product), ensure_ascii=False))
+        f.write('\n')
+        count += 1
+    return count
+
+
+def export_products(db, path, fmt=None, search=None, supplier=None, sort='name_asc'):
+    """Выгрузка товаров в файл CSV или JSONL, возвращает число товаров
+
+    Товары читаются из БД потоково (Database.iter_products) и сразу
+    пишутся в файл, поэтому память не зависит от размера каталога.
+    Формат определяется по расширению, если не указан явно.
+    """
+    if fmt is None:
+        fmt = os.path.splitext(path)[1].lower().lstrip('.')
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Неподдерживаемый формат выгрузки: {fmt}")
+
+    products = db.iter_products(search=search, supplier=supplier, sort=sort)
+
+    # Атомарная запись: при ошибке старый файл остается нетронутым
+    folder = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=folder, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', newline='', encoding='utf-8-sig' if fmt == 'csv' else 'utf-8') as f:
+            if fmt == 'csv':
+                count = write_csv(products, f)
+            else:
+                count = write_jsonl(products, f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        products.close()
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return count
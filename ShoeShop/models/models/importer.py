@@ -0,0 +1,339 @@
+import csv
+import math
+import os
+import sqlite3
+
+from database.create_db import SEARCH_INDEX_FILL
+from models.validation import check_limit
+
+# Заголовки колонок файла (в нижнем регистре) -> поле товара
+COLUMN_ALIASES = {
+    'id': 'id',
+    'name': 'name', 'наименование': 'name', 'название': 'name', 'товар': 'name',
+    'description': 'description', 'описание': 'description',
+    'category': 'category', 'категория': 'category',
+    'manufacturer': 'manufacturer', 'производитель': 'manufacturer',
+    'supplier': 'supplier', 'поставщик': 'supplier',
+    'price': 'price', 'цена': 'price',
+    'discount': 'discount', 'скидка': 'discount', 'скидка %': 'discount',
+    'quantity': 'quantity', 'количество': 'quantity', 'кол-во': 'quantity',
+    'unit': 'unit', 'ед.': 'unit', 'единица измерения': 'unit'
+}
+
+# Справочники, недостающие значения которых создаются при импорте
+AUTO_REFERENCES = {
+    'category': 'categories',
+    'manufacturer': 'manufacturers',
+    'supplier': 'suppliers'
+}
+
+INSERT_SQL = """
+    INSERT INTO products (name, description, price, discount, quantity,
+                          manufacturer_id, supplier_id, category_id, unit_id)
+    VALUES (:name, :description, :price, :discount, :quantity,
+            :manufacturer_id, :supplier_id, :category_id, :unit_id)
+"""
+
+# Строки с ID обновляют существующий товар: меняются только колонки,
+# которые есть в файле (фото не трогаем), см. make_upsert_sql
+UPSERT_SQL = """
+    INSERT INTO products (id, name, description, price, discount, quantity,
+                          manufacturer_id, supplier_id, category_id, unit_id)
+    VALUES (:id, :name, :description, :price, :discount, :quantity,
+            :manufacturer_id, :supplier_id, :category_id, :unit_id)
+    ON CONFLICT(id) DO UPDATE SET {updates}
+"""
+
+# Поле файла -> колонка таблицы товаров
+FIELD_COLUMNS = {
+    'name': 'name',
+    'description': 'description',
+    'price': 'price',
+    'discount': 'discount',
+    'quantity': 'quantity',
+    'manufacturer': 'manufacturer_id',
+    'supplier': 'supplier_id',
+    'category': 'category_id',
+    'unit': 'unit_id'
+}
+
+
+def make_upsert_sql(fields):
+    """UPSERT для файла с полями fields
+
+    Новый товар получает значения по умолчанию для отсутствующих колонок,
+    у существующего они остаются как есть.
+    """
+    columns = [column for field, column in FIELD_COLUMNS.items() if field in fields]
+    return UPSERT_SQL.format(updates=", ".join(f"{column} = excluded.{column}" for column in columns))
+
+
+class ImportReport:
+    """Итоги импорта"""
+
+    def __init__(self):
+        self.inserted = 0
+        self.updated = 0
+        self.errors = []
+
+    def add_error(self, row_no, message):
+        """Ошибка в строке файла"""
+        self.errors.append((row_no, message))
+
+    def summary(self):
+        """Краткий итог одной строкой"""
+        return (f"Добавлено: {self.inserted}, обновлено: {self.updated}, "
+                f"ошибок: {len(self.errors)}")
+
+
+def parse_number(value, integer=False):
+    """Число из ячейки: допускаются пробелы и запятая как разделитель"""
+    if isinstance(value, (int, float)):
+        number = value
+    else:
+        text = str(value).replace('\xa0', '').replace(' ', '').replace(',', '.').rstrip('%')
+        number = float(text)
+    # inf и nan float() принимает, но ни в одно поле товара они не годятся
+    if not math.isfinite(number):
+        raise ValueError
+    if integer:
+        if float(number) != int(float(number)):
+            raise ValueError
+        return int(float(number))
+    return float(number)
+
+
+def read_csv(path, encoding='utf-8-sig'):
+    """Потоковое чтение CSV (разделитель определяется автоматически)"""
+    with open(path, newline='', encoding=encoding) as f:
+        sample = f.read(4096)
+        f.seek(0)
+        try:
+            dialect = csv.Sniffer().sniff(sample, delimiters=',;\t')
+        except csv.Error:
+            dialect = csv.excel
+        yield from csv.reader(f, dialect)
+
+
+def read_xlsx(path):
+    """Потоковое чтение первого листа XLSX"""
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        raise RuntimeError("Для импорта XLSX установите пакет openpyxl")
+
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        for row in workbook.active.iter_rows(values_only=True):
+            yield ['' if cell is None else cell for cell in row]
+    finally:
+        workbook.close()
+
+
+def read_rows(path):
+    """Строки файла в зависимости от расширения"""
+    if os.path.splitext(path)[1].lower() in ('.xlsx', '.xlsm'):
+        return read_xlsx(path)
+    return read_csv(path)
+
+
+class ProductImporter:
+    """Массовый импорт товаров из CSV/XLSX
+
+    Файл читается потоково, справочники берутся из общего кэша один раз
+    на импорт (и после добавления элементов),
+    товары записываются пачками executemany в одной транзакции на пачку.
+    """
+
+    def __init__(self, db, batch_size=1000):
+        self.db = db
+        self.batch_size = batch_size
+        self.upsert_sql = make_upsert_sql(FIELD_COLUMNS)
+        # Справочники текущего импорта: проверка версии в БД на каждую
+        # строку файла заметно замедлила бы импорт
+        self.references = {}
+
+    def import_file(self, path, on_progress=None):
+        """Импорт файла, возвращает ImportReport"""
+        report = ImportReport()
+        rows = read_rows(path)
+        self.references = {}
+
+        header = next(rows, None)
+        if header is None:
+            report.add_error(0, "Файл пуст")
+            return report
+
+        columns = [COLUMN_ALIASES.get(str(h).strip().lower()) for h in header]
+        if 'name' not in columns or 'price' not in columns:
+            report.add_error(1, "Нет обязательных колонок: наименование и цена")
+            return report
+        self.upsert_sql = make_upsert_sql(columns)
+
+        batch = []
+        processed = 0
+        for row_no, row in enumerate(rows, start=2):
+            if not any(str(cell).strip() for cell in row):
+                continue
+
+            record = {field: cell for field, cell in zip(columns, row) if field}
+            try:
+                batch.append((row_no, self.make_product(record)))
+            except ValueError as e:
+                report.add_error(row_no, str(e))
+
+            if len(batch) >= self.batch_size:
+                self.write_batch(batch, report)
+                processed += len(batch)
+                batch = []
+                if on_progress:
+                    on_progress(processed)
+
+        if batch:
+            self.write_batch(batch, report)
+            processed += len(batch)
+            if on_progress:
+                on_progress(processed)
+
+        return report
+
+    def make_product(self, record):
+        """Проверка строки и преобразование в данные товара"""
+        name = str(record.get('name', '')).strip()
+        if not name:
+            raise ValueError("Наименование товара обязательно")
+
+        try:
+            price = parse_number(record.get('price', ''))
+        except ValueError:
+            raise ValueError("Цена должна быть числом")
+        error = check_limit('price', price)
+        if error:
+            raise ValueError(error)
+
+        discount = 0.0
+        if str(record.get('discount', '')).strip():
+            try:
+                discount = parse_number(record['discount'])
+            except ValueError:
+                raise ValueError("Скидка должна быть числом")
+            error = check_limit('discount', discount)
+            if error:
+                raise ValueError(error)
+
+        quantity = 0
+        if str(record.get('quantity', '')).strip():
+            try:
+                quantity = parse_number(record['quantity'], integer=True)
+            except ValueError:
+                raise ValueError("Количество должно быть целым числом")
+            error = check_limit('quantity', quantity)
+            if error:
+                raise ValueError(error)
+
+        product_id = None
+        if str(record.get('id', '')).strip():
+            try:
+                product_id = parse_number(record['id'], integer=True)
+            except ValueError:
+                raise ValueError("ID должен быть целым числом")
+
+        data = {
+            'id': product_id,
+            'name': name,
+            'description': str(record.get('description', '')).strip(),
+            'price': price,
+            'discount': discount,
+            'quantity': quantity,
+            'unit_id': self.resolve_unit(str(record.get('unit', '')).strip())
+        }
+        for field, table in AUTO_REFERENCES.items():
+            data[f"{field}_id"] = self.resolve_reference(table, str(record.get(field, '')).strip())
+        return data
+
+    def get_reference(self, table):
+        """Справочник для текущего импорта"""
+        reference = self.references.get(table)
+        if reference is None:
+            reference = self.references[table] = self.db.get_reference(table)
+        return reference
+
+    def resolve_reference(self, table, name):
+        """ID элемента справочника по названию (недостающие создаются)"""
+        if not name:
+            return None
+        item_id = self.get_reference(table).id_of(name)
+        if item_id is None:
+            item_id = self.db.add_reference(table, name)
+            self.references.pop(table, None)
+        return item_id
+
+    def resolve_unit(self, text):
+        """ID единицы измерения по названию или сокращению"""
+        if not text:
+            return None
+        units = self.get_reference('units')
+        unit_id = units.id_of(text)
+        if unit_id is None:
+            lowered = text.lower().rstrip('.')
+            for unit in units.items:
+                if lowered in (unit['name'].lower(), unit['short_name'].lower().rstrip('.')):
+                    return unit['id']
+            raise ValueError(f"Неизвестная единица измерения: {text}")
+        return unit_id
+
+    def write_batch(self, batch, report):
+        """Запись пачки товаров в одной транзакции"""
+        inserts = [data for _, data in batch if data['id'] is None]
+        upserts = [data for _, data in batch if data['id'] is not None]
+
+        conn = self.db.get_connection()
+        try:
+            with conn:
+                existing = self.count_existing(conn, upserts)
+                last_id = conn.execute("SELECT COALESCE(MAX(id), 0) FROM products").fetchone()[0]
+
+                # Построчные триггеры поиска отключены только внутри этой транзакции
+                conn.execute("UPDATE search_index_state SET deferred = 1")
+                conn.executemany(INSERT_SQL, inserts)
+                conn.executemany(self.upsert_sql, upserts)
+                self.reindex_batch(conn, last_id, [data['id'] for data in upserts])
+                conn.execute("UPDATE search_index_state SET deferred = 0")
+            report.inserted += len(batch) - existing
+            report.updated += existing
+        except sqlite3.Error:
+            # Пачка откатилась: записываем построчно, чтобы найти ошибочные строки
+            for row_no, data in batch:
+                try:
+                    with conn:
+                        existing = self.count_existing(conn, [data] if data['id'] else [])
+                        conn.execute(self.upsert_sql if data['id'] else INSERT_SQL, data)
+                    if existing:
+                        report.updated += 1
+                    else:
+                        report.inserted += 1
+                except sqlite3.Error as e:
+                    report.add_error(row_no, f"Ошибка записи: {e}")
+
+    def reindex_batch(self, conn, last_id, updated_ids):
+        """Поисковый индекс для новых товаров и товаров с указанным ID"""
+        for start in range(0, len(updated_ids), 500):
+            chunk = updated_ids[start:start + 500]
+            marks = ','.join('?' * len(chunk))
+            conn.execute(f"DELETE FROM product_search WHERE rowid IN ({marks})", chunk)
+            conn.execute(SEARCH_INDEX_FILL + f" WHERE p.id IN ({marks}) AND p.id <= ?",
+                         chunk + [last_id])
+        conn.execute(SEARCH_INDEX_FILL + " WHERE p.id > ?", (last_id,))
+
+    def count_existing(self, conn, products):
+        """Сколько товаров из списка уже есть в БД"""
+        ids = [data['id'] for data in products]
+        existing = 0
+        # Проверяем частями, чтобы не превысить лимит параметров SQLite
+        for start in range(0, len(ids), 500):
+            chunk = ids[start:start + 500]
+            existing += conn.execute(
+                f"SELECT COUNT(*) FROM products WHERE id IN ({','.join('?' * len(chunk))})",
+                chunk
+            ).fetchone()[0]
+        return existing
@@ -0,0 +1,284 @@
+import os
+import time
+import sqlite3
+import threading
+import functools
+from collections import deque
+from datetime import datetime
+
+# Границы корзин гистограммы задержек, мс (последняя - все, что дольше)
+BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, float('inf'))
+
+# Файл журнала медленных запросов
+SLOW_LOG_PATH = os.path.join('cache', 'slow_queries.log')
+
+# Запросы, для которых имеет смысл EXPLAIN QUERY PLAN
+EXPLAINABLE = ('SELECT', 'WITH', 'INSERT', 'UPDATE', 'DELETE')
+
+
+class TimingStats:
+    """Статистика одной операции: вызовы, время, строки, гистограмма"""
+
+    def __init__(self, name):
+        self.name = name
+        self.calls = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.rows = 0
+        self.buckets = [0] * len(BUCKETS_MS)
+
+    def add(self, elapsed, rows=0):
+        """Учет одного вызова (elapsed в секундах)"""
+        self.calls += 1
+        self.total += elapsed
+        self.max = max(self.max, elapsed)
+        self.rows += rows
+        ms = elapsed * 1000
+        for i, bound in enumerate(BUCKETS_MS):
+            if ms <= bound:
+                self.buckets[i] += 1
+                break
+
+    def percentile(self, q):
+        """Оценка перцентиля по гистограмме (верхняя граница корзины), мс"""
+        if not self.calls:
+            return 0.0
+        target = self.calls * q
+        seen = 0
+        for bound, count in zip(BUCKETS_MS, self.buckets):
+            seen += count
+            if seen >= target:
+                return min(bound, self.max * 1000)
+        return self.max * 1000
+
+    def as_dict(self):
+        """Данные для отображения"""
+        return {
+            'name': self.name,
+            'calls': self.calls,
+            'total_ms': self.total * 1000,
+            'avg_ms': self.total * 1000 / self.calls if self.calls else 0.0,
+            'p95_ms': self.percentile(0.95),
+            'max_ms': self.max * 1000,
+            'rows': self.rows
+        }
+
+
+class Profiler:
+    """Сбор статистики производительности (включается явно)
+
+    Пока сбор выключен, обертки только проверяют флаг enabled.
+    Учитываются вызовы методов Database, отдельные SQL-запросы
+    и операции интерфейса, помеченные декоратором timed().
+    Запросы дольше slow_threshold секунд попадают в журнал
+    медленных запросов вместе с EXPLAIN QUERY PLAN.
+    """
+
+    def __init__(self, slow_threshold=0.1, slow_log_path=SLOW_LOG_PATH, max_slow=200):
+        self.enabled = False
+        self.slow_threshold = slow_threshold
+        self.slow_log_path = slow_log_path
+        self.stats = {}
+        self.slow_queries = deque(maxlen=max_slow)
+        self.slow_seq = 0
+        self.lock = threading.Lock()
+
+    def enable(self):
+        """Включение сбора статистики"""
+        from models.db_models import Database
+        instrument_class(Database, 'db')
+        self.enabled = True
+
+    def disable(self):
+        """Выключение сбора (накопленная статистика сохраняется)"""
+        self.enabled = False
+
+    def reset(self):
+        """Очистка статистики и журнала"""
+        with self.lock:
+            self.stats.clear()
+            self.slow_queries.clear()
+
+    def record(self, name, elapsed, rows=0):
+        """Учет одного вызова операции name"""
+        with self.lock:
+            stats = self.stats.get(name)
+            if stats is None:
+                stats = self.stats[name] = TimingStats(name)
+            stats.add(elapsed, rows)
+
+    def snapshot(self):
+        """Копия статистики, отсортированная по суммарному времени"""
+        with self.lock:
+            items = [stats.as_dict() for stats in self.stats.values()]
+            slow = list(self.slow_queries)
+        items.sort(key=lambda item: item['total_ms'], reverse=True)
+        return items, slow
+
+    def record_query(self, conn, sql, params, elapsed, rows):
+        """Учет SQL-запроса и запись в журнал, если он медленный"""
+        text = ' '.join(sql.split())
+        self.record(query_name(text), elapsed, rows)
+        if elapsed < self.slow_threshold:
+            return
+
+        plan = self.explain(conn, sql, params)
+        entry = {
+            'time': datetime.now().strftime('%H:%M:%S'),
+            'ms': elapsed * 1000,
+            'sql': text,
+            'plan': plan
+        }
+        with self.lock:
+            self.slow_seq += 1
+            entry['seq'] = self.slow_seq
+            self.slow_queries.append(entry)
+        self.write_slow_log(entry)
+
+    def explain(self, conn, sql, params):
+        """План выполнения запроса (строки EXPLAIN QUERY PLAN)"""
+        if not sql.lstrip().upper().startswith(EXPLAINABLE):
+            return []
+        try:
+            # Обычный курсор: сам EXPLAIN в статистику не попадает
+            cursor = conn.cursor(sqlite3.Cursor)
+            rows = cursor.execute("EXPLAIN QUERY PLAN " + sql, params).fetchall()
+            return [row[3] for row in rows]
+        except sqlite3.Error as e:
+            return [f"Не удалось получить план: {e}"]
+
+    def write_slow_log(self, entry):
+        """Добавление записи в файл журнала медленных запросов"""
+        if not self.slow_log_path:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.slow_log_path) or '.', exist_ok=True)
+            with open(self.slow_log_path, 'a', encoding='utf-8') as f:
+                f.write(f"[{entry['time']}] {entry['ms']:.1f} мс: {entry['sql']}\n")
+                for line in entry['plan']:
+                    f.write(f"    {line}\n")
+        except OSError as e:
+            print(f"Ошибка записи журнала медленных запросов: {e}")
+
+
+# Общий профилировщик приложения
+profiler = Profiler()
+
+
+def query_name(text):
+    """Имя запроса в статистике: начало и конец текста
+
+    У запросов списка товаров общий длинный SELECT, различаются
+    они условиями и сортировкой в конце.
+    """
+    if len(text) > 120:
+        text = f"{text[:50]} … {text[-70:]}"
+    return f"sql: {text}"
+
+
+def count_rows(result):
+    """Число строк в результате метода Database"""
+    if isinstance(result, list):
+        return len(result)
+    if isinstance(result, tuple) and result and isinstance(result[0], list):
+        # query_products возвращает (строки, общее количество)
+        return len(result[0])
+    if isinstance(result, dict):
+        return 1
+    return 0
+
+
+def timed(name):
+    """Декоратор: учет времени вызова функции под именем name"""
+    def decorator(func):
+        # inspect импортируется долго, а на пути запуска он не нужен
+        import inspect
+        if inspect.isgeneratorfunction(func):
+            @functools.wraps(func)
+            def generator_wrapper(*args, **kwargs):
+                if not profiler.enabled:
+                    yield from func(*args, **kwargs)
+                    return
+                # Время генератора - от первого до последнего элемента
+                started = time.perf_counter()
+                rows = 0
+                try:
+                    for item in func(*args, **kwargs):
+                        rows += 1
+                        yield item
+                finally:
+                    profiler.record(name, time.perf_counter() - started, rows)
+            return generator_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not profiler.enabled:
+                return func(*args, **kwargs)
+            started = time.perf_counter()
+            result = func(*args, **kwargs)
+            profiler.record(name, time.perf_counter() - started, count_rows(result))
+            return result
+
+        return wrapper
+    return decorator
+
+
+def instrument_class(cls, prefix):
+    """Обертка всех публичных методов класса декоратором timed()"""
+    import inspect
+    if getattr(cls, '_instrumented', False):
+        return
+    for attr, func in list(vars(cls).items()):
+        if attr.startswith('_') or not inspect.isfunction(func):
+            continue
+        # Соединение - не операция, его выдача не замеряется
+        if attr == 'get_connection':
+            continue
+        setattr(cls, attr, timed(f"{prefix}.{attr}")(func))
+    cls._instrumented = True
+
+
+class TimedCursor(sqlite3.Cursor):
+    """Курсор, замеряющий время выполнения запросов"""
+
+    def execute(self, sql, parameters=()):
+        if not profiler.enabled:
+            return super().execute(sql, parameters)
+        started = time.perf_counter()
+        cursor = super().execute(sql, parameters)
+        profiler.record_query(self.connection, sql, parameters,
+                              time.perf_counter() - started, max(self.rowcount, 0))
+        return cursor
+
+    def executemany(self, sql, seq_of_parameters):
+        if not profiler.enabled:
+            return super().executemany(sql, seq_of_parameters)
+        started = time.perf_counter()
+        cursor = super().executemany(sql, seq_of_parameters)
+        # План для пачки не строим: параметров может быть много
+        profiler.record(query_name(' '.join(sql.split())),
+                        time.perf_counter() - started, max(self.rowcount, 0))
+        return cursor
+
+
+class TimedConnection(sqlite3.Connection):
+    """Соединение, запросы которого учитываются профилировщиком
+
+    Для SELECT замеряется execute(): сортировку, группировку и подсчет
+    SQLite выполняет до выдачи первой строки. Время чтения результата
+    входит в статистику вызвавшего метода Database.
+    """
+
+    def cursor(self, factory=TimedCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        # Выключенный профилировщик - обычный курсор без лишних вызовов
+        if not profiler.enabled:
+            return super().execute(sql, parameters)
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        if not profiler.enabled:
+            return super().executemany(sql, seq_of_parameters)
+        return self.cursor().executemany(sql, seq_of_parameters)
@@ -0,0 +1,81 @@
+import os
+import hashlib
+import tempfile
+
+# Папка с фотографиями товаров
+UPLOADS_DIR = 'uploads'
+
+
+class PhotoStore:
+    """Хранилище фото товаров с адресацией по содержимому
+
+    Файл называется по SHA-256 своего содержимого и лежит в подпапках
+    uploads/ab/cd/, поэтому одинаковое фото хранится один раз, сколько бы
+    товаров на него ни ссылалось. Число ссылок берется из таблицы products:
+    файл удаляется, когда на него не ссылается ни один товар.
+
+    Загрузка может совпасть с уже существующим файлом, который удалит
+    release() другого товара до сохранения формы, поэтому после записи
+    товара файл восстанавливается через restore().
+    """
+
+    def __init__(self, root=UPLOADS_DIR):
+        self.root = root
+
+    def path_for(self, digest):
+        """Путь к файлу по хэшу содержимого"""
+        return os.path.join(self.root, digest[:2], digest[2:4], f"{digest}.jpg")
+
+    def put(self, data):
+        """Сохранение фото (байты JPEG), возвращает путь к файлу"""
+        digest = hashlib.sha256(data).hexdigest()
+        path = self.path_for(digest)
+        if os.path.exists(path):
+            return path
+
+        # Атомарная запись: временный файл в той же папке и переименование
+        folder = os.path.dirname(path)
+        os.makedirs(folder, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=folder, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        return path
+
+    def owns(self, path):
+        """Находится ли файл внутри хранилища"""
+        root = os.path.abspath(self.root)
+        return os.path.abspath(path).startswith(root + os.sep)
+
+    def restore(self, path, data):
+        """Повторная запись фото товара, если файл успели удалить"""
+        if not os.path.exists(path):
+            self.put(data)
+
+    def release(self, path, db):
+        """Удаление файла, если на него больше не ссылается ни один товар
+
+        Проверка ссылок и удаление выполняются под блокировкой записи БД:
+        между ними товар с этим фото сохранить нельзя, а сохраненный
+        позже товар вернет файл через restore().
+        """
+        if not path or not self.owns(path) or not os.path.exists(path):
+            return False
+        conn = db.get_connection()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            referenced = conn.execute(
+                "SELECT 1 FROM products WHERE photo_path = ? LIMIT 1", (path,)
+            ).fetchone()
+            if referenced:
+                return False
+            try:
+                os.remove(path)
+            except OSError:
+                return False
+        return True
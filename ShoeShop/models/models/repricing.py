@@ -0,0 +1,142 @@
+import math
+
+from models.db_models import BulkResult, make_search_query
+from models.validation import check_limit, limit_violation_sql, LIMITS, NOT_FINITE
+
+# Изменяемые поля
+TARGETS = ('price', 'discount')
+
+# Способ изменения: процент от текущего значения, прибавка или новое значение
+MODES = {
+    'percent': "{column} * (1 + :value / 100.0)",
+    'add': "{column} + :value",
+    'set': ":value"
+}
+
+# Шаг округления нового значения (None - без округления)
+ROUNDING_STEPS = (None, 0.01, 1, 10, 100)
+
+# Итоговая цена со скидкой для столбцов старой и новой версии товара
+FINAL_PRICE = "{price} * (1 - COALESCE({discount}, 0) / 100.0)"
+
+
+class RepricingRule:
+    """Правило переоценки: что меняется, как и с каким округлением"""
+
+    def __init__(self, target, mode, value, step=None):
+        if target not in TARGETS:
+            raise ValueError(f"Неизвестное поле: {target}")
+        if mode not in MODES:
+            raise ValueError(f"Неизвестный способ изменения: {mode}")
+        if step not in ROUNDING_STEPS:
+            raise ValueError(f"Недопустимый шаг округления: {step}")
+        if not math.isfinite(float(value)):
+            raise ValueError(NOT_FINITE)
+        if mode == 'set':
+            error = check_limit(target, value)
+            if error:
+                raise ValueError(error)
+        self.target = target
+        self.mode = mode
+        self.value = float(value)
+        self.step = step
+
+    def expression(self):
+        """Выражение SQL для нового значения поля"""
+        expr = MODES[self.mode].format(column=self.target)
+        if self.step is None:
+            return expr
+        if self.step < 1:
+            # Дробный шаг через ROUND(x, n), чтобы не накапливать ошибку деления
+            return f"ROUND({expr}, 2)"
+        return f"ROUND(({expr}) / {self.step}) * {self.step}"
+
+    def new_columns(self):
+        """Выражения новой цены и новой скидки"""
+        price = self.expression() if self.target == 'price' else 'price'
+        discount = self.expression() if self.target == 'discount' else 'discount'
+        return price, discount
+
+
+def repricing_filter(supplier_id=None, category_id=None, search=None):
+    """Условие WHERE и параметры отбора товаров для переоценки"""
+    conditions = []
+    params = {}
+    if supplier_id is not None:
+        conditions.append("supplier_id = :supplier_id")
+        params['supplier_id'] = supplier_id
+    if category_id is not None:
+        conditions.append("category_id = :category_id")
+        params['category_id'] = category_id
+    match = make_search_query(search) if search else None
+    if match:
+        conditions.append("id IN (SELECT rowid FROM product_search WHERE product_search MATCH :match)")
+        params['match'] = match
+    where = " WHERE " + " AND ".join(conditions) if conditions else ""
+    return where, params
+
+
+def preview_repricing(db, rule, supplier_id=None, category_id=None, search=None, limit=100):
+    """Предпросмотр переоценки без записи
+
+    Итоги (количество товаров, стоимость склада до и после, число
+    недопустимых значений) считаются одним агрегирующим запросом,
+    для показа возвращаются первые limit товаров.
+    """
+    where, params = repricing_filter(supplier_id, category_id, search)
+    params['value'] = rule.value
+    new_price, new_discount = rule.new_columns()
+
+    candidates = f"""
+        SELECT id, name, price, discount, quantity,
+               {new_price} AS new_price, {new_discount} AS new_discount
+        FROM products{where}
+    """
+    old_final = FINAL_PRICE.format(price='price', discount='discount')
+    new_final = FINAL_PRICE.format(price='new_price', discount='new_discount')
+
+    with db.get_connection() as conn:
+        totals = conn.execute(f"""
+            SELECT COUNT(*) AS products,
+                   COALESCE(SUM(new_price != price OR new_discount != discount), 0) AS changed,
+                   COALESCE(SUM({old_final} * quantity), 0) AS old_value,
+                   COALESCE(SUM({new_final} * quantity), 0) AS new_value,
+                   COALESCE(SUM({limit_violation_sql(rule.target, 'new_' + rule.target)}), 0) AS invalid
+            FROM ({candidates})
+        """, params).fetchone()
+        rows = conn.execute(
+            candidates + " ORDER BY name, id LIMIT :limit",
+            {**params, 'limit': limit}
+        ).fetchall()
+
+    return dict(totals), [dict(r) for r in rows]
+
+
+def apply_repricing(db, rule, supplier_id=None, category_id=None, search=None):
+    """Переоценка отобранных товаров одним UPDATE в одной транзакции
+
+    Если хотя бы у одного товара новое значение нарушает правила
+    проверки (LIMITS), ничего не меняется и выдается ValueError.
+    """
+    where, params = repricing_filter(supplier_id, category_id, search)
+    params['value'] = rule.value
+    expr = rule.expression()
+    violation = limit_violation_sql(rule.target, expr)
+    condition = f"{where} AND ({violation})" if where else f" WHERE {violation}"
+
+    result = BulkResult()
+    conn = db.get_connection()
+    with conn:
+        # Блокировка записи: между проверкой и UPDATE данные не изменятся
+        conn.execute("BEGIN IMMEDIATE")
+        invalid = conn.execute(
+            f"SELECT COUNT(*) FROM products{condition}", params
+        ).fetchone()[0]
+        if invalid:
+            raise ValueError(f"{LIMITS[rule.target][2]} (товаров: {invalid})")
+
+        rows = conn.execute(
+            f"UPDATE products SET {rule.target} = {expr}{where} RETURNING id", params
+        ).fetchall()
+    result.done = sorted(row['id'] for row in rows)
+    return result
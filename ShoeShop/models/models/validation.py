@@ -0,0 +1,35 @@
+import math
+
+# Допустимые значения числовых полей товара: поле -> (минимум, максимум, сообщение).
+# Общие правила для формы товара, импорта и массовых изменений.
+LIMITS = {
+    'price': (0, None, "Цена не может быть отрицательной"),
+    'discount': (0, 100, "Скидка должна быть от 0 до 100"),
+    'quantity': (0, None, "Количество не может быть отрицательным")
+}
+
+# Сообщение для nan, бесконечности и пустого значения
+NOT_FINITE = "Значение должно быть конечным числом"
+
+
+def check_limit(field, value):
+    """Сообщение об ошибке, если значение поля вне допустимого диапазона"""
+    low, high, message = LIMITS[field]
+    # С nan любое сравнение ложно, поэтому проверяем отдельно
+    if value is None or not math.isfinite(value):
+        return NOT_FINITE
+    if (low is not None and value < low) or (high is not None and value > high):
+        return message
+    return None
+
+
+def limit_violation_sql(field, expr):
+    """Условие SQL: значение выражения expr вне допустимого диапазона поля"""
+    low, high, _ = LIMITS[field]
+    # nan в SQLite превращается в NULL, переполнение - в бесконечность (9e999)
+    conditions = [f"({expr}) IS NULL", f"ABS({expr}) >= 9e999"]
+    if low is not None:
+        conditions.append(f"({expr}) < {low}")
+    if high is not None:
+        conditions.append(f"({expr}) > {high}")
+    return " OR ".join(conditions)
@@ -0,0 +1,34 @@
+import os
+import sys
+import types
+
+import pytest
+
+# Папка приложения, как в main.py
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# Модули пакетов лежат во вложенных папках (models/models, gui/gui/gui/...):
+# собираем пакеты из всех этих папок, чтобы работали импорты вида models.db_models
+for name in ('models', 'gui', 'database'):
+    package = types.ModuleType(name)
+    package.__path__ = [
+        dirpath for dirpath, dirnames, filenames in os.walk(os.path.join(ROOT, name))
+        if any(filename.endswith('.py') for filename in filenames)
+    ]
+    sys.modules[name] = package
+
+from database.create_db import create_database
+from models.db_models import Database
+
+
+@pytest.fixture
+def db(tmp_path):
+    """Новая БД с тестовыми данными"""
+    db_path = str(tmp_path / 'shop.db')
+    create_database(db_path)
+    shop_db = Database(db_path)
+    # Первое соединение переводит БД в режим WAL, как при запуске приложения
+    shop_db.get_connection()
+    yield shop_db
+    shop_db.manager.close_all()
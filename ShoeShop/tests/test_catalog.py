@@ -0,0 +1,44 @@
+from models.catalog import ProductCatalog
+
+PRODUCTS = [
+    ('Ботинки зимние', 'Женские ботинки на меху'),
+    ('Полуботинки', 'Мужские полуботинки утепленные'),
+    ('Сапоги', 'Сапоги ёлочка, размер 39'),
+    ('Кеды', 'Кеды летние_белые'),
+    ('Туфли', 'Туфли на каблуке 7 см, Café'),
+]
+
+QUERIES = [
+    'ботинки', 'отинки', 'зимние ботинки', 'бот зим', 'полубот', 'елочка',
+    'ёлоч', 'cafe', 'café', 'кеды белые', 'летние', 'размер 39', '7 см', 'к', 'туфли сапоги',
+    'kari', 'обувь для', '  ', 'Ботинки, зимние!'
+]
+
+
+def test_catalog_search_matches_database(db):
+    """Каталог в памяти находит те же товары, что и поиск БД"""
+    with db.get_connection() as conn:
+        for name, description in PRODUCTS:
+            conn.execute(
+                "INSERT INTO products (name, description, price, supplier_id) VALUES (?, ?, 100, 1)",
+                (name, description)
+            )
+    catalog = ProductCatalog(db.get_all_products())
+
+    for query in QUERIES:
+        rows, total = db.query_products(search=query, sort='id_asc', limit=1000)
+        catalog_rows, catalog_total = catalog.query_products(search=query, sort='id_asc', limit=1000)
+        assert [row['id'] for row in catalog_rows] == [row['id'] for row in rows], query
+        assert catalog_total == total, query
+
+
+def test_catalog_refined_search_after_update(db):
+    """Уточнение запроса и правки товаров не ломают кэш поиска"""
+    catalog = ProductCatalog(db.get_all_products())
+    assert catalog.search('бот') == {1, 4}
+
+    product = dict(catalog.get(2), name='Ботфорты')
+    catalog.update(product)
+    assert catalog.search('бот') == {1, 2, 4}
+    assert catalog.search('ботинки') == {1, 4}
+    assert catalog.search('ботинки женские') == {1}
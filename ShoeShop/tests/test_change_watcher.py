@@ -0,0 +1,63 @@
+import sqlite3
+import time
+
+from gui.change_watcher import ChangeWatcher
+
+
+class FakeWidget:
+    """Заменитель виджета: видимость задается вручную, after() не выполняется"""
+
+    def __init__(self, viewable=True):
+        self.viewable = viewable
+
+    def winfo_viewable(self):
+        return self.viewable
+
+    def after(self, delay, func):
+        return 1
+
+    def after_cancel(self, poll_id):
+        pass
+
+
+def deliver(watcher, timeout=5):
+    """Ожидание фонового запроса наблюдателя и доставка результата"""
+    deadline = time.monotonic() + timeout
+    while watcher.fetching and time.monotonic() < deadline:
+        watcher.data.poll()
+        time.sleep(0.001)
+
+
+def change_price(db, product_id, price):
+    """Изменение товара из другого соединения, как с другого терминала"""
+    conn = sqlite3.connect(db.db_path)
+    with conn:
+        conn.execute("UPDATE products SET price = ? WHERE id = ?", (price, product_id))
+    conn.close()
+
+
+def test_hidden_subscribers_defer_fetch_and_receive_revisions(db):
+    """Скрытым подписчикам изменения не загружаются; при показе приходят
+    все пропущенные изменения вместе с ревизиями до и после них"""
+    product_id = db.get_connection().execute("SELECT MIN(id) FROM products").fetchone()[0]
+    screen = FakeWidget(viewable=False)
+    watcher = ChangeWatcher(FakeWidget(), db=db)
+    received = []
+    watcher.subscribe(lambda *args: received.append(args), screen)
+    start = watcher.revision
+
+    change_price(db, product_id, 1234)
+    watcher.poll()
+    assert not watcher.fetching
+
+    screen.viewable = True
+    watcher.poll()
+    deliver(watcher)
+    watcher.shutdown()
+
+    assert len(received) == 1
+    products, deleted, since, revision = received[0]
+    assert [product['id'] for product in products] == [product_id]
+    assert deleted == []
+    assert since == start
+    assert revision == watcher.revision > start
@@ -0,0 +1,41 @@
+import threading
+
+from models.instrumentation import profiler
+
+
+def test_profiler_toggle_keeps_connection(db):
+    """Переключение профилировщика не открывает новые соединения"""
+    conn = db.get_connection()
+    count = len(db.manager.connections)
+    try:
+        for _ in range(3):
+            profiler.enable()
+            assert db.get_connection() is conn
+            db.get_product_by_id(1)
+            profiler.disable()
+            assert db.get_connection() is conn
+            db.get_product_by_id(1)
+
+        # Другой поток получает свое соединение один раз
+        worker = threading.Thread(target=lambda: [db.get_connection() for _ in range(3)])
+        worker.start()
+        worker.join()
+    finally:
+        profiler.disable()
+    assert len(db.manager.connections) == count + 1
+
+
+def test_queries_are_timed_only_while_enabled(db):
+    """Запросы учитываются только при включенном профилировщике"""
+    conn = db.get_connection()
+    profiler.reset()
+    conn.execute("SELECT COUNT(*) FROM products").fetchone()
+    assert not profiler.snapshot()[0]
+
+    profiler.enable()
+    try:
+        conn.execute("SELECT COUNT(*) FROM products").fetchone()
+    finally:
+        profiler.disable()
+    assert profiler.snapshot()[0]
+    profiler.reset()
@@ -0,0 +1,44 @@
+import time
+
+from gui.data_service import DataService
+
+
+class FakeWidget:
+    """Заменитель корневого окна: after() только запоминает вызов"""
+
+    def __init__(self):
+        self.scheduled = []
+
+    def after(self, delay, func):
+        self.scheduled.append(func)
+        return len(self.scheduled)
+
+    def run(self, timeout=5):
+        """Выполнение запланированных вызовов, пока они есть"""
+        deadline = time.monotonic() + timeout
+        while self.scheduled and time.monotonic() < deadline:
+            self.scheduled.pop(0)()
+            time.sleep(0.001)
+
+
+def test_failing_callback_does_not_stop_delivery():
+    """Исключение в обработчике не мешает доставке остальных результатов"""
+    widget = FakeWidget()
+    service = DataService(widget)
+    delivered = []
+    busy = []
+    service.add_busy_listener(busy.append)
+
+    def broken(result):
+        raise RuntimeError("окно уже закрыто")
+
+    service.submit(lambda: 1, on_done=broken)
+    service.submit(lambda: 2, on_done=delivered.append)
+    service.submit(lambda: 1 / 0, on_error=broken)
+    service.submit(lambda: 3, on_done=delivered.append)
+    widget.run()
+    service.shutdown()
+
+    assert sorted(delivered) == [2, 3]
+    assert service.pending == 0
+    assert busy == [True, False]
@@ -0,0 +1,41 @@
+import pytest
+
+Image = pytest.importorskip('PIL.Image')
+
+from gui.image_cache import open_downscaled, load_thumbnail, ingest_photo, PHOTO_SIZE
+from models.photo_store import PhotoStore
+
+
+def make_image(path, mode, size, image_format):
+    """Тестовое изображение с градиентом в нужном режиме"""
+    img = Image.linear_gradient('L').resize(size).convert('RGB')
+    if mode == 'P':
+        img = img.quantize(64)
+    elif mode != 'RGB':
+        img = img.convert(mode)
+    img.save(path, image_format)
+    return str(path)
+
+
+@pytest.mark.parametrize('mode, image_format, suffix', [
+    ('P', 'PNG', 'png'),
+    ('P', 'GIF', 'gif'),
+    ('1', 'PNG', 'png'),
+    ('L', 'PNG', 'png'),
+    ('RGBA', 'PNG', 'png'),
+    ('RGB', 'JPEG', 'jpg')
+])
+def test_large_images_of_any_mode(tmp_path, monkeypatch, mode, image_format, suffix):
+    """Большие изображения любого режима уменьшаются и сохраняются в хранилище"""
+    monkeypatch.chdir(tmp_path)
+    source = make_image(tmp_path / f'photo.{suffix}', mode, (2400, 1600), image_format)
+
+    img = open_downscaled(source, PHOTO_SIZE)
+    assert img.mode == 'RGB'
+    assert img.width < 2400 and img.width >= PHOTO_SIZE[0] * 2
+
+    path, data, preview = ingest_photo(source, PhotoStore(str(tmp_path / 'uploads')))
+    with Image.open(path) as photo:
+        assert photo.size == PHOTO_SIZE
+
+    assert load_thumbnail(source).size == (150, 150)
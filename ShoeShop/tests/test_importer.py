@@ -0,0 +1,73 @@
+from models.importer import ProductImporter
+
+
+def write_csv(path, lines):
+    """CSV-файл в формате выгрузки (разделитель ;)"""
+    path.write_text('\n'.join(lines) + '\n', encoding='utf-8-sig')
+    return str(path)
+
+
+def test_partial_columns_keep_other_fields(db, tmp_path):
+    """Файл только с частью колонок не стирает остальные поля товара"""
+    before = db.get_product_by_id(4)
+    path = write_csv(tmp_path / 'prices.csv', [
+        'ID;Наименование;Цена',
+        '4;Ботинки зимние;6100'
+    ])
+
+    report = ProductImporter(db).import_file(path)
+    assert report.updated == 1 and not report.errors
+
+    after = db.get_product_by_id(4)
+    assert after['name'] == 'Ботинки зимние'
+    assert after['price'] == 6100
+    for field in ('description', 'discount', 'quantity', 'photo_path',
+                  'category_id', 'manufacturer_id', 'supplier_id', 'unit_id'):
+        assert after[field] == before[field], field
+
+
+def test_partial_columns_new_product_gets_defaults(db, tmp_path):
+    """Новый товар из такого файла создается со значениями по умолчанию"""
+    path = write_csv(tmp_path / 'new.csv', [
+        'ID;Наименование;Цена;Количество',
+        '100;Кеды;1500;7'
+    ])
+
+    report = ProductImporter(db).import_file(path)
+    assert report.inserted == 1 and not report.errors
+
+    product = db.get_product_by_id(100)
+    assert (product['name'], product['price'], product['quantity'], product['discount']) == ('Кеды', 1500, 7, 0)
+    assert product['supplier_id'] is None
+
+
+def test_full_columns_update_everything(db, tmp_path):
+    """Колонки, которые есть в файле, обновляются, в том числе справочники"""
+    path = write_csv(tmp_path / 'full.csv', [
+        'ID;Наименование;Цена;Скидка;Поставщик;Категория',
+        '4;Ботинки;5900;25;Новый поставщик;Мужская обувь'
+    ])
+
+    ProductImporter(db).import_file(path)
+
+    product = db.get_product_by_id(4)
+    assert product['discount'] == 25
+    assert product['supplier_id'] == db.get_reference('suppliers').id_of('Новый поставщик')
+    assert product['quantity'] == 4
+
+
+def test_infinite_and_nan_numbers_are_row_errors(db, tmp_path):
+    """inf и nan в числовых колонках - ошибка строки, импорт продолжается"""
+    path = write_csv(tmp_path / 'bad.csv', [
+        'ID;Наименование;Цена;Количество',
+        ';A;10;inf',
+        'inf;B;10;1',
+        ';C;nan;1',
+        ';D;10;-inf',
+        ';E;10;2'
+    ])
+
+    report = ProductImporter(db).import_file(path)
+
+    assert report.inserted == 1
+    assert [row_no for row_no, _ in report.errors] == [2, 3, 4, 5]
@@ -0,0 +1,65 @@
+import os
+import sqlite3
+import threading
+
+from models.photo_store import PhotoStore
+
+PHOTO = b'\xff\xd8 test photo \xff\xd9'
+
+
+def add_product(conn, photo_path):
+    """Товар с фото в отдельном соединении"""
+    return conn.execute(
+        "INSERT INTO products (name, price, photo_path) VALUES ('Товар', 100, ?)", (photo_path,)
+    ).lastrowid
+
+
+def test_release_keeps_referenced_files(db, tmp_path):
+    """Файл удаляется, только когда на него не ссылается ни один товар"""
+    store = PhotoStore(str(tmp_path / 'uploads'))
+    path = store.put(PHOTO)
+    with db.get_connection() as conn:
+        product_id = add_product(conn, path)
+
+    assert not store.release(path, db)
+    assert os.path.exists(path)
+
+    db.delete_product(product_id)
+    assert store.release(path, db)
+    assert not os.path.exists(path)
+
+
+def test_release_waits_for_uncommitted_reference(db, tmp_path):
+    """Пока другое соединение сохраняет товар с фото, файл не удаляется"""
+    store = PhotoStore(str(tmp_path / 'uploads'))
+    path = store.put(PHOTO)
+
+    other = sqlite3.connect(db.db_path, isolation_level=None)
+    other.execute("BEGIN IMMEDIATE")
+    add_product(other, path)
+
+    released = []
+    thread = threading.Thread(target=lambda: released.append(store.release(path, db)))
+    thread.start()
+    thread.join(0.3)
+    assert thread.is_alive()  # ждет блокировку записи
+
+    other.execute("COMMIT")
+    other.close()
+    thread.join(5)
+    assert released == [False]
+    assert os.path.exists(path)
+
+
+def test_restore_after_release_race(db, tmp_path):
+    """Файл, удаленный до сохранения формы, восстанавливается после записи товара"""
+    store = PhotoStore(str(tmp_path / 'uploads'))
+    # Форма загрузила фото, совпавшее с фото другого товара
+    path = store.put(PHOTO)
+    assert store.release(path, db)  # другой товар удален раньше сохранения
+
+    with db.get_connection() as conn:
+        add_product(conn, path)
+    store.restore(path, PHOTO)
+    with open(path, 'rb') as f:
+        assert f.read() == PHOTO
@@ -0,0 +1,33 @@
+import sqlite3
+
+
+def test_reference_cache_reused_until_changed(db):
+    """Неизмененный справочник берется из кэша"""
+    assert db.get_reference('suppliers') is db.get_reference('suppliers')
+
+
+def test_reference_cache_sees_other_connections(db):
+    """Поставщик, добавленный другим терминалом, сразу виден в справочнике"""
+    suppliers = db.get_reference('suppliers')
+    assert suppliers.id_of('Новый поставщик') is None
+
+    other = sqlite3.connect(db.db_path)
+    with other:
+        supplier_id = other.execute(
+            "INSERT INTO suppliers (name) VALUES ('Новый поставщик')"
+        ).lastrowid
+    other.close()
+
+    suppliers = db.get_reference('suppliers')
+    assert suppliers.label_of(supplier_id) == 'Новый поставщик'
+    assert suppliers.id_of('Новый поставщик') == supplier_id
+
+
+def test_reference_cache_sees_renames(db):
+    """Переименование элемента справочника сбрасывает кэш"""
+    db.get_reference('categories')
+    other = sqlite3.connect(db.db_path)
+    with other:
+        other.execute("UPDATE categories SET name = 'Детская обувь' WHERE id = 1")
+    other.close()
+    assert db.get_reference('categories').label_of(1) == 'Детская обувь'
@@ -0,0 +1,49 @@
+import math
+
+import pytest
+
+from models.importer import ProductImporter
+from models.repricing import RepricingRule, apply_repricing, preview_repricing
+from models.validation import NOT_FINITE, check_limit
+
+
+@pytest.mark.parametrize('field', ['price', 'discount', 'quantity'])
+@pytest.mark.parametrize('value', [math.nan, math.inf, -math.inf, None])
+def test_not_finite_values_are_violations(field, value):
+    """nan, бесконечность и пустое значение не проходят проверку"""
+    assert check_limit(field, value) == NOT_FINITE
+
+
+def test_nan_discount_is_reported_by_importer(db, tmp_path):
+    """Строка со скидкой nan - ошибка строки, а не ошибка записи в БД"""
+    path = tmp_path / 'nan.csv'
+    path.write_text('Наименование;Цена;Скидка\nA;10;nan\nB;10;5\n', encoding='utf-8')
+
+    report = ProductImporter(db).import_file(str(path))
+
+    assert report.inserted == 1
+    assert [row_no for row_no, _ in report.errors] == [2]
+    assert 'NOT NULL' not in report.errors[0][1]
+
+
+def test_bulk_update_rejects_nan_discount(db):
+    """Массовое изменение не пишет nan в скидку"""
+    with pytest.raises(ValueError):
+        db.update_products([1, 2], {'discount': math.nan})
+
+
+@pytest.mark.parametrize('mode', ['percent', 'add', 'set'])
+def test_repricing_rejects_nan(mode):
+    """Переоценка на nan отклоняется при создании правила"""
+    with pytest.raises(ValueError):
+        RepricingRule('discount', mode, math.nan)
+
+
+def test_repricing_overflow_counts_as_invalid(db):
+    """Переполнение до бесконечности видно в предпросмотре и не применяется"""
+    big = RepricingRule('price', 'percent', 1e308)
+
+    totals, _ = preview_repricing(db, big)
+    assert totals['invalid'] == totals['products'] > 0
+    with pytest.raises(ValueError):
+        apply_repricing(db, big)